@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Compare queries on a twitter archive with re-parsing JSON lines.
+
+Usage:
+
+  python benchmarks/archive.py [--copies N] [testdata/get_home_timeline.json]
+
+Writes the timeline N times over, with distinct ids, both as JSON lines and
+as a twitter.ArchiveWriter archive, then reports the size of each and the
+time to look up one status by id and to scan an hour of statuses: by
+parsing every line, and through twitter.ArchiveReader.
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+from twitter.twitter_utils import parse_created_at  # noqa
+
+
+def _Timed(run):
+    start = time.time()
+    result = run()
+    return result, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--copies', type=int, default=500)
+    args = parser.parse_args()
+
+    with open(args.path, 'rb') as f:
+        timeline = twitter.json.loads(f.read())
+    directory = tempfile.mkdtemp()
+    lines_path = os.path.join(directory, 'statuses.jsonl')
+    archive_path = os.path.join(directory, 'statuses.twar')
+    try:
+        ids = []
+        with open(lines_path, 'w') as lines, twitter.ArchiveWriter(archive_path) as archive:
+            for copy in range(args.copies):
+                for data in timeline:
+                    data = dict(data, id=data['id'] + copy)
+                    ids.append(data['id'])
+                    lines.write(twitter.json.dumps(data) + '\n')
+                    archive.AppendJsonDict(data)
+        print('%d statuses: JSON lines %.1f MB, archive %.1f MB (with index)' % (
+            len(ids), os.path.getsize(lines_path) / 1e6,
+            (os.path.getsize(archive_path) + os.path.getsize(archive_path + '.idx')) / 1e6))
+
+        wanted = random.choice(ids)
+        # The last hour of the timeline, whose newest status comes first.
+        until = parse_created_at(timeline[0]['created_at']) + 1
+        since = until - 3600
+
+        def ParseGet():
+            with open(lines_path, 'rb') as f:
+                for line in f:
+                    data = twitter.json.loads(line)
+                    if data['id'] == wanted:
+                        return twitter.Status.NewFromJsonDict(data)
+
+        def ParseScan():
+            with open(lines_path, 'rb') as f:
+                return [twitter.Status.NewFromJsonDict(data)
+                        for data in (twitter.json.loads(line) for line in f)
+                        if since <= parse_created_at(data['created_at']) < until]
+
+        reader = twitter.ArchiveReader(archive_path)
+        try:
+            for name, run in [('parse: get by id', ParseGet),
+                              ('archive: get by id', lambda: reader.Get(wanted)),
+                              ('parse: scan an hour', ParseScan),
+                              ('archive: scan an hour', lambda: list(reader.ScanTime(since, until)))]:
+                result, seconds = _Timed(run)
+                count = len(result) if isinstance(result, list) else 1
+                print('%-24s %10.3f ms  %6d statuses' % (name, seconds * 1000, count))
+        finally:
+            reader.Close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
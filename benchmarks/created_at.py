@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Measure the time taken to convert created_at timestamps to epoch seconds.
+
+Usage:
+
+  python benchmarks/created_at.py [--repeat N] [testdata/get_home_timeline.json]
+
+Reports the time per timestamp of the generic email.utils parser, the
+fixed-format parser, the cached Status.CreatedAtInSeconds property read a
+second time, and parse_created_at_list over the whole page.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+from calendar import timegm
+from email.utils import parsedate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+from twitter.twitter_utils import parse_created_at, parse_created_at_list  # noqa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(args.path) as f:
+        timeline = json.load(f)
+    timestamps = [x['created_at'] for x in timeline]
+    statuses = [twitter.Status.NewFromJsonDict(x) for x in timeline]
+    for status in statuses:
+        status.CreatedAtInSeconds
+
+    modes = [
+        ('parsedate', lambda: [timegm(parsedate(x)) for x in timestamps]),
+        ('parse_created_at', lambda: [parse_created_at(x) for x in timestamps]),
+        ('CreatedAtInSeconds', lambda: [x.CreatedAtInSeconds for x in statuses]),
+        ('parse_created_at_list', lambda: parse_created_at_list(timestamps)),
+    ]
+    for name, run in modes:
+        seconds = min(timeit.repeat(run, number=args.repeat, repeat=3))
+        print('%-24s %8.3f us/timestamp' % (name, seconds / args.repeat / len(timestamps) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
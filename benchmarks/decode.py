@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""Measure how many tweets per second are decoded into twitter.Status objects.
+
+Usage:
+
+  python benchmarks/decode.py [--repeat N] [testdata/get_home_timeline.json]
+
+Reports the throughput of building statuses from already parsed JSON
+dicts, with and without a field projection, of the whole path from the
+raw bytes of a response, of AsDict and comparing statuses, the other
+methods generated from the model schemas, and of serializing statuses
+with AsJsonString, sorted or not, with keep_json and with AsJsonLines.
+"""
+
+from __future__ import print_function
+
+import argparse
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+
+
+# The fields an ingestion pipeline typically keeps.
+PROJECTION = ('id', 'created_at', 'text', 'user.id', 'user.screen_name', 'entities.hashtags')
+
+
+def _Statuses(page):
+    if isinstance(page, dict):
+        return page['statuses']
+    return page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.path, 'rb') as f:
+        raw = f.read()
+    timeline = _Statuses(twitter.json.loads(raw))
+    statuses = [twitter.Status.NewFromJsonDict(x) for x in timeline]
+    copies = [twitter.Status.NewFromJsonDict(x) for x in timeline]
+    kept = [twitter.Status.NewFromJsonDict(x, keep_json=True) for x in timeline]
+    # Streams keep the line each status was read from.
+    lines = []
+    for x in timeline:
+        status = twitter.Status.NewFromJsonDict(x)
+        status._json = twitter.json.dumps(x).encode('utf-8')
+        lines.append(status)
+
+    modes = [
+        ('NewFromJsonDict', lambda: [twitter.Status.NewFromJsonDict(x) for x in timeline]),
+        ('NewFromJsonDict(fields)',
+         lambda: [twitter.Status.NewFromJsonDict(x, fields=PROJECTION) for x in timeline]),
+        ('loads + NewFromJsonDict',
+         lambda: [twitter.Status.NewFromJsonDict(x) for x in _Statuses(twitter.json.loads(raw))]),
+        ('AsDict', lambda: [x.AsDict() for x in statuses]),
+        ('__eq__', lambda: [x == y for x, y in zip(statuses, copies)]),
+        ('AsJsonString', lambda: [x.AsJsonString() for x in statuses]),
+        ('AsJsonString(unsorted)', lambda: [x.AsJsonString(sort_keys=False) for x in statuses]),
+        ('AsJsonString(keep_json)', lambda: [x.AsJsonString() for x in kept]),
+        ('AsJsonString(stream)', lambda: [x.AsJsonString() for x in lines]),
+        ('AsJsonLines', lambda: twitter.Status.AsJsonLines(statuses, io.StringIO())),
+    ]
+    for name, run in modes:
+        seconds = min(timeit.repeat(run, number=args.repeat, repeat=3))
+        print('%-24s %10.0f tweets/s' % (name, args.repeat * len(timeline) / seconds))
+
+
+if __name__ == '__main__':
+    main()
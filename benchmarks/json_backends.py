@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Compare the JSON backends on the testdata fixtures.
+
+Usage:
+
+  python benchmarks/json_backends.py [--repeat N] [testdata]
+
+Parses every .json fixture from its raw bytes, as the Api does with
+response bodies, and reports the throughput of each installed backend.
+The stdlib figure for text shows the cost of the decode step that parsing
+from bytes avoids.
+"""
+
+from __future__ import print_function
+
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from twitter import json  # noqa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('directory', nargs='?', default='testdata')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    documents = []
+    for path in sorted(glob.glob(os.path.join(args.directory, '*.json'))):
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            json.set_backend('json')
+            json.loads(data)
+        except ValueError:
+            continue
+        documents.append(data)
+    size = sum(len(d) for d in documents)
+    print('%d documents, %d bytes' % (len(documents), size))
+
+    def Parse(decode):
+        for data in documents:
+            json.loads(data.decode('utf-8') if decode else data)
+
+    runs = [(name, False) for name in json.available_backends()] + [('json', True)]
+    for name, decode in runs:
+        json.set_backend(name)
+        seconds = min(timeit.repeat(lambda: Parse(decode), number=args.repeat, repeat=3))
+        label = name + (' (decoded text)' if decode else '')
+        print('%-24s %8.1f MB/s' % (label, size * args.repeat / seconds / 1e6))
+    json.set_backend()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Measure the memory held by statuses parsed from a timeline.
+
+Usage:
+
+  python benchmarks/memory.py [--copies N] [testdata/get_home_timeline.json]
+
+Parses the timeline N times over and reports the memory retained per status,
+as seen by tracemalloc, for each way of building the model objects.
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+
+
+def _Eager(timeline):
+    return [twitter.Status.NewFromJsonDict(x) for x in timeline]
+
+
+def _Shared(timeline):
+    # One map per response, so that only repeats within a timeline are shared.
+    identity_map = twitter.IdentityMap()
+    return [twitter.Status.NewFromJsonDict(x, identity_map=identity_map) for x in timeline]
+
+
+def _Batch(timeline):
+    batch = twitter.StatusBatch()
+    batch.ExtendJsonDicts(timeline)
+    return batch
+
+
+def _Raw(timeline):
+    return [json.loads(json.dumps(x)) for x in timeline]
+
+
+MODES = [
+    ('raw json dicts', _Raw),
+    ('twitter.Status', _Eager),
+    ('IdentityMap per copy', _Shared),
+    ('twitter.StatusBatch', _Batch),
+]
+
+
+def Measure(build, timeline, copies):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(timeline) for _ in range(copies)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = sum(len(statuses) for statuses in kept)
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--copies', type=int, default=200)
+    args = parser.parse_args()
+
+    with open(args.path) as f:
+        timeline = json.load(f)
+    for name, build in MODES:
+        print('%-24s %8.0f bytes/status' % (name, Measure(build, timeline, args.copies)))
+
+
+if __name__ == '__main__':
+    main()
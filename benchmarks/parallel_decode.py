@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Compare decoding a stream in one thread and in a twitter.DecodePipeline.
+
+Usage:
+
+  python benchmarks/parallel_decode.py [--messages N] [--processes P] [path]
+
+Reads a recorded stream, the raw bytes of a newline framed stream such as
+saved by curl, or builds one from the N statuses of a timeline (the
+default, testdata/get_home_timeline.json), and reports the messages per
+second decoded into statuses with keep_json by twitter.Api in one thread
+and by pipelines of 1 to P processes, ordered and unordered.  The
+pipelines can only beat one thread on a machine with several CPUs.
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+from twitter.stream import STREAM_CHUNK_SIZE  # noqa
+
+
+class _Recording(object):
+    """Replays recorded bytes as a streaming response."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i:i + chunk_size]
+
+
+def _Load(path, messages):
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        timeline = twitter.json.loads(data)
+    except ValueError:
+        return data
+    if isinstance(timeline, dict):
+        timeline = timeline['statuses']
+    return b''.join(twitter.json.dumps(timeline[i % len(timeline)]).encode('utf-8') + b'\r\n'
+                    for i in range(messages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    data = _Load(args.path, args.messages)
+    api = twitter.Api()
+    modes = [('one thread', None)]
+    for processes in sorted(set([1, args.processes])):
+        for ordered in (True, False):
+            modes.append(('%d processes%s' % (processes, '' if ordered else ', unordered'),
+                          twitter.DecodePipeline(processes=processes, ordered=ordered)))
+    expected = None
+    for name, pipeline in modes:
+        try:
+            if pipeline is not None:
+                # Start the workers before timing.
+                list(pipeline.Decode([b'{}']))
+            start = time.time()
+            count = sum(1 for _ in api._StreamMessages(_Recording(data), keep_json=True,
+                                                       decoder=pipeline))
+            seconds = time.time() - start
+        finally:
+            if pipeline is not None:
+                pipeline.Close()
+        expected = count if expected is None else expected
+        assert count == expected
+        print('%-28s %10.0f messages/s' % (name, count / seconds))
+
+
+if __name__ == '__main__':
+    main()
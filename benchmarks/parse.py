@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Measure the time taken to turn a timeline response into statuses.
+
+Usage:
+
+  python benchmarks/parse.py [--repeat N] [testdata/get_home_timeline.json]
+
+Reports the time per status of each parsing mode, reading only the id and
+text of every status, as a filtering stage would.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+
+
+def _Eager(timeline):
+    for status in (twitter.Status.NewFromJsonDict(x) for x in timeline):
+        status.id, status.text
+
+
+def _Lazy(timeline):
+    for status in (twitter.Status.NewFromJsonDict(x, lazy=True) for x in timeline):
+        status.id, status.text
+
+
+MODES = [
+    ('eager', _Eager),
+    ('lazy', _Lazy),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    with open(args.path) as f:
+        timeline = json.load(f)
+    for name, parse in MODES:
+        seconds = min(timeit.repeat(lambda: parse(timeline), number=args.repeat, repeat=3))
+        print('%-24s %8.2f us/status' % (name, seconds / args.repeat / len(timeline) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""Measure the size and speed of pickling statuses parsed from a timeline.
+
+Usage:
+
+  python benchmarks/pickling.py [--repeat N] [testdata/get_home_timeline.json]
+
+Reports the pickled size per status and the statuses per second through
+pickle.dumps and pickle.loads, with and without an identity map sharing
+repeated users, as statuses sent through a multiprocessing queue would be.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import pickle
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    with open(args.path, 'rb') as f:
+        timeline = twitter.json.loads(f.read())
+    identity_map = twitter.IdentityMap()
+    modes = [
+        ('eager', [twitter.Status.NewFromJsonDict(x) for x in timeline]),
+        ('identity_map',
+         [twitter.Status.NewFromJsonDict(x, identity_map=identity_map) for x in timeline]),
+    ]
+    protocol = pickle.HIGHEST_PROTOCOL
+    for name, statuses in modes:
+        data = pickle.dumps(statuses, protocol)
+        assert pickle.loads(data) == statuses
+        dumps = min(timeit.repeat(lambda: pickle.dumps(statuses, protocol),
+                                  number=args.repeat, repeat=3))
+        loads = min(timeit.repeat(lambda: pickle.loads(data), number=args.repeat, repeat=3))
+        count = args.repeat * len(statuses)
+        print('%-14s %8.0f bytes/status %10.0f dumps/s %10.0f loads/s' % (
+            name, len(data) / len(statuses), count / dumps, count / loads))
+
+
+if __name__ == '__main__':
+    main()
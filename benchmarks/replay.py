@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""Replay a stream recording through a twitter.StreamConsumer.
+
+Usage:
+
+  python benchmarks/replay.py [--messages N] [--speed S] [recording]
+
+Replays a recording made with twitter.StreamRecorder, or one synthesized
+from the statuses of testdata/get_home_timeline.json at SAMPLE_RATE
+messages per second, through a consumer on a twitter.Api set up with
+twitter.StreamReplayer.  Reports the size of the recording and the
+messages per second consumed, unthrottled unless a speed is given, both
+decoding every message and through a dispatcher handling statuses.
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+
+# Roughly the rate of the 1% sample stream.
+SAMPLE_RATE = 60
+
+
+class _Clock(object):
+
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+class _Synthesized(object):
+    """A response serving one message per chunk at SAMPLE_RATE."""
+
+    status_code = 200
+
+    def __init__(self, messages, clock):
+        self.messages = messages
+        self.clock = clock
+
+    def iter_content(self, chunk_size=1):
+        for message in self.messages:
+            self.clock.now += 1 / SAMPLE_RATE
+            yield message + b'\r\n'
+
+    def close(self):
+        pass
+
+
+def _Synthesize(directory, count):
+    with open(os.path.join('testdata', 'get_home_timeline.json'), 'rb') as f:
+        timeline = twitter.json.loads(f.read())
+    messages = [twitter.json.dumps(timeline[i % len(timeline)]).encode('utf-8')
+                for i in range(count)]
+    clock = _Clock()
+    with twitter.StreamRecorder(directory, clock=clock) as recorder:
+        resp = recorder.Tee(_Synthesized(messages, clock), 'https://stream.twitter.com/1.1/'
+                            'statuses/sample.json')
+        for _ in resp.iter_content():
+            pass
+
+
+def _Consume(path, speed, decoder):
+    replayer = twitter.StreamReplayer(path, speed=speed)
+    api = twitter.Api()
+    api.SetStreamReplayer(replayer)
+    consumer = twitter.StreamConsumer(api, decoder=decoder)
+    replayer.on_end = consumer.Stop
+    start = time.time()
+    count = sum(1 for _ in consumer.Messages())
+    return count, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?')
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--speed', type=float, default=None)
+    args = parser.parse_args()
+
+    directory = None
+    path = args.path
+    if path is None:
+        directory = path = tempfile.mkdtemp()
+        _Synthesize(directory, args.messages)
+    try:
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) \
+            if os.path.isdir(path) else os.path.getsize(path)
+        raw = sum(len(payload) for _, _, payload in twitter.recording.ReadRecords(path))
+        print('recording: %.1f MB, %.1f MB of stream' % (size / 1e6, raw / 1e6))
+        dispatcher = twitter.StreamDispatcher()
+        dispatcher.Register('status', lambda status: None)
+        for name, decoder in [('consumer', None), ('consumer + dispatcher', dispatcher)]:
+            count, seconds = _Consume(path, args.speed, decoder)
+            print('%-24s %8d messages %10.0f messages/s' % (name, count, count / seconds))
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
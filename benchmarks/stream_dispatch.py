@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Measure what a twitter.StreamDispatcher saves by skipping messages.
+
+Usage:
+
+  python benchmarks/stream_dispatch.py [--messages N] [testdata/get_home_timeline.json]
+
+Builds a stream of N messages, statuses taken from the timeline with one
+deletion notice in ten as on the sample stream, and reports the messages
+per second handled by decoding every message as twitter.Api does, by a
+dispatcher with handlers for every kind, and by a dispatcher that only
+handles deletions and so skips the statuses undecoded.
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+from twitter import messages  # noqa
+
+DELETE = b'{"delete": {"status": {"id": %d, "id_str": "%d", "user_id": 3, "user_id_str": "3"}}}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(args.path, 'rb') as f:
+        timeline = twitter.json.loads(f.read())
+    if isinstance(timeline, dict):
+        timeline = timeline['statuses']
+    frames = [DELETE % (i, i) if i % 10 == 9 else
+              twitter.json.dumps(timeline[i % len(timeline)]).encode('utf-8')
+              for i in range(args.messages)]
+
+    api = twitter.Api()
+    every = twitter.StreamDispatcher()
+    for kind in messages.KINDS:
+        every.Register(kind, lambda message: None)
+    deletions = twitter.StreamDispatcher()
+    deletions.Register('delete', lambda message: None)
+
+    modes = [
+        ('Api, every message', lambda: [api._StreamMessage(frame) for frame in frames]),
+        ('dispatcher, every kind', lambda: list(every.Decode(frames))),
+        ('dispatcher, deletions', lambda: list(deletions.Decode(frames))),
+        ('Classify only', lambda: [messages.Classify(frame) for frame in frames]),
+    ]
+    for name, run in modes:
+        best = None
+        for _ in range(3):
+            start = time.time()
+            run()
+            seconds = time.time() - start
+            best = seconds if best is None else min(best, seconds)
+        print('%-26s %12.0f messages/s' % (name, len(frames) / best))
+
+
+if __name__ == '__main__':
+    main()
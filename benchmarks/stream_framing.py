@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Compare the framings of the streaming API.
+
+Usage:
+
+  python benchmarks/stream_framing.py [--messages N] [testdata/get_home_timeline.json]
+
+Builds a stream of N statuses taken from the timeline, framed by newlines
+and by length prefixes (delimited=length), and reports the messages per
+second split out by requests' iter_lines, which the stream methods used
+before, and by twitter.stream.ReadFrames in both framings, with and
+without decoding each message.  The last column is the share of one CPU
+that framing a sample stream of SAMPLE_RATE messages per second takes.
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import twitter  # noqa
+from twitter.stream import ReadFrames, STREAM_CHUNK_SIZE  # noqa
+
+# Roughly the rate of the 1% sample stream.
+SAMPLE_RATE = 60
+
+
+def _Chunks(data):
+    return [data[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(data), STREAM_CHUNK_SIZE)]
+
+
+def _IterLines(data):
+    resp = requests.Response()
+    resp.raw = io.BytesIO(data)
+    return resp.iter_lines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('path', nargs='?',
+                        default=os.path.join('testdata', 'get_home_timeline.json'))
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(args.path, 'rb') as f:
+        timeline = twitter.json.loads(f.read())
+    if isinstance(timeline, dict):
+        timeline = timeline['statuses']
+    messages = [twitter.json.dumps(timeline[i % len(timeline)]).encode('utf-8')
+                for i in range(args.messages)]
+    lines = b''.join(m + b'\r\n' for m in messages)
+    delimited = b''.join(b'%d\r\n' % (len(m) + 2) + m + b'\r\n' for m in messages)
+
+    modes = [
+        ('iter_lines', lambda: _IterLines(lines)),
+        ('ReadFrames(newlines)', lambda: ReadFrames(_Chunks(lines))),
+        ('ReadFrames(length)', lambda: ReadFrames(_Chunks(delimited), delimited=True)),
+    ]
+    for decode in (False, True):
+        for name, frames in modes:
+            best = None
+            for _ in range(3):
+                source = frames()
+                start = time.time()
+                count = 0
+                for frame in source:
+                    if frame:
+                        if decode:
+                            twitter.json.loads(frame)
+                        count += 1
+                seconds = time.time() - start
+                best = seconds if best is None else min(best, seconds)
+            assert count == len(messages)
+            if decode:
+                name += ' + loads'
+            print('%-30s %10.0f messages/s %8.3f%% CPU at %d/s' % (
+                name, count / best, 100 * SAMPLE_RATE * best / count, SAMPLE_RATE))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+# encoding: utf-8
+
+
+class FakeClock(object):
+    """A clock for the time and sleep arguments of the pollers and
+    streams, advanced only by sleeping or by the tests."""
+
+    def __init__(self, now=1450000000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
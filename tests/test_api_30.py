@@ -146,6 +146,22 @@ class ApiTest(unittest.TestCase):
         self.assertTrue([type(status) is twitter.Status for status in resp])
         self.assertTrue(['twitter' in status.text for status in resp])
 
+    @responses.activate
+    def testGetSearchReturnJson(self):
+        with open('testdata/get_search_raw.json') as f:
+            resp_data = f.read()
+        responses.add(
+            responses.GET,
+            'https://api.twitter.com/1.1/search/tweets.json?q=twitter%20&result_type=recent&since=2014-07-19&count=100',
+            body=resp_data,
+            match_querystring=True,
+            status=200)
+        resp = self.api.GetSearch(raw_query="q=twitter%20&result_type=recent&since=2014-07-19&count=100",
+                                  return_json=True)
+        self.assertTrue(type(resp) is dict)
+        self.assertEqual(100, len(resp['statuses']))
+        self.assertTrue(resp['search_metadata']['next_results'].startswith('?max_id=690992333903532031'))
+
     @responses.activate
     def testGetSearchGeocode(self):
         with open('testdata/get_search_geocode.json') as f:
@@ -260,6 +276,192 @@ class ApiTest(unittest.TestCase):
         self.assertEqual(resp[0].id, 675055636267298821)
         self.assertTrue(resp)
 
+    @responses.activate
+    def testGetUserTimelineLazy(self):
+        with open('testdata/get_user_timeline.json') as f:
+            resp_data = f.read()
+        responses.add(
+            responses.GET,
+            'https://api.twitter.com/1.1/statuses/user_timeline.json?user_id=673483',
+            body=resp_data,
+            match_querystring=True,
+            status=200)
+        self.api.SetLazyParsing(True)
+        resp = self.api.GetUserTimeline(user_id=673483)
+        self.assertTrue(type(resp[0]) is twitter.status.LazyStatus)
+        self.assertTrue(type(resp[0].user) is twitter.user.LazyUser)
+        self.assertEqual(resp[0].user.id, 673483)
+        resp = self.api.GetUserTimeline(user_id=673483, fields=['id'])
+        self.assertTrue(type(resp[0]) is twitter.Status)
+
+    @responses.activate
+    def testGetUserTimelineIdentityMap(self):
+        with open('testdata/get_user_timeline.json') as f:
+            resp_data = f.read()
+        responses.add(
+            responses.GET,
+            'https://api.twitter.com/1.1/statuses/user_timeline.json?user_id=673483',
+            body=resp_data,
+            match_querystring=True,
+            status=200)
+        self.api.SetIdentityMap(twitter.IdentityMap())
+        resp = self.api.GetUserTimeline(user_id=673483)
+        self.assertTrue(resp[0].user is resp[-1].user)
+        self.assertTrue(self.api.GetUserTimeline(user_id=673483)[0] is resp[0])
+
+    @responses.activate
+    def testGetUserTimelineIncremental(self):
+        with open('testdata/get_user_timeline.json') as f:
+            resp_data = f.read()
+        responses.add(
+            responses.GET,
+            'https://api.twitter.com/1.1/statuses/user_timeline.json?user_id=673483',
+            body=resp_data,
+            match_querystring=True,
+            status=200)
+        resp = self.api.GetUserTimeline(user_id=673483, incremental=True)
+        statuses = list(resp)
+        self.assertEqual(self.api.GetUserTimeline(user_id=673483), statuses)
+        self.assertEqual(statuses[0].id, 675055636267298821)
+
+    @responses.activate
+    def testGetUserTimelineFields(self):
+        with open('testdata/get_user_timeline.json') as f:
+            resp_data = f.read()
+        responses.add(
+            responses.GET,
+            'https://api.twitter.com/1.1/statuses/user_timeline.json?user_id=673483',
+            body=resp_data,
+            match_querystring=True,
+            status=200)
+        fields = ('id', 'text', 'user.id')
+        for resp in (self.api.GetUserTimeline(user_id=673483, fields=fields),
+                     list(self.api.GetUserTimeline(user_id=673483, fields=fields, incremental=True))):
+            status = resp[0]
+            self.assertEqual(status.id, 675055636267298821)
+            self.assertTrue(status.text)
+            self.assertTrue(status.user.id)
+            self.assertEqual(status.user.screen_name, None)
+            self.assertEqual(status.created_at, None)
+
+    @responses.activate
+    def testGetStreamSampleKeepJson(self):
+        lines = [b'{"id": 2, "text": "caf\\u00e9", "user": {"id": 3}}',
+                 b'{"delete": {"status": {"id": 1}}}']
+        responses.add(
+            responses.GET,
+            'https://stream.twitter.com/1.1/statuses/sample.json',
+            body=b'\r\n'.join(lines),
+            status=200)
+        status, delete = list(self.api.GetStreamSample(keep_json=True))
+        self.assertEqual(status.user.id, 3)
+        self.assertEqual(status.AsJsonString(), lines[0].decode('utf-8'))
+        self.assertEqual(delete, {'delete': {'status': {'id': 1}}})
+
+    @responses.activate
+    def testGetStreamSampleLazy(self):
+        lines = [b'{"id": 2, "text": "a", "user": {"id": 3}}', b'{"delete": {"status": {"id": 1}}}']
+        responses.add(
+            responses.GET,
+            'https://stream.twitter.com/1.1/statuses/sample.json',
+            body=b'\r\n'.join(lines),
+            status=200)
+        self.api.SetLazyParsing(True)
+        status, delete = list(self.api.GetStreamSample())
+        self.assertTrue(type(status) is twitter.status.LazyStatus)
+        self.assertEqual(status.user.id, 3)
+        self.assertEqual(delete, {'delete': {'status': {'id': 1}}})
+
+    @responses.activate
+    def testGetStreamSampleIdentityMap(self):
+        lines = [b'{"id": 2, "text": "a", "user": {"id": 3}}', b'{"id": 4, "text": "b", "user": {"id": 3}}']
+        responses.add(
+            responses.GET,
+            'https://stream.twitter.com/1.1/statuses/sample.json',
+            body=b'\r\n'.join(lines),
+            status=200)
+        self.api.SetIdentityMap(twitter.IdentityMap())
+        first, second = list(self.api.GetStreamSample(keep_json=True))
+        self.assertTrue(first.user is second.user)
+        self.assertEqual(lines[0], first._json)
+
+    @responses.activate
+    def testGetStreamFilterDelimited(self):
+        lines = [b'{"id": 2, "text": "a\\nb"}', b'{"delete": {"status": {"id": 1}}}']
+        responses.add(
+            responses.POST,
+            'https://stream.twitter.com/1.1/statuses/filter.json',
+            body=b''.join(b'%d\r\n%s\r\n' % (len(line) + 2, line) for line in lines),
+            status=200)
+        messages = list(self.api.GetStreamFilter(track=['a'], delimited='length'))
+        self.assertEqual([{'id': 2, 'text': 'a\nb'}, {'delete': {'status': {'id': 1}}}], messages)
+        self.assertTrue('delimited=length' in str(responses.calls[0].request.body))
+
+    @responses.activate
+    def testProfiles(self):
+        with open('testdata/get_home_timeline.json') as f:
+            resp_data = f.read()
+        responses.add(
+            responses.GET,
+            'https://api.twitter.com/1.1/statuses/home_timeline.json?count=5&trim_user=true&include_entities=false',
+            body=resp_data,
+            match_querystring=True,
+            status=200)
+        resp = self.api.WithProfile('ids_only').GetHomeTimeline(count=5, include_entities=True)
+        self.assertEqual(resp[0].id, 674674925823787008)
+        self.assertEqual(self.api._profile, None)
+
+        api = twitter.Api(consumer_key='test', consumer_secret='test',
+                          access_token_key='test', access_token_secret='test',
+                          profile='text_only')
+        self.assertEqual({'count': 5, 'trim_user': 'false', 'include_entities': 'false'},
+                         api._ProfileParameters(
+                             'https://api.twitter.com/1.1/statuses/home_timeline.json', {'count': 5}))
+        self.assertEqual({'id': 1, 'trim_user': 'false'},
+                         api._ProfileParameters(
+                             'https://api.twitter.com/1.1/statuses/retweets/1.json', {'id': 1}))
+        self.assertEqual({'skip_status': 'true', 'include_user_entities': 'false'},
+                         api._ProfileParameters('https://api.twitter.com/1.1/followers/list.json', None))
+        self.assertEqual(None, api._ProfileParameters('https://api.twitter.com/1.1/followers/ids.json', None))
+        self.assertEqual({'id': 1, 'include_entities': 'false'},
+                         api._ProfileParameters(
+                             'https://api.twitter.com/1.1/direct_messages/destroy.json', {'id': 1}))
+
+        other = api.WithProfile('full')
+        other.SetSource('copy')
+        other.SetUserAgent('copy')
+        self.assertEqual({}, api._default_params)
+        self.assertNotEqual('copy', api._request_headers.get('User-Agent'))
+        self.assertRaises(twitter.TwitterError, api.SetProfile, 'tiny')
+
+    @responses.activate
+    def testGetFriendsPagedIncremental(self):
+        with open('testdata/get_friends_paged.json') as f:
+            resp_data = f.read()
+        responses.add(
+            responses.GET,
+            '{base_url}/friends/list.json?screen_name=codebear&count=200&cursor=-1&skip_status=False&include_user_entities=True'.format(
+                base_url=self.api.base_url),
+            body=resp_data,
+            match_querystring=True,
+            status=200)
+        resp = self.api.GetFriendsPaged(screen_name='codebear', count=200, incremental=True)
+        users = list(resp)
+        self.assertEqual(len(users), 200)
+        self.assertTrue(type(users[0]) is twitter.User)
+        self.assertEqual(resp.remainder['next_cursor'], 1494734862149901956)
+
+    @responses.activate
+    def testIncrementalError(self):
+        responses.add(
+            responses.GET,
+            'https://api.twitter.com/1.1/statuses/user_timeline.json?user_id=673483',
+            body='{"errors": [{"code": 34, "message": "Sorry, that page does not exist."}]}',
+            match_querystring=True,
+            status=404)
+        resp = self.api.GetUserTimeline(user_id=673483, incremental=True)
+        self.assertRaises(twitter.TwitterError, lambda: list(resp))
+
     @responses.activate
     def testGetRetweets(self):
         with open('testdata/get_retweets.json') as f:
@@ -0,0 +1,98 @@
+# encoding: utf-8
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import twitter
+from twitter import archive
+from twitter.status import LazyStatus
+
+
+def _Status(id, created_at, text=None):
+    return {'id': id,
+            'created_at': created_at,
+            'text': text or u'status %d ☕' % id,
+            'user': {'id': 7, 'screen_name': 'kesuke'}}
+
+
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'statuses.twar')
+        self.statuses = [
+            _Status(30, 'Fri Jan 01 12:30:00 +0000 2016'),
+            _Status(10, 'Fri Jan 01 12:40:00 +0000 2016'),
+            _Status(20, 'Fri Jan 01 10:59:59 +0000 2016')]
+        with twitter.ArchiveWriter(self.path) as writer:
+            writer.ExtendJsonDicts(self.statuses)
+            writer.AppendJsonDict({'id': 10, 'screen_name': 'kesuke',
+                                   'created_at': 'Fri Jan 01 00:00:00 +0000 2010'}, kind='user')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def testGet(self):
+        '''Test that records are found by id and returned as lazy views'''
+        with twitter.ArchiveReader(self.path) as reader:
+            self.assertEqual(4, len(reader))
+            status = reader.Get(10)
+            self.assertTrue(isinstance(status, LazyStatus))
+            self.assertEqual(u'status 10 ☕', status.text)
+            self.assertEqual('kesuke', status.user.screen_name)
+            self.assertEqual(self.statuses[1], json.loads(status.AsJsonString()))
+            self.assertFalse(b'": ' in status._json)
+            self.assertEqual('kesuke', reader.Get(10, kind='user').screen_name)
+            self.assertEqual(None, reader.Get(11))
+            self.assertEqual(None, reader.Get(30, kind='user'))
+            self.assertRaises(twitter.TwitterError, reader.Get, 10, kind='list')
+
+    def testScan(self):
+        '''Test range scans by id and by creation time'''
+        with twitter.ArchiveReader(self.path) as reader:
+            self.assertEqual([10, 20, 30], [s.id for s in reader.Scan()])
+            self.assertEqual([20], [s.id for s in reader.Scan(11, 30)])
+            self.assertEqual([10], [u.id for u in reader.Scan(kind='user')])
+            self.assertEqual([20, 30, 10], [s.id for s in reader.ScanTime()])
+            self.assertEqual([30], [s.id for s in reader.ScanTime(1451651400, 1451652000)])
+
+    def testAppend(self):
+        '''Test that reopened archives keep their records and the latest copy wins'''
+        with twitter.ArchiveWriter(self.path, compress=False) as writer:
+            self.assertEqual(4, len(writer))
+            writer.AppendJsonDict(_Status(20, 'Fri Jan 01 10:59:59 +0000 2016', 'edited'))
+            writer.Append(twitter.Status.NewFromJsonDict(_Status(40, 'Sat Jan 02 00:00:00 +0000 2016'),
+                                                         keep_json=True))
+            self.assertRaises(twitter.TwitterError, writer.Append,
+                              twitter.Status.NewFromJsonDict(_Status(50, None)))
+            self.assertRaises(twitter.TwitterError, writer.AppendJsonDict, {'text': 'no id'})
+        with twitter.ArchiveReader(self.path) as reader:
+            self.assertEqual([10, 20, 30, 40], [s.id for s in reader.Scan()])
+            self.assertEqual('edited', reader.Get(20).text)
+
+    def testRebuildIndex(self):
+        '''Test that a missing or stale index is rebuilt from the records'''
+        os.remove(self.path + '.idx')
+        with twitter.ArchiveReader(self.path) as reader:
+            self.assertEqual([10, 20, 30], [s.id for s in reader.Scan()])
+        with twitter.ArchiveWriter(self.path) as writer:
+            writer.AppendJsonDict(_Status(40, 'Sat Jan 02 00:00:00 +0000 2016'))
+        with open(self.path, 'ab') as f:
+            f.write(archive.RECORD.pack(100, 1, 50, 0))
+        with twitter.ArchiveReader(self.path) as reader:
+            self.assertEqual(40, reader.Get(40).id)
+        with twitter.ArchiveWriter(self.path) as writer:
+            writer.AppendJsonDict(_Status(50, 'Sat Jan 02 00:00:00 +0000 2016'))
+        with twitter.ArchiveReader(self.path) as reader:
+            self.assertEqual([10, 20, 30, 40, 50], [s.id for s in reader.Scan()])
+
+    def testNotAnArchive(self):
+        '''Test that other files are refused'''
+        path = os.path.join(self.dir, 'timeline.json')
+        with open(path, 'w') as f:
+            f.write('[{"id": 1}]')
+        self.assertRaises(twitter.TwitterError, twitter.ArchiveReader, path)
+        self.assertRaises(twitter.TwitterError, twitter.ArchiveWriter, path)
@@ -0,0 +1,74 @@
+# encoding: utf-8
+
+import unittest
+
+import twitter
+from twitter.backfill import SearchFetcher, TimeWindows, WalkTimeline
+from twitter.twitter_utils import id_to_timestamp, timestamp_to_id
+
+
+class SnowflakeTest(unittest.TestCase):
+
+    def testIdToTimestamp(self):
+        '''Test decoding the creation time of a status id'''
+        # Thu Dec 10 20:53:00 +0000 2015
+        self.assertEqual(1449780780, int(id_to_timestamp(675055636267298821)))
+        self.assertRaises(twitter.TwitterError, lambda: id_to_timestamp(4391023))
+
+    def testTimestampToId(self):
+        '''Test that timestamp_to_id is a lower bound for ids of that time'''
+        status_id = 675055636267298821
+        lower = timestamp_to_id(id_to_timestamp(status_id))
+        self.assertTrue(lower <= status_id)
+        self.assertEqual(id_to_timestamp(status_id), id_to_timestamp(lower))
+        self.assertTrue(timestamp_to_id(id_to_timestamp(status_id) + 0.001) > status_id)
+
+
+class FakeApi(object):
+    """Serves a search over statuses posted once per second."""
+
+    def __init__(self, start, seconds, page_size=7):
+        self.ids = [timestamp_to_id(start + i) + 5 for i in reversed(range(seconds))]
+        self.page_size = page_size
+        self.requests = 0
+
+    def GetSearch(self, term=None, since_id=None, max_id=None, count=15, **kwargs):
+        self.requests += 1
+        ids = [i for i in self.ids
+               if (since_id is None or i > since_id) and (max_id is None or i <= max_id)]
+        return [twitter.Status(id=i) for i in ids[:self.page_size]]
+
+
+class BackfillTest(unittest.TestCase):
+    START = 1450000000
+
+    def testTimeWindows(self):
+        '''Test that windows are contiguous and newest first'''
+        windows = TimeWindows(self.START, self.START + 100, 4)
+        self.assertEqual(4, len(windows))
+        self.assertEqual(timestamp_to_id(self.START) - 1, windows[-1][0])
+        self.assertEqual(timestamp_to_id(self.START + 100) - 1, windows[0][1])
+        for newer, older in zip(windows, windows[1:]):
+            self.assertEqual(older[1], newer[0])
+        self.assertRaises(twitter.TwitterError, lambda: TimeWindows(2, 1, 4))
+
+    def testWalkTimeline(self):
+        '''Test walking max_id back to since_id'''
+        api = FakeApi(self.START, 30)
+        fetch = SearchFetcher('python')
+        statuses = list(WalkTimeline(lambda **kw: fetch(api, **kw),
+                                     since_id=api.ids[20], max_id=api.ids[2]))
+        self.assertEqual(api.ids[2:20], [s.id for s in statuses])
+
+    def testParallelBackfill(self):
+        '''Test that windows fetched in parallel are merged in id order'''
+        api = FakeApi(self.START - 10, 120)
+        other = FakeApi(self.START - 10, 120)
+        statuses = list(twitter.ParallelBackfill([api, other], SearchFetcher('python'),
+                                                 self.START, self.START + 100,
+                                                 windows=5))
+        expected = [i for i in api.ids
+                    if timestamp_to_id(self.START) <= i < timestamp_to_id(self.START + 100)]
+        self.assertEqual(100, len(expected))
+        self.assertEqual(expected, [s.id for s in statuses])
+        self.assertTrue(api.requests > 0 and other.requests > 0)
@@ -0,0 +1,98 @@
+# encoding: utf-8
+
+import json
+import unittest
+
+import twitter
+from twitter import batch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _Status(id, created_at, retweet_count, favorite_count):
+    return {'id': id,
+            'created_at': created_at,
+            'text': 'status %d' % id,
+            'user': {'id': 7},
+            'retweet_count': retweet_count,
+            'favorite_count': favorite_count}
+
+
+class StatusBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.batch = twitter.StatusBatch()
+        self.batch.ExtendJsonDicts([
+            _Status(3, 'Fri Jan 01 12:30:00 +0000 2016', 4, 1),
+            _Status(2, 'Fri Jan 01 12:10:00 +0000 2016', 0, 2),
+            _Status(1, 'Fri Jan 01 10:59:59 +0000 2016', 1, None)])
+
+    def testColumns(self):
+        '''Test that fields are stored column-wise'''
+        self.assertEqual(3, len(self.batch))
+        self.assertEqual([3, 2, 1], list(self.batch.id))
+        self.assertEqual(1451651400, self.batch.created_at[0])
+        self.assertEqual([1, 2, 0], list(self.batch.favorite_count))
+        self.assertEqual(['status 3', 'status 2', 'status 1'], self.batch.text)
+
+    def testFromModels(self):
+        '''Test that models and JSON dicts give the same columns'''
+        with open('testdata/get_user_timeline.json') as f:
+            timeline = json.load(f)
+        from_json = twitter.StatusBatch()
+        from_json.ExtendJsonDicts(timeline)
+        from_models = twitter.StatusBatch()
+        from_models.Extend(twitter.Status.NewFromJsonDict(x) for x in timeline)
+        for column in ('id', 'created_at', 'user_id', 'retweet_count', 'text'):
+            self.assertEqual(list(getattr(from_json, column)), list(getattr(from_models, column)))
+
+    def testTimeBuckets(self):
+        '''Test counting statuses per hour'''
+        self.assertEqual([(1451645999 // 3600 * 3600, 1), (1451649600, 2)],
+                         self.batch.TimeBuckets(3600))
+        self.assertRaises(twitter.TwitterError, lambda: self.batch.TimeBuckets(0))
+
+    def testEngagementStats(self):
+        '''Test the engagement statistics'''
+        stats = self.batch.EngagementStats()
+        self.assertEqual({'total': 5, 'mean': 5 / 3.0, 'max': 4}, stats['retweet_count'])
+        self.assertEqual({'total': 8, 'mean': 8 / 3.0, 'max': 5}, stats['engagement'])
+        self.assertEqual(None, twitter.StatusBatch().EngagementStats()['engagement']['max'])
+
+    def testPurePython(self):
+        '''Test the helpers without NumPy'''
+        numpy_, batch.numpy = batch.numpy, None
+        try:
+            self.testTimeBuckets()
+            self.testEngagementStats()
+            self.assertRaises(twitter.TwitterError, lambda: self.batch.Column('id'))
+        finally:
+            batch.numpy = numpy_
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def testNumpy(self):
+        '''Test that NumPy columns share the memory of the batch'''
+        ids = self.batch.Column('id')
+        self.assertEqual([3, 2, 1], ids.tolist())
+        self.batch.id[0] = 4
+        self.assertEqual(4, ids[0])
+        self.assertEqual(sorted(['id', 'created_at', 'user_id', 'retweet_count', 'favorite_count', 'text']),
+                         sorted(self.batch.AsNumpy()))
+
+
+class UserBatchTest(unittest.TestCase):
+
+    def testColumns(self):
+        '''Test that users are stored column-wise'''
+        with open('testdata/get_followers_0.json') as f:
+            users = json.load(f)['users']
+        batch = twitter.UserBatch()
+        batch.ExtendJsonDicts(users)
+        self.assertEqual(len(users), len(batch))
+        self.assertEqual(users[0]['followers_count'], batch.followers_count[0])
+        self.assertEqual(users[-1]['screen_name'], batch.screen_name[-1])
+        self.assertEqual(sum(u['statuses_count'] for u in users),
+                         batch.Stats('statuses_count')['total'])
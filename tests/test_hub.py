@@ -0,0 +1,87 @@
+# encoding: utf-8
+
+import threading
+import unittest
+
+import twitter
+
+
+class FakeStream(object):
+
+    def __init__(self, messages, error=None):
+        self.messages = messages
+        self.error = error
+        self.stopped = False
+
+    def Messages(self):
+        for message in self.messages:
+            yield message
+        if self.error is not None:
+            raise self.error
+
+    def Stop(self):
+        self.stopped = True
+
+
+class StreamHubTest(unittest.TestCase):
+
+    MESSAGES = [{'id': i} for i in range(5)]
+
+    def testPolicies(self):
+        '''Test that full subscriptions drop according to their policy'''
+        hub = twitter.StreamHub(FakeStream(self.MESSAGES))
+        oldest = hub.Subscribe(capacity=2, policy='drop_oldest')
+        newest = hub.Subscribe(capacity=2, policy='drop_newest')
+        hub.Start()
+        hub.Join(5)
+        self.assertEqual([3, 4], [m['id'] for m in oldest])
+        self.assertEqual([0, 1], [m['id'] for m in newest])
+        stats = hub.Stats()
+        self.assertEqual(5, stats['received'])
+        self.assertEqual(0, stats['intake_dropped'])
+        self.assertEqual([3, 3], [s['dropped'] for s in stats['subscriptions']])
+        self.assertEqual([2, 2], [s['delivered'] for s in stats['subscriptions']])
+        self.assertTrue(oldest.Stats()['lag'] == 0 and oldest.Stats()['lag_seconds'] == 0)
+
+    def testBlock(self):
+        '''Test that a blocking subscription receives every message once'''
+        hub = twitter.StreamHub(FakeStream(self.MESSAGES))
+        blocking = hub.Subscribe(capacity=1, policy='block')
+        received = []
+        reader = threading.Thread(target=lambda: received.extend(blocking))
+        reader.start()
+        hub.Start()
+        hub.Join(5)
+        reader.join(5)
+        self.assertEqual(self.MESSAGES, received)
+        self.assertTrue(all(a is b for a, b in zip(self.MESSAGES, received)))
+        self.assertEqual(0, blocking.Stats()['dropped'])
+
+    def testLagAndStop(self):
+        '''Test lag metrics, unsubscribing, stream errors and Stop'''
+        stream = FakeStream(self.MESSAGES, error=twitter.TwitterError('gone'))
+        hub = twitter.StreamHub(stream)
+        lagging = hub.Subscribe(capacity=10)
+        closed = hub.Subscribe()
+        closed.Close()
+        hub.Start()
+        hub.Join(5)
+        stats = lagging.Stats()
+        self.assertEqual(5, stats['lag'])
+        self.assertTrue(stats['lag_seconds'] >= 0)
+        self.assertEqual(1, len(hub.Stats()['subscriptions']))
+        self.assertEqual('gone', str(hub.error))
+        self.assertEqual({'id': 0}, lagging.Get(timeout=0))
+        self.assertEqual(None, closed.Get(timeout=0))
+        received = []
+        try:
+            for message in lagging:
+                received.append(message)
+        except twitter.TwitterError as error:
+            self.assertTrue(error is hub.error)
+        else:
+            self.fail('TwitterError not raised')
+        self.assertEqual(self.MESSAGES[1:], received)
+        hub.Stop()
+        self.assertTrue(stream.stopped)
+        self.assertRaises(twitter.TwitterError, hub.Subscribe, policy='drop_all')
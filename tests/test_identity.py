@@ -0,0 +1,74 @@
+# encoding: utf-8
+
+import json
+import unittest
+
+import twitter
+
+
+def _Status(id, user_id, statuses_count, retweet_count=0, mentions=()):
+    return {'id': id,
+            'text': 'status %d' % id,
+            'retweet_count': retweet_count,
+            'user': {'id': user_id, 'screen_name': 'user%d' % user_id,
+                     'statuses_count': statuses_count},
+            'entities': {'user_mentions': [{'id': m, 'screen_name': 'user%d' % m}
+                                           for m in mentions]}}
+
+
+class IdentityMapTest(unittest.TestCase):
+
+    def testSharedUsers(self):
+        '''Test that repeated users are parsed into a single instance'''
+        with open('testdata/get_user_timeline.json') as f:
+            timeline = json.load(f)
+        identity_map = twitter.IdentityMap()
+        statuses = [twitter.Status.NewFromJsonDict(x, identity_map=identity_map)
+                    for x in timeline]
+        self.assertEqual(1, len(set(id(s.user) for s in statuses)))
+        self.assertEqual(twitter.User.NewFromJsonDict(timeline[0]['user']), statuses[0].user)
+
+        lazy = [twitter.Status.NewFromJsonDict(x, lazy=True, identity_map=identity_map)
+                for x in timeline]
+        self.assertTrue(lazy[0] is statuses[0])
+        self.assertTrue(lazy[-1].user is statuses[0].user)
+
+    def testMentionsKeptApart(self):
+        '''Test that mentions are shared among themselves only'''
+        identity_map = twitter.IdentityMap()
+        first = twitter.Status.NewFromJsonDict(_Status(2, 1, 10, mentions=[7]),
+                                               identity_map=identity_map)
+        second = twitter.Status.NewFromJsonDict(_Status(3, 7, 10, mentions=[7]),
+                                                identity_map=identity_map)
+        self.assertTrue(first.user_mentions[0] is second.user_mentions[0])
+        self.assertFalse(second.user is second.user_mentions[0])
+        self.assertEqual(10, second.user.statuses_count)
+
+    def testPolicies(self):
+        '''Test which copy the shared instance reflects'''
+        copies = [_Status(5, 1, 20, retweet_count=3), _Status(6, 1, 21), _Status(5, 1, 20)]
+        expected = {'first': (20, 3), 'last': (20, 0), 'freshest': (21, 3)}
+        for policy, (statuses_count, retweet_count) in expected.items():
+            identity_map = twitter.IdentityMap(policy=policy)
+            statuses = [twitter.Status.NewFromJsonDict(x, identity_map=identity_map)
+                        for x in copies]
+            self.assertTrue(statuses[0] is statuses[2])
+            self.assertEqual(statuses_count, statuses[0].user.statuses_count, policy)
+            self.assertEqual(retweet_count, statuses[0].retweet_count, policy)
+        self.assertRaises(twitter.TwitterError, lambda: twitter.IdentityMap(policy='oldest'))
+
+    def testKeepJson(self):
+        '''Test that the kept payload follows the attributes of the policy'''
+        copies = [_Status(5, 1, 20, retweet_count=3), _Status(5, 1, 20)]
+        for policy, kept in [('first', 0), ('last', 1), ('freshest', 0)]:
+            identity_map = twitter.IdentityMap(policy=policy)
+            statuses = [twitter.Status.NewFromJsonDict(x, identity_map=identity_map,
+                                                       keep_json=True)
+                        for x in copies]
+            self.assertTrue(statuses[0]._json is copies[kept], policy)
+
+    def testWeakReferences(self):
+        '''Test that the map does not keep unused objects alive'''
+        identity_map = twitter.IdentityMap()
+        twitter.Status.NewFromJsonDict(_Status(5, 1, 20), identity_map=identity_map)
+        self.assertEqual(0, len(identity_map))
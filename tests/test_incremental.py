@@ -0,0 +1,61 @@
+# encoding: utf-8
+
+import json
+import unittest
+
+from twitter.incremental import JsonArrayReader
+
+
+def _Chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class JsonArrayReaderTest(unittest.TestCase):
+
+    def testFixtures(self):
+        '''Test that elements match a full parse for any chunk size'''
+        for path, key in [('testdata/get_user_timeline.json', None),
+                          ('testdata/get_followers_0.json', 'users'),
+                          ('testdata/get_search.json', 'statuses'),
+                          ('testdata/get_follower_ids_0.json', 'ids')]:
+            with open(path, 'rb') as f:
+                data = f.read()
+            document = json.loads(data.decode('utf-8'))
+            for size in (1, 7, 4096):
+                reader = JsonArrayReader(_Chunks(data, size), key=key)
+                if key is None:
+                    self.assertEqual(document, list(reader))
+                    self.assertEqual([], reader.remainder)
+                else:
+                    self.assertEqual(document[key], list(reader))
+                    document_ = dict(document)
+                    document_[key] = []
+                    self.assertEqual(document_, reader.remainder)
+
+    def testStringsAndNesting(self):
+        '''Test that brackets in strings and nested arrays are skipped'''
+        data = b'{"a": "[\\"]", "users" : [1, "x]\\\\", {"b": [2]}], "next_cursor": 5}'
+        reader = JsonArrayReader(_Chunks(data, 3), key='users')
+        self.assertEqual([1, u'x]\\', {u'b': [2]}], list(reader))
+        self.assertEqual({u'a': u'["]', u'users': [], u'next_cursor': 5}, reader.remainder)
+
+    def testYieldsBeforeEnd(self):
+        '''Test that elements are yielded before the document is complete'''
+        read = []
+
+        def Chunks():
+            for chunk in [b'[{"id": 1}, ', b'{"id": 2}', b']']:
+                read.append(chunk)
+                yield chunk
+
+        reader = iter(JsonArrayReader(Chunks(), factory=lambda x: x['id']))
+        self.assertEqual(1, next(reader))
+        self.assertEqual(1, len(read))
+
+    def testNotAnArray(self):
+        '''Test that other documents end up in the remainder'''
+        reader = JsonArrayReader([b'{"errors": [{"code": 88}]}'])
+        self.assertEqual([], list(reader))
+        self.assertEqual({u'errors': [{u'code': 88}]}, reader.remainder)
+        self.assertRaises(ValueError, list, JsonArrayReader([b'<html>[1, 2]</html>']))
+        self.assertRaises(ValueError, list, JsonArrayReader([b'[{"id": 1}, {"id"']))
@@ -0,0 +1,79 @@
+# encoding: utf-8
+
+import io
+import unittest
+
+import twitter
+from twitter import json
+
+
+class JsonBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = json.backend
+
+    def tearDown(self):
+        json.set_backend(self.backend)
+
+    def testBackends(self):
+        '''Test that every installed backend parses bytes and text alike'''
+        document = u'{"id": 675055636267298821, "text": "caf\\u00e9 ☕"}'
+        self.assertTrue('json' in json.available_backends())
+        for name in json.available_backends():
+            self.assertEqual(name, json.set_backend(name))
+            expected = {'id': 675055636267298821, 'text': u'caf\xe9 ☕'}
+            self.assertEqual(expected, json.loads(document.encode('utf-8')))
+            self.assertEqual(expected, json.loads(document))
+            self.assertRaises(ValueError, json.loads, b'<html>')
+
+    def testUnknownBackend(self):
+        '''Test that selecting an unknown backend fails'''
+        self.assertRaises(twitter.TwitterError, json.set_backend, 'simplejson')
+        self.assertEqual(self.backend, json.backend)
+
+    def testParseAndCheckBytes(self):
+        '''Test that the Api parses undecoded responses'''
+        api = twitter.Api(consumer_key='c', consumer_secret='s',
+                          access_token_key='k', access_token_secret='t')
+        self.assertEqual({'id': 1}, api._ParseAndCheckTwitter(b'{"id": 1}'))
+        try:
+            api._ParseAndCheckTwitter(b'<title>Twitter / Over capacity</title>')
+        except twitter.TwitterError as error:
+            self.assertEqual('Capacity Error', error.message['message'])
+        else:
+            self.fail('TwitterError not raised')
+
+    def testDumpLines(self):
+        '''Test that every backend writes models as JSON Lines'''
+        with open('testdata/get_home_timeline.json') as f:
+            timeline = json.loads(f.read())
+        statuses = [twitter.Status.NewFromJsonDict(x) for x in timeline]
+        statuses[0] = twitter.Status.NewFromJsonDict(timeline[0], keep_json=True)
+        expected = [json.loads(json.dumps(x.AsDict())) for x in statuses]
+        expected[0] = timeline[0]
+        self.assertTrue(any(x.media for x in statuses))
+        for name in json.available_backends():
+            json.set_backend(name)
+            for ensure_ascii in (True, False):
+                out = io.StringIO()
+                self.assertEqual(len(statuses), json.dump_lines(
+                    statuses, out, sort_keys=True, ensure_ascii=ensure_ascii))
+                lines = out.getvalue().split('\n')
+                self.assertEqual('', lines.pop())
+                self.assertEqual(expected, [json.loads(line) for line in lines])
+        self.assertRaises(TypeError, json.dumps, {'id': object()})
+
+    def testStdlibSurface(self):
+        '''Test that the options of the json module are honoured'''
+        status = twitter.Status(id=1, text='a')
+        self.assertEqual('{"id":1,"text":"a"}', json.dumps(status, separators=(',', ':')))
+        self.assertEqual('[\n  1\n]', json.dumps([1], indent=2))
+        self.assertEqual('"1"', json.dumps(object(), default=lambda obj: '1'))
+        self.assertEqual({'id': 1.0}, json.loads(b'{"id": 1}', parse_int=float))
+        out = io.StringIO()
+        json.dump({u'id': 1}, out, indent=None)
+        out.seek(0)
+        self.assertEqual({'id': 1}, json.load(out))
+        for name in json.available_backends():
+            json.set_backend(name)
+            self.assertRaises(json.JSONDecodeError, json.loads, b'<html>')
@@ -0,0 +1,40 @@
+# encoding: utf-8
+
+import unittest
+
+import twitter
+
+
+def _Timeline(*ids):
+    return [twitter.Status(id=i) for i in ids]
+
+
+class MergeTimelinesTest(unittest.TestCase):
+
+    def testMerge(self):
+        '''Test that timelines are merged in descending id order'''
+        merged = twitter.MergeTimelines([_Timeline(9, 4, 1), _Timeline(), _Timeline(8, 7, 2)])
+        self.assertEqual([9, 8, 7, 4, 2, 1], [s.id for s in merged])
+
+    def testDedup(self):
+        '''Test that repeats and retweets of seen statuses are skipped'''
+        original = twitter.Status(id=5)
+        retweet = twitter.Status(id=7, retweeted_status=original)
+        other_retweet = twitter.Status(id=6, retweeted_status=original)
+        sources = [[retweet, original], [other_retweet, original], _Timeline(7, 3)]
+        self.assertEqual([7, 3], [s.id for s in twitter.MergeTimelines(sources)])
+        self.assertEqual([7, 7, 6, 5, 5, 3],
+                         [s.id for s in twitter.MergeTimelines(sources, dedup=False)])
+
+    def testLazy(self):
+        '''Test that sources are only consumed as far as needed'''
+        consumed = []
+
+        def Source(ids):
+            for i in ids:
+                consumed.append(i)
+                yield twitter.Status(id=i)
+
+        merged = twitter.MergeTimelines([Source([10, 5, 1]), Source([9, 8, 2])], max_results=2)
+        self.assertEqual([10, 9], [s.id for s in merged])
+        self.assertEqual([10, 9, 5, 8], consumed)
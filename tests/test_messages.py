@@ -0,0 +1,106 @@
+# encoding: utf-8
+
+import pickle
+import unittest
+
+import twitter
+from twitter import messages
+
+STATUS = b'{"created_at": "Fri Jan 01 00:00:00 +0000 2016", "id": 1, "text": "\\"event\\": no"}'
+DELETE = b'{"delete": {"status": {"id": 2, "id_str": "2", "user_id": 3, "user_id_str": "3"}}}'
+LIMIT = b'{"limit": {"track": 1234, "timestamp_ms": "1451606400000"}}'
+WARNING = b'{"warning": {"code": "FALLING_BEHIND", "message": "behind", "percent_full": 60}}'
+DISCONNECT = b'{"disconnect": {"code": 7, "stream_name": "s", "reason": "duplicate stream"}}'
+FRIENDS = b'{"friends": [4, 5]}'
+EVENT = (b'{"target": {"id": 6, "screen_name": "a"}, "source": {"id": 7, "screen_name": "b"},'
+         b' "event": "follow", "created_at": "Fri Jan 01 00:00:00 +0000 2016"}')
+SCRUB_GEO = b'{"scrub_geo": {"user_id": 8, "up_to_status_id": 9}}'
+
+
+class ClassifyTest(unittest.TestCase):
+
+    def testClassify(self):
+        '''Test classifying messages from their bytes'''
+        for frame, kind in [(STATUS, 'status'), (DELETE, 'delete'), (LIMIT, 'limit'),
+                            (WARNING, 'warning'), (DISCONNECT, 'disconnect'),
+                            (FRIENDS, 'friends'), (b'{"friends_str": ["4"]}', 'friends'),
+                            (EVENT, 'event'), (b' {"event": "block"}', 'event'),
+                            (SCRUB_GEO, 'other'), (b'{"errors": [{"code": 88}]}', 'error'),
+                            (b'<html>', 'status')]:
+            self.assertEqual(kind, messages.Classify(frame), frame)
+
+
+class StreamDispatcherTest(unittest.TestCase):
+
+    FRAMES = [STATUS, DELETE, b'', LIMIT, WARNING, FRIENDS, EVENT, SCRUB_GEO, DISCONNECT]
+
+    def testDispatch(self):
+        '''Test that handlers receive typed messages'''
+        received = []
+        dispatcher = twitter.StreamDispatcher()
+        for kind in messages.KINDS:
+            dispatcher.Register(kind, received.append)
+        decoded = list(dispatcher.Decode(self.FRAMES))
+        self.assertEqual(decoded, received)
+        status, deletion, limit, warning, friends, event, other, disconnect = decoded
+        self.assertEqual(1, status.id)
+        self.assertEqual((2, 3), (deletion.id, deletion.user_id))
+        self.assertEqual(1234, limit.track)
+        self.assertEqual(('FALLING_BEHIND', 60), (warning.code, warning.percent_full))
+        self.assertEqual([4, 5], friends.ids)
+        self.assertEqual(('follow', 7, 6), (event.event, event.source.id, event.target.id))
+        self.assertEqual(8, other['scrub_geo']['user_id'])
+        self.assertEqual('duplicate stream', disconnect.reason)
+        self.assertEqual({'id': 2, 'user_id': 3}, deletion.AsDict())
+        self.assertEqual("StatusDeletion(id=2, user_id=3)", repr(deletion))
+        for message in decoded[1:6]:
+            self.assertEqual(message, pickle.loads(pickle.dumps(message, 2)))
+
+    def testSkipsUnsubscribed(self):
+        '''Test that only subscribed kinds and control messages are decoded'''
+        deletions = []
+        dispatcher = twitter.StreamDispatcher()
+        dispatcher.Register('delete', deletions.append)
+        decoded = list(dispatcher.Decode(self.FRAMES + [b'{"id": 1, "text": "not json']))
+        self.assertEqual(['delete', 'warning', 'disconnect'], [m.KIND for m in decoded])
+        self.assertEqual(decoded[:1], deletions)
+        self.assertEqual(2, dispatcher.skipped['status'])
+        self.assertEqual(1, dispatcher.decoded['delete'])
+        self.assertEqual(0, dispatcher.decoded['status'])
+
+        dispatcher.Unregister('delete', deletions.append)
+        self.assertEqual(None, dispatcher.Dispatch(DELETE))
+        self.assertRaises(twitter.TwitterError, dispatcher.Dispatch, b'{"errors": [{"code": 88}]}')
+        self.assertRaises(twitter.TwitterError, dispatcher.Register, 'tweet', deletions.append)
+
+    def testStatuses(self):
+        '''Test fields and keep_json, and errors surfacing on decoding'''
+        dispatcher = twitter.StreamDispatcher()
+        dispatcher.Register('status', lambda status: None)
+        status = dispatcher.Dispatch(STATUS, keep_json=True)
+        self.assertEqual(STATUS, status.AsJsonString().encode('utf-8'))
+        self.assertEqual(None, dispatcher.Dispatch(STATUS, fields=['id']).text)
+        self.assertRaises(twitter.TwitterError, dispatcher.Dispatch, b'<html>')
+
+    def testStreamConsumer(self):
+        '''Test a dispatcher as the decoder of a twitter.StreamConsumer'''
+        from tests.fakes import FakeClock
+        from tests.test_stream import FakeApi, FakeResponse
+        clock = FakeClock()
+        api = FakeApi([FakeResponse(clock, 200, [STATUS, WARNING, DELETE, DISCONNECT]),
+                       FakeResponse(clock, 200, [DELETE])])
+        warnings = []
+        dispatcher = twitter.StreamDispatcher()
+        dispatcher.Register('delete', lambda deletion: None)
+        consumer = twitter.StreamConsumer(api, decoder=dispatcher, on_warning=warnings.append,
+                                          clock=clock, sleep=clock.sleep)
+        received = []
+        for message in consumer.Messages():
+            received.append(message.KIND)
+            if len(received) == 4:
+                consumer.Stop()
+        self.assertEqual(['warning', 'delete', 'disconnect', 'delete'], received)
+        self.assertEqual('FALLING_BEHIND', warnings[0].code)
+        stats = consumer.Stats()
+        self.assertEqual(60, stats['last_warning']['percent_full'])
+        self.assertEqual('Disconnect message: duplicate stream', stats['last_disconnect'])
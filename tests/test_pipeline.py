@@ -0,0 +1,122 @@
+# encoding: utf-8
+
+import multiprocessing
+import unittest
+
+import twitter
+from twitter import pipeline
+
+
+class FakeResponse(object):
+
+    def __init__(self, data, error=None):
+        self.data = data
+        self.error = error
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.data), 7):
+            yield self.data[i:i + 7]
+        if self.error is not None:
+            raise self.error
+
+
+class UnpicklableErrorApi(twitter.Api):
+    """Raises an error that cannot be pickled for the frame b'unpicklable'."""
+
+    def _StreamMessage(self, line, fields=None, keep_json=False):
+        if line == b'unpicklable':
+            error = ValueError('unpicklable')
+            error.callback = lambda: None
+            raise error
+        return twitter.Api._StreamMessage(self, line, fields, keep_json)
+
+
+class DecodePipelineTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = twitter.DecodePipeline(processes=2, batch_size=3, max_delay=0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pipeline.Close()
+
+    def setUp(self):
+        self.api = twitter.Api()
+        self.lines = [('{"id": %d, "text": "caf\\u00e9 %d"}' % (i, i)).encode('ascii')
+                      for i in range(20)]
+        self.lines.insert(5, b'{"delete": {"status": {"id": 1}}}')
+        self.lines.insert(9, b'')
+
+    def _Messages(self, lines, decoder, error=None, **kwargs):
+        resp = FakeResponse(b''.join(line + b'\r\n' for line in lines), error)
+        return list(self.api._StreamMessages(resp, decoder=decoder, **kwargs))
+
+    def testOrdered(self):
+        '''Test that the pipeline yields what decoding in one thread yields'''
+        for kwargs in ({}, {'keep_json': True}, {'fields': ['id']}):
+            expected = self._Messages(self.lines, None, **kwargs)
+            self.assertEqual(21, len(expected))
+            self.assertEqual(expected, self._Messages(self.lines, self.pipeline, **kwargs))
+        decoded = self._Messages(self.lines, self.pipeline, keep_json=True)
+        self.assertEqual(self.lines[0], decoded[0].AsJsonString().encode('ascii'))
+        self.assertEqual(u'café 0', decoded[0].text)
+
+    def testUnordered(self):
+        '''Test that an unordered pipeline yields every message'''
+        pipeline = twitter.DecodePipeline(processes=2, batch_size=2, ordered=False)
+        try:
+            messages = self._Messages(self.lines, pipeline)
+        finally:
+            pipeline.Close()
+        self.assertEqual(sorted(m.get('id', -1) for m in self._Messages(self.lines, None)),
+                         sorted(m.get('id', -1) for m in messages))
+
+    def testErrors(self):
+        '''Test that errors are raised after the messages before them'''
+        messages = []
+        lines = self.lines[:4] + [b'{"errors": [{"code": 130}]}'] + self.lines[4:]
+        try:
+            for message in self.api._StreamMessages(
+                    FakeResponse(b'\r\n'.join(lines)), decoder=self.pipeline):
+                messages.append(message)
+        except twitter.TwitterError as e:
+            self.assertEqual([{'code': 130}], e.message)
+        else:
+            self.fail('no error raised')
+        self.assertEqual([0, 1, 2, 3], [m['id'] for m in messages])
+
+        error = IOError('reset')
+        try:
+            self._Messages(self.lines[:2], self.pipeline, error)
+        except IOError as e:
+            self.assertTrue(e is error)
+        else:
+            self.fail('no error raised')
+
+    @unittest.skipIf(getattr(multiprocessing, 'get_start_method', lambda: 'fork')() != 'fork',
+                     'the workers must inherit the fake Api')
+    def testUnpicklableError(self):
+        '''Test that an error which cannot be pickled still ends the stream'''
+        decoder = twitter.DecodePipeline(processes=1, batch_size=3, max_delay=0.01)
+        worker_api, pipeline._worker_api = pipeline._worker_api, UnpicklableErrorApi()
+        messages = []
+        try:
+            lines = self.lines[:4] + [b'unpicklable'] + self.lines[4:]
+            for message in self.api._StreamMessages(FakeResponse(b'\r\n'.join(lines)),
+                                                    decoder=decoder):
+                messages.append(message)
+        except twitter.TwitterError as e:
+            self.assertTrue('unpicklable' in e.message['message'])
+        else:
+            self.fail('no error raised')
+        finally:
+            pipeline._worker_api = worker_api
+            decoder.Close()
+        self.assertEqual([0, 1, 2, 3], [m['id'] for m in messages])
+
+    def testValidation(self):
+        '''Test the validation of the parameters'''
+        self.assertRaises(twitter.TwitterError, twitter.DecodePipeline, processes=0)
+        self.assertRaises(twitter.TwitterError, twitter.DecodePipeline, batch_size=0)
+        self.assertRaises(twitter.TwitterError, twitter.DecodePipeline, backlog=0)
@@ -0,0 +1,143 @@
+# encoding: utf-8
+
+import time
+import unittest
+
+import twitter
+
+from .fakes import FakeClock
+
+
+class FakeApi(object):
+    """Serves user timelines from a dict of screen_name -> statuses."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.timelines = {}
+        self.calls = []
+
+    def Post(self, screen_name, status_id):
+        created_at = time.strftime('%a %b %d %H:%M:%S +0000 %Y',
+                                   time.gmtime(self.clock.now))
+        status = twitter.Status(id=status_id, created_at=created_at)
+        self.timelines.setdefault(screen_name, []).insert(0, status)
+
+    def GetUserTimeline(self, user_id=None, screen_name=None, since_id=None,
+                        max_id=None, count=None, **kwargs):
+        self.calls.append((screen_name, since_id, max_id))
+        statuses = [s for s in self.timelines.get(screen_name, [])
+                    if since_id is None or s.id > since_id]
+        statuses = [s for s in statuses if max_id is None or s.id <= max_id]
+        return statuses[:count]
+
+
+class AdaptivePollerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.api = FakeApi(self.clock)
+        self.poller = twitter.AdaptivePoller(self.api,
+                                             requests_per_window=900,
+                                             window=900,
+                                             min_interval=10,
+                                             max_interval=1000,
+                                             tweets_per_poll=1,
+                                             clock=self.clock,
+                                             sleep=self.clock.sleep)
+
+    def testUsesSinceId(self):
+        '''Test that polls after the first pass the newest id seen'''
+        self.api.Post('busy', 1)
+        self.api.Post('busy', 2)
+        key = self.poller.AddUser(screen_name='busy')
+        key_, statuses = self.poller.Poll()
+        self.assertEqual(key, key_)
+        self.assertEqual([2, 1], [s.id for s in statuses])
+        self.assertEqual(2, self.poller.GetSinceId(key))
+
+        self.api.Post('busy', 3)
+        key_, statuses = self.poller.Poll()
+        self.assertEqual([3], [s.id for s in statuses])
+        self.assertEqual(('busy', 2, None), self.api.calls[-1])
+
+    def testBusySourcesPolledMoreOften(self):
+        '''Test that the interval follows the posting rate'''
+        self.api.Post('quiet', 100)
+        for i in range(1, 20):
+            self.api.Post('busy', i)
+            self.clock.now += 10
+        busy = self.poller.AddUser(screen_name='busy')
+        quiet = self.poller.AddUser(screen_name='quiet')
+        for key, statuses in self.poller.Run(max_polls=2):
+            pass
+        self.assertTrue(self.poller.GetRate(busy) > self.poller.GetRate(quiet))
+        self.assertTrue(self.poller.GetInterval(busy) < self.poller.GetInterval(quiet))
+        self.assertEqual(10, self.poller.GetInterval(busy))
+
+    def testDormantSourceBacksOff(self):
+        '''Test that empty polls stretch the interval of a source'''
+        self.api.Post('sleepy', 1)
+        self.clock.now += 20
+        key = self.poller.AddUser(screen_name='sleepy')
+        self.poller.Poll()
+        first = self.poller.GetInterval(key)
+        for _ in range(5):
+            self.poller.Poll()
+        self.assertTrue(self.poller.GetInterval(key) > first)
+
+    def testBudgetIsRespected(self):
+        '''Test that intervals stretch when the budget is oversubscribed'''
+        poller = twitter.AdaptivePoller(self.api,
+                                        requests_per_window=10,
+                                        window=100,
+                                        min_interval=1,
+                                        max_interval=1000,
+                                        tweets_per_poll=1,
+                                        clock=self.clock,
+                                        sleep=self.clock.sleep)
+        for name in ('a', 'b', 'c', 'd'):
+            for i in range(10):
+                self.api.Post(name, i + 1)
+            poller.AddUser(screen_name=name)
+        start = self.clock.now
+        list(poller.Run(max_polls=40))
+        self.assertEqual(40, poller.requests)
+        self.assertTrue(self.clock.now - start >= 39 * 10)
+
+    def testRemove(self):
+        '''Test that removed sources are no longer polled'''
+        key = self.poller.AddUser(screen_name='gone')
+        self.poller.Remove(key)
+        self.assertEqual(None, self.poller.Poll())
+        self.assertRaises(twitter.TwitterError, lambda: self.poller.AddUser())
+
+    def testGapIsResumed(self):
+        '''Test that a poll cut short by max_pages resumes on the next poll'''
+        poller = twitter.AdaptivePoller(self.api, count=2, max_pages=2,
+                                        min_interval=1, max_interval=10,
+                                        clock=self.clock, sleep=self.clock.sleep)
+        for i in range(1, 21):
+            self.api.Post('busy', i)
+        key = poller.AddUser(screen_name='busy', since_id=1)
+        ids = []
+        for _, statuses in poller.Run(max_polls=5):
+            ids.extend(s.id for s in statuses)
+        self.assertEqual(list(range(20, 1, -1)), ids)
+        self.assertEqual(20, poller.GetSinceId(key))
+
+    def testErrorsKeepSourceScheduled(self):
+        '''Test that a failing poll does not drop the source'''
+        def Fail(**kwargs):
+            raise IOError('connection reset')
+        self.api.GetUserTimeline = Fail
+        key = self.poller.AddUser(screen_name='flaky')
+        self.assertRaises(IOError, self.poller.Poll)
+        self.assertTrue(self.poller.NextPollTime() is not None)
+        self.assertEqual(None, self.poller.GetSinceId(key))
+
+    def testInitialRateWithoutTimestamps(self):
+        '''Test the first poll of statuses without created_at'''
+        self.api.timelines['bare'] = [twitter.Status(id=1)]
+        key = self.poller.AddUser(screen_name='bare')
+        self.poller.Poll()
+        self.assertEqual(0.0, self.poller.GetRate(key))
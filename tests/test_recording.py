@@ -0,0 +1,141 @@
+# encoding: utf-8
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import responses
+
+import twitter
+from twitter import recording
+
+from .fakes import FakeClock
+
+
+class FakeResponse(object):
+    """Serves chunks, advancing the clock by one second before each."""
+
+    status_code = 200
+
+    def __init__(self, clock, chunks):
+        self.clock = clock
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            self.clock.now += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingTest(unittest.TestCase):
+
+    CONNECTIONS = [[b'{"id": 1, "text": "a"}\r\n{"id"', b': 2, "text": "b"}\r\n', b'\r\n'],
+                   [b'{"id": 3, "text": "c"}\r\n']]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _Record(self, **kwargs):
+        with twitter.StreamRecorder(self.directory, clock=self.clock, **kwargs) as recorder:
+            for chunks in self.CONNECTIONS:
+                resp = recorder.Tee(FakeResponse(self.clock, chunks), 'https://stream/sample.json')
+                self.assertEqual(chunks, list(resp.iter_content(8192)))
+                resp.close()
+                self.clock.now += 10
+        return recorder
+
+    def testRecord(self):
+        '''Test recording connections into rotated segments'''
+        for compress in (True, False):
+            recorder = self._Record(segment_size=64, compress=compress)
+            self.assertTrue(len(recorder.segments) > 1)
+            self.assertTrue(all(path.endswith('.gz') == compress for path in recorder.segments))
+            records = list(recording.ReadRecords(self.directory))
+            first = [recording.CONNECT] + [recording.DATA] * 3 + [recording.CLOSE]
+            second = [recording.CONNECT, recording.DATA, recording.CLOSE]
+            self.assertEqual(first + second, [kind for _, kind, _ in records])
+            self.assertEqual(self.CONNECTIONS[0][1], records[2][2])
+            self.assertEqual(2, records[2][0] - records[0][0])
+            self.assertEqual(b'end of stream', records[4][2])
+            shutil.rmtree(self.directory)
+
+        os.makedirs(self.directory)
+        self._Record(segment_seconds=None)
+        recorder = self._Record()
+        self.assertEqual(['stream-000002.rec.gz'], [os.path.basename(p) for p in recorder.segments])
+        self.assertEqual(16, len(list(recording.ReadRecords(self.directory))))
+
+    def testTruncated(self):
+        '''Test that a segment cut short by a crash ends at its last whole record'''
+        for compress in (True, False):
+            recorder = self._Record(compress=compress)
+            records = list(recording.ReadRecords(self.directory))
+            path = recorder.segments[0]
+            with open(path, 'rb') as f:
+                data = f.read()
+            for size in (len(data) - 1, len(data) // 2, len(recording.MAGIC) + 2, 0):
+                with open(path, 'wb') as f:
+                    f.write(data[:size])
+                truncated = list(recording.ReadRecords(path))
+                self.assertEqual(records[:len(truncated)], truncated)
+                if size <= len(data) // 2:
+                    self.assertTrue(len(truncated) < len(records))
+            shutil.rmtree(self.directory)
+            os.makedirs(self.directory)
+
+    def testFlush(self):
+        '''Test that connections are readable while the segment is open'''
+        recorder = twitter.StreamRecorder(self.directory, clock=self.clock)
+        try:
+            resp = recorder.Tee(FakeResponse(self.clock, self.CONNECTIONS[1]), 'https://stream')
+            list(resp.iter_content())
+            kinds = [kind for _, kind, _ in recording.ReadRecords(self.directory)]
+            self.assertEqual([recording.CONNECT, recording.DATA, recording.CLOSE], kinds)
+        finally:
+            recorder.Close()
+
+    def testReplay(self):
+        '''Test replaying a recording through a twitter.StreamConsumer'''
+        self._Record()
+        for speed, sleeps in [(None, []), (1, [1, 1, 1, 10, 1]), (4, [0.25, 0.25, 0.25, 2.5, 0.25])]:
+            clock = FakeClock(0)
+            replayer = twitter.StreamReplayer(self.directory, speed=speed,
+                                              clock=clock, sleep=clock.sleep)
+            api = twitter.Api()
+            api.SetStreamReplayer(replayer)
+            consumer = twitter.StreamConsumer(api, clock=clock, sleep=lambda seconds: None)
+            replayer.on_end = consumer.Stop
+            self.assertEqual([1, 2, 3], [m['id'] for m in consumer.Messages()])
+            self.assertEqual(sleeps, clock.sleeps)
+            self.assertEqual((2, 4), (replayer.connections, replayer.chunks))
+            self.assertEqual(2, consumer.Stats()['connects'])
+            self.assertRaises(twitter.TwitterError, replayer.Connect)
+        self.assertRaises(twitter.TwitterError, twitter.StreamReplayer, self.directory, speed=0)
+
+    @responses.activate
+    def testApiRecorder(self):
+        '''Test recording the streams of a twitter.Api'''
+        body = b'{"id": 1, "text": "a"}\r\n'
+        responses.add(responses.GET, 'https://stream.twitter.com/1.1/statuses/sample.json',
+                      body=body, status=200)
+        api = twitter.Api()
+        with twitter.StreamRecorder(self.directory) as recorder:
+            api.SetStreamRecorder(recorder)
+            self.assertEqual([{'id': 1, 'text': 'a'}], list(api.GetStreamSample()))
+        records = list(recording.ReadRecords(recorder.segments[0]))
+        self.assertEqual(b'https://stream.twitter.com/1.1/statuses/sample.json',
+                         records[0][2].split(b'?')[0])
+        self.assertEqual(body, b''.join(p for _, kind, p in records if kind == recording.DATA))
+
+        api.SetStreamRecorder(None)
+        api.SetStreamReplayer(twitter.StreamReplayer(self.directory, speed=None))
+        self.assertEqual([{'id': 1, 'text': 'a'}], list(api.GetStreamSample()))
@@ -0,0 +1,95 @@
+# encoding: utf-8
+
+import json
+import pickle
+import unittest
+
+import twitter
+from twitter._schema import Field, Schema, NOT_NONE
+
+
+def _ParseTotal(data, lazy=False, identity_map=None):
+    return data.get('a', 0) + data.get('b', 0)
+
+
+_SCHEMA = Schema('Example', [
+    Field('id'),
+    Field('name', key='screen_name'),
+    Field('total', parse=_ParseTotal, compare=False),
+    Field('flag', dump_if=NOT_NONE),
+    Field('note', key=None, dump=None),
+    Field('_cache', key=None, dump=None, compare=False, pickle=False),
+])
+
+
+class Example(object):
+    __slots__ = _SCHEMA.Slots()
+    __init__ = _SCHEMA.Init(doc='An example model.')
+    __eq__ = _SCHEMA.Eq()
+    AsDict = _SCHEMA.AsDict()
+    _Build = _SCHEMA.Builder()
+    __reduce__ = _SCHEMA.Reduce(lambda: Example)
+    __setstate__ = _SCHEMA.SetState()
+
+
+class SchemaTest(unittest.TestCase):
+
+    def testInit(self):
+        example = Example(id=1, name='x', unknown=2)
+        self.assertEqual(1, example.id)
+        self.assertEqual('x', example.name)
+        self.assertEqual(None, example.flag)
+        self.assertEqual(None, example._cache)
+        self.assertEqual('An example model.', Example.__init__.__doc__)
+
+    def testBuild(self):
+        example = Example._Build({'id': 1, 'screen_name': 'x', 'a': 2, 'b': 3,
+                                  'flag': False, 'note': 'ignored'})
+        self.assertTrue(isinstance(example, Example))
+        self.assertEqual((1, 'x', 5, False, None, None),
+                         (example.id, example.name, example.total, example.flag,
+                          example.note, example._cache))
+        self.assertEqual(5, _SCHEMA.by_name['total'].Read({'a': 2, 'b': 3}))
+        self.assertEqual('x', _SCHEMA.by_name['name'].Read({'screen_name': 'x'}))
+        self.assertEqual(None, _SCHEMA.by_name['note'].Read({'note': 'ignored'}))
+
+    def testAsDict(self):
+        self.assertEqual({'id': 1, 'flag': False, 'total': 5},
+                         Example(id=1, name='', total=5, flag=False, note='n').AsDict())
+        self.assertEqual({}, Example().AsDict())
+
+    def testEq(self):
+        self.assertEqual(Example(id=1, total=1), Example(id=1, total=2))
+        self.assertNotEqual(Example(id=1), Example(id=2))
+        self.assertFalse(Example(id=1) == object())
+
+    def testPublicNames(self):
+        self.assertEqual(frozenset(['id', 'name', 'total', 'flag', 'note']), _SCHEMA.PublicNames())
+
+    def testPickle(self):
+        example = Example(id=1, name='x', total=5, note='n')
+        example._cache = 'cached'
+        self.assertEqual((twitter._schema.New, (Example,), (1, 'x', 5, None, 'n')),
+                         example.__reduce__())
+        copy = pickle.loads(pickle.dumps(example, 2))
+        self.assertEqual((1, 'x', 5, 'n', None),
+                         (copy.id, copy.name, copy.total, copy.note, copy._cache))
+
+    def testModels(self):
+        with open('testdata/get_list_timeline.json') as f:
+            timeline = json.load(f)
+        for data in timeline:
+            status = twitter.Status.NewFromJsonDict(data)
+            self.assertEqual(status, twitter.Status.NewFromJsonDict(data))
+            status.user.followers_count = -1
+            self.assertNotEqual(status, twitter.Status.NewFromJsonDict(data))
+        message = twitter.DirectMessage(1, 'Fri Jan 26 23:17:14 +0000 2007', text='hi')
+        self.assertEqual({'id': 1, 'created_at': 'Fri Jan 26 23:17:14 +0000 2007', 'text': 'hi'},
+                         message.AsDict())
+        self.assertRaises(TypeError, twitter.DirectMessage, unknown=1)
+        with open('testdata/get_lists.json') as f:
+            lst = twitter.List.NewFromJsonDict(json.load(f)['lists'][0])
+        copy = pickle.loads(pickle.dumps(lst, 2))
+        self.assertEqual(lst, copy)
+        self.assertEqual(lst.user, copy.user)
+        self.assertEqual(message.AsDict(), pickle.loads(pickle.dumps(message, 2)).AsDict())
@@ -0,0 +1,207 @@
+# encoding: utf-8
+
+import unittest
+
+import twitter
+from twitter.search import CombineQueries, PackQueries, QueryMatcher
+
+
+class FakeApi(object):
+    """Answers GetSearch from a fixed list of statuses using QueryMatcher."""
+
+    def __init__(self, statuses, page_size=100):
+        self.statuses = sorted(statuses, key=lambda s: s['id'], reverse=True)
+        self.page_size = page_size
+        self.terms = []
+
+    def GetSearch(self, term=None, raw_query=None, since_id=None, max_id=None,
+                  count=15, return_json=False, **kwargs):
+        if raw_query is not None:
+            parameters = dict(pair.split('=', 1) for pair in raw_query.split('&'))
+            term = self.terms[int(parameters['q'])]
+            max_id = int(parameters['max_id'])
+            since_id = parameters.get('since_id') and int(parameters['since_id'])
+        self.terms.append(term)
+        groups = [g.strip() for g in term.split(' OR ')]
+        matchers = [QueryMatcher(g[1:-1] if g.startswith('(') else g) for g in groups]
+        found = [s for s in self.statuses if since_id is None or s['id'] > since_id]
+        found = [s for s in found if max_id is None or s['id'] <= max_id]
+        found = [s for s in found
+                 if any(m.Matches(twitter.Status.NewFromJsonDict(s)) for m in matchers)]
+        page = found[:min(count, self.page_size)]
+        metadata = {}
+        if len(found) > len(page):
+            metadata['next_results'] = '?max_id=%d&q=%d' % (page[-1]['id'] - 1, len(self.terms) - 1)
+        return {'statuses': page, 'search_metadata': metadata}
+
+
+def _Status(id, text, screen_name='someone', lang='en'):
+    return twitter.Status(id=id, text=text, lang=lang,
+                          user=twitter.User(screen_name=screen_name))
+
+
+def _Json(id, text):
+    return {'id': id, 'text': text, 'lang': 'en', 'user': {'screen_name': 'someone'}}
+
+
+class QueryMatcherTest(unittest.TestCase):
+
+    def testWords(self):
+        '''Test that all words of a query must match'''
+        matcher = QueryMatcher('python twitter')
+        self.assertTrue(matcher.Matches(_Status(1, 'Twitter from Python!')))
+        self.assertFalse(matcher.Matches(_Status(1, 'Only python here')))
+        self.assertTrue(QueryMatcher('python').Matches(_Status(1, 'I like #python')))
+
+    def testOperators(self):
+        '''Test phrases, OR, negation, hashtags and operators'''
+        status = _Status(1, 'New release of #django today', screen_name='DjangoProject')
+        self.assertTrue(QueryMatcher('"release of" -flask').Matches(status))
+        self.assertFalse(QueryMatcher('"of release"').Matches(status))
+        self.assertTrue(QueryMatcher('flask OR django').Matches(status))
+        self.assertFalse(QueryMatcher('#release').Matches(status))
+        self.assertTrue(QueryMatcher('from:djangoproject lang:en').Matches(status))
+        self.assertFalse(QueryMatcher('-from:djangoproject').Matches(status))
+
+    def testUnsupported(self):
+        '''Test that unsupported syntax is rejected'''
+        self.assertRaises(twitter.TwitterError, lambda: QueryMatcher('filter:links python'))
+        self.assertRaises(twitter.TwitterError, lambda: QueryMatcher('OR python'))
+        for query in ('#', '@', '#-foo'):
+            self.assertRaises(twitter.TwitterError, lambda: QueryMatcher(query))
+
+
+class PackQueriesTest(unittest.TestCase):
+
+    def testPacking(self):
+        '''Test that packed queries respect the length limit'''
+        queries = ['query%d' % i for i in range(100)] + ['two words']
+        groups = PackQueries(queries, max_length=100)
+        self.assertEqual(sorted(queries), sorted(q for g in groups for q in g))
+        for group in groups:
+            self.assertTrue(len(CombineQueries(group)) <= 100)
+        self.assertEqual(12, len(groups))
+        self.assertTrue('(two words)' in CombineQueries(groups[0]))
+        self.assertRaises(twitter.TwitterError, lambda: PackQueries(['x' * 20], max_length=10))
+
+
+class SearchMultiplexerTest(unittest.TestCase):
+
+    def testPollRoutesResults(self):
+        '''Test that results of combined queries reach the right queries'''
+        api = FakeApi([_Json(1, 'python rocks'),
+                       _Json(2, 'ruby rocks'),
+                       _Json(3, 'python and ruby'),
+                       _Json(4, 'nothing to see')])
+        mux = twitter.SearchMultiplexer(api, ['python', 'ruby', 'python -ruby'])
+        self.assertEqual(1, len(mux.GetCombinedQueries()))
+        results = mux.Poll()
+        self.assertEqual(1, mux.requests)
+        self.assertEqual([3, 1], [s.id for s in results['python']])
+        self.assertEqual([3, 2], [s.id for s in results['ruby']])
+        self.assertEqual([1], [s.id for s in results['python -ruby']])
+        self.assertEqual(3, mux.GetSinceId('python'))
+
+        api.statuses.insert(0, _Json(5, 'more python'))
+        results = mux.Poll()
+        self.assertEqual(['python', 'python -ruby'], sorted(results))
+        self.assertEqual([5], [s.id for s in results['python']])
+
+    def testTruncatedPollsResume(self):
+        '''Test that results beyond max_pages are delivered by later polls'''
+        api = FakeApi([_Json(1, 'python')], page_size=2)
+        mux = twitter.SearchMultiplexer(api, ['python', 'ruby'], max_pages=2)
+        mux.Poll()
+        self.assertEqual(1, mux.GetSinceId('python'))
+
+        api.statuses = [_Json(i, 'python') for i in range(12, 0, -1)]
+        ids = []
+        for _ in range(4):
+            ids.extend(s.id for s in mux.Poll().get('python', []))
+        self.assertEqual(list(range(12, 1, -1)), ids)
+        self.assertEqual(12, mux.GetSinceId('python'))
+        self.assertEqual(12, mux.GetSinceId('ruby'))
+
+    def testAddKeepsExistingQueriesIncremental(self):
+        '''Test that adding a query does not skip results of its group'''
+        api = FakeApi([_Json(1, 'python')], page_size=2)
+        mux = twitter.SearchMultiplexer(api, ['python'], max_pages=5)
+        mux.Poll()
+        api.statuses = [_Json(i, 'python ruby') for i in range(6, 0, -1)]
+        mux.Add('ruby')
+        results = mux.Poll()
+        self.assertEqual([6, 5, 4, 3, 2], [s.id for s in results['python']])
+        self.assertEqual(6, mux.GetSinceId('ruby'))
+
+    def testUnmatchableQueriesPolledAlone(self):
+        '''Test that queries the matcher rejects get their own search'''
+        api = FakeApi([])
+        api.GetSearch = lambda term=None, **kwargs: api.terms.append(term) or {}
+        mux = twitter.SearchMultiplexer(api, ['python', 'ruby', 'url:example filter:links', '#'])
+        mux.Poll()
+        self.assertEqual(['#', 'python OR ruby', '(url:example filter:links)'], sorted(api.terms, key=len))
+
+
+class FakePagedApi(object):
+    """Serves search/tweets pages with search_metadata for a list of ids."""
+
+    def __init__(self, ids):
+        self.ids = sorted(ids, reverse=True)
+        self.queries = []
+
+    def _Page(self, since_id, max_id, count):
+        ids = [i for i in self.ids if i > since_id and (max_id is None or i <= max_id)]
+        page = ids[:count]
+        metadata = {'refresh_url': '?since_id=%d&q=python&include_entities=1' % (page[0] if page else since_id)}
+        if len(ids) > count:
+            metadata['next_results'] = '?max_id=%d&q=python&include_entities=1' % (page[-1] - 1)
+        created_at = 'Fri Jan 01 12:00:00 +0000 2016'
+        return {'statuses': [{'id': i, 'text': 'python', 'created_at': created_at} for i in page],
+                'search_metadata': metadata}
+
+    def GetSearch(self, raw_query=None, max_id=None, count=15, return_json=False, **kwargs):
+        self.queries.append(raw_query)
+        parameters = {'since_id': 0, 'max_id': max_id, 'count': count}
+        if raw_query:
+            for pair in raw_query.split('&'):
+                key, _, value = pair.partition('=')
+                if key in parameters:
+                    parameters[key] = int(value)
+        return self._Page(**parameters)
+
+
+class SearchIteratorTest(unittest.TestCase):
+
+    def testBackfill(self):
+        '''Test that Backfill follows next_results with the maximum count'''
+        api = FakePagedApi(range(1, 251))
+        search = twitter.SearchIterator(api, term='python')
+        ids = [s.id for s in search.Backfill()]
+        self.assertEqual(list(range(250, 0, -1)), ids)
+        self.assertEqual(3, search.requests)
+        self.assertEqual('max_id=150&q=python&include_entities=1&count=100', api.queries[1])
+        self.assertEqual('since_id=250&q=python&include_entities=1&count=100', search.refresh_url)
+
+    def testBackfillStops(self):
+        '''Test the result cap and the time bound of Backfill'''
+        api = FakePagedApi(range(1, 251))
+        search = twitter.SearchIterator(api, term='python')
+        self.assertEqual(120, len(list(search.Backfill(max_results=120))))
+        self.assertEqual(2, search.requests)
+        self.assertEqual([], list(search.Backfill(oldest=1451649601)))
+        self.assertEqual([], list(search.Backfill(max_results=0)))
+        self.assertEqual(3, search.requests)
+
+    def testRefresh(self):
+        '''Test that Refresh polls forward and closes gaps'''
+        api = FakePagedApi(range(1, 11))
+        sleeps = []
+        search = twitter.SearchIterator(api, term='python', sleep=sleeps.append)
+        self.assertEqual(10, len(list(search.Backfill())))
+
+        api.ids = list(range(260, 0, -1))
+        statuses = search.Refresh(interval=5, max_results=250)
+        self.assertEqual(list(range(260, 10, -1)), [s.id for s in statuses])
+        self.assertEqual('since_id=10&q=python&include_entities=1&count=100', api.queries[1])
+        self.assertEqual('since_id=260&q=python&include_entities=1&count=100', search.refresh_url)
+        self.assertEqual([], sleeps)
@@ -5,6 +5,7 @@ import twitter
 import calendar
 import time
 import json
+import pickle
 import unittest
 
 
@@ -121,3 +122,112 @@ class StatusTest(unittest.TestCase):
     def testStatusRepresentation(self):
         status = self._GetSampleStatus()
         self.assertEqual("Status(ID=4391023, screen_name='kesuke', created_at='Fri Jan 26 23:17:14 +0000 2007')", status.__repr__())
+
+    def testSlots(self):
+        '''Test that twitter.Status has no instance dict and working properties'''
+        status = self._GetSampleStatus()
+        self.assertFalse(hasattr(status, '__dict__'))
+        self.assertRaises(AttributeError, setattr, status, 'no_such_field', 1)
+        status.Text = 'edited'
+        self.assertEqual('edited', status.text)
+        self.assertEqual(4391023, status.Id)
+        self.assertEqual('kesuke', status.User.ScreenName)
+
+    def testCreatedAtInSecondsCache(self):
+        '''Test that CreatedAtInSeconds follows changes to created_at'''
+        status = twitter.Status(created_at='Fri Jan 26 23:17:14 +0000 2007')
+        self.assertEqual(1169853434, status.CreatedAtInSeconds)
+        self.assertEqual(1169853434, status.CreatedAtInSeconds)
+        status.created_at = 'Sat Jan 27 23:17:14 +0000 2007'
+        self.assertEqual(1169939834, status.CreatedAtInSeconds)
+        lazy = twitter.Status.NewFromJsonDict(json.loads(self.SAMPLE_JSON), lazy=True)
+        self.assertEqual(1169853434, lazy.CreatedAtInSeconds)
+
+    def testNewFromJsonDictFields(self):
+        '''Test that a projection only builds the selected fields'''
+        with open('testdata/get_home_timeline.json') as f:
+            data = json.load(f)[0]
+        status = twitter.Status.NewFromJsonDict(
+            data, fields=('id', 'text', 'user.screen_name', 'entities.hashtags',
+                          'retweeted_status.user.id'))
+        self.assertEqual(data['id'], status.id)
+        self.assertEqual(data['text'], status.text)
+        self.assertEqual(data['user']['screen_name'], status.user.screen_name)
+        self.assertEqual(None, status.user.id)
+        self.assertEqual([], status.hashtags)
+        self.assertEqual(data['retweeted_status']['user']['id'], status.retweeted_status.user.id)
+        self.assertEqual(None, status.retweeted_status.text)
+        self.assertEqual(None, status.created_at)
+        self.assertEqual(None, status.urls)
+        entities = twitter.Status.NewFromJsonDict(data, fields=['entities'])
+        self.assertEqual([], entities.urls)
+        self.assertEqual(len(data['entities']['user_mentions']), len(entities.user_mentions))
+        self.assertRaises(twitter.TwitterError, twitter.Status.NewFromJsonDict, data,
+                          fields=['no_such_field'])
+        self.assertRaises(twitter.TwitterError, twitter.Status.NewFromJsonDict, data,
+                          fields=['text.length'])
+        self.assertRaises(twitter.TwitterError, twitter.Status.NewFromJsonDict, data,
+                          fields=['id'], lazy=True)
+
+    def testNewFromJsonDictKeepJson(self):
+        '''Test that AsJsonString returns the kept payload unchanged'''
+        with open('testdata/get_home_timeline.json') as f:
+            data = json.load(f)[0]
+        status = twitter.Status.NewFromJsonDict(data, keep_json=True)
+        self.assertEqual(twitter.Status.NewFromJsonDict(data), status)
+        self.assertEqual(json.dumps(data), status.AsJsonString())
+        line = b'{"id": 1, "text": "caf\\u00e9", "z": null, "a": 2}'
+        status = twitter.Status.NewFromJsonDict(json.loads(line.decode('utf-8')), keep_json=True)
+        status._json = line
+        self.assertEqual(line.decode('utf-8'), status.AsJsonString())
+        self.assertEqual(line.decode('utf-8'), str(status))
+        user = twitter.User.NewFromJsonDict(data['user'], keep_json=True)
+        self.assertEqual(json.dumps(data['user']), user.AsJsonString())
+        self.assertEqual(None, twitter.Status.NewFromJsonDict(data)._json)
+        self.assertEqual(None, twitter.Status.NewFromJsonDict(data, lazy=True)._json)
+
+    def testAsJsonStringUnsorted(self):
+        '''Test that statuses with media serialize, sorted or not'''
+        with open('testdata/get_home_timeline.json') as f:
+            timeline = json.load(f)
+        for data in timeline:
+            status = twitter.Status.NewFromJsonDict(data)
+            sorted_json = status.AsJsonString()
+            self.assertEqual(json.loads(sorted_json),
+                             json.loads(status.AsJsonString(sort_keys=False)))
+            self.assertEqual(json.dumps(json.loads(sorted_json), sort_keys=True), sorted_json)
+
+    def testPickle(self):
+        '''Test that statuses pickle as field tuples and keep sharing'''
+        with open('testdata/get_home_timeline.json') as f:
+            timeline = json.load(f)
+        identity_map = twitter.IdentityMap()
+        statuses = [twitter.Status.NewFromJsonDict(x, identity_map=identity_map) for x in timeline]
+        statuses.append(twitter.Status.NewFromJsonDict(timeline[0], lazy=True))
+        statuses[0].CreatedAtInSeconds
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            copies = pickle.loads(pickle.dumps(statuses, protocol))
+            self.assertEqual(statuses, copies)
+            self.assertEqual([x.AsDict() for x in statuses], [x.AsDict() for x in copies])
+            self.assertEqual(twitter.Status, type(copies[-1]))
+            self.assertEqual(None, copies[0]._created_at_cache)
+            self.assertEqual(statuses[0].CreatedAtInSeconds, copies[0].CreatedAtInSeconds)
+            users = dict((id(x.user), x.user.id) for x in copies)
+            self.assertEqual(len(set(x.user.id for x in statuses[:-1])) + 1, len(users))
+        self.assertFalse('__dict__' in pickle.dumps(statuses[0], 2).decode('latin-1'))
+
+    def testNewFromJsonDictLazy(self):
+        '''Test that lazy statuses build their attributes on first access'''
+        with open('testdata/get_home_timeline.json') as f:
+            timeline = json.load(f)
+        for data in timeline:
+            lazy = twitter.Status.NewFromJsonDict(data, lazy=True)
+            self.assertTrue(isinstance(lazy, twitter.Status))
+            self.assertEqual(twitter.Status.NewFromJsonDict(data), lazy)
+
+        lazy = twitter.Status.NewFromJsonDict(timeline[0], lazy=True)
+        self.assertTrue(lazy.user is lazy.user)
+        self.assertEqual(timeline[0]['user']['id'], lazy.user.id)
+        lazy.text = 'edited'
+        self.assertEqual('edited', lazy.text)
+        self.assertRaises(AttributeError, lambda: lazy.no_such_field)
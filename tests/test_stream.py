@@ -0,0 +1,189 @@
+# encoding: utf-8
+
+import unittest
+
+import requests
+
+import twitter
+from twitter import stream
+
+from .fakes import FakeClock
+
+
+class FakeResponse(object):
+    """Serves lines, advancing the clock by the seconds given between them,
+    then raises error if it is given."""
+
+    def __init__(self, clock, status_code=200, lines=(), error=None):
+        self.clock = clock
+        self.status_code = status_code
+        self.lines = lines
+        self.error = error
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for line in self.lines:
+            if isinstance(line, (int, float)):
+                self.clock.now += line
+                continue
+            yield line + b'\r\n'
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+class FakeApi(twitter.Api):
+    """Answers stream requests with a list of responses or exceptions."""
+
+    def __init__(self, responses):
+        twitter.Api.__init__(self, consumer_key='c', consumer_secret='s',
+                             access_token_key='k', access_token_secret='t')
+        self.responses = list(responses)
+        self.requests = []
+
+    def _RequestStream(self, url, verb, data=None, timeout=None):
+        self.requests.append((url, verb, data, timeout))
+        if not self.responses:
+            raise AssertionError('no more responses')
+        resp = self.responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+class StreamConsumerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def _Consumer(self, responses, **kwargs):
+        self.api = FakeApi(responses)
+        kwargs.setdefault('track', ['python'])
+        return twitter.StreamConsumer(self.api, 'filter', clock=self.clock,
+                                      sleep=self.clock.sleep, **kwargs)
+
+    def _Take(self, consumer, count):
+        messages = []
+        for message in consumer.Messages():
+            messages.append(message)
+            if len(messages) == count:
+                consumer.Stop()
+        return messages
+
+    def testBackoffSchedules(self):
+        '''Test the documented reconnection schedules'''
+        self.assertEqual([0.25, 0.5, 4.0, 16], [stream.NetworkBackoff(n) for n in (1, 2, 16, 100)])
+        self.assertEqual([5, 10, 20, 320], [stream.HttpBackoff(n) for n in (1, 2, 3, 10)])
+        self.assertEqual([60, 120, 960], [stream.RateLimitBackoff(n) for n in (1, 2, 10)])
+
+    def testReconnects(self):
+        '''Test reconnecting after network errors, HTTP errors and 420s'''
+        clock = self.clock
+        consumer = self._Consumer([
+            twitter.TwitterError('connection refused'),
+            FakeResponse(clock, 503),
+            FakeResponse(clock, 420),
+            FakeResponse(clock, 420),
+            FakeResponse(clock, 200, [b'{"id": 1, "text": "a"}'],
+                         requests.exceptions.ChunkedEncodingError('reset')),
+            twitter.TwitterError('connection refused'),
+            FakeResponse(clock, 200, [b'', b'{"id": 2, "text": "b"}'])])
+        messages = self._Take(consumer, 2)
+        self.assertEqual([1, 2], [m['id'] for m in messages])
+        self.assertEqual([0.25, 5, 60, 120, 0.25, 0.5], self.clock.sleeps)
+        self.assertEqual('filter.json', self.api.requests[0][0].split('/')[-1])
+        self.assertEqual({'track': 'python', 'stall_warnings': 'True'}, self.api.requests[0][2])
+        self.assertEqual((10, 40), self.api.requests[0][3])
+        stats = consumer.Stats()
+        self.assertEqual(2, stats['connects'])
+        self.assertEqual(2, stats['disconnects'])
+        self.assertEqual(3, stats['network_errors'])
+        self.assertEqual(1, stats['http_errors'])
+        self.assertEqual(2, stats['rate_limited'])
+        self.assertEqual(2, stats['messages'])
+        self.assertEqual(None, stats['connected_since'])
+        self.assertEqual(sum(self.clock.sleeps), stats['downtime'])
+
+    def testStall(self):
+        '''Test that a read timeout after stall_timeout seconds is a stall'''
+        clock = self.clock
+        consumer = self._Consumer([
+            FakeResponse(clock, 200, [b'{"id": 1, "text": "a"}', 30, b'', 40],
+                         requests.exceptions.ConnectionError('Read timed out.')),
+            FakeResponse(clock, 200, [b'{"id": 2, "text": "b"}'])])
+        self.assertEqual([1, 2], [m['id'] for m in self._Take(consumer, 2)])
+        stats = consumer.Stats()
+        self.assertEqual(1, stats['stalls'])
+        self.assertEqual(0, stats['network_errors'])
+        self.assertTrue(stats['last_disconnect'].startswith('Stalled'))
+
+    def testWarningsAndDisconnects(self):
+        '''Test that stall warnings are surfaced and disconnects reconnect'''
+        warning = b'{"warning": {"code": "FALLING_BEHIND", "percent_full": 60}}'
+        disconnect = b'{"disconnect": {"code": 7, "reason": "duplicate stream"}}'
+        warnings = []
+        consumer = self._Consumer([
+            FakeResponse(self.clock, 200, [warning, disconnect, b'{"id": 1, "text": "a"}']),
+            FakeResponse(self.clock, 200, [b'{"id": 2, "text": "b"}'])],
+            on_warning=warnings.append, keep_json=True)
+        messages = self._Take(consumer, 3)
+        self.assertEqual('FALLING_BEHIND', messages[0]['warning']['code'])
+        self.assertEqual(7, messages[1]['disconnect']['code'])
+        self.assertEqual(2, messages[2].id)
+        self.assertEqual([messages[0]], warnings)
+        stats = consumer.Stats()
+        self.assertEqual(1, stats['warnings'])
+        self.assertEqual(60, stats['last_warning']['percent_full'])
+        self.assertEqual([0.25], self.clock.sleeps)
+
+    def testDecoder(self):
+        '''Test decoding in worker processes across reconnections'''
+        with twitter.DecodePipeline(processes=2, batch_size=2) as pipeline:
+            consumer = self._Consumer([
+                FakeResponse(self.clock, 200, [b'{"id": 1, "text": "a"}', b'{"id": 2, "text": "b"}'],
+                             requests.exceptions.ChunkedEncodingError('reset')),
+                FakeResponse(self.clock, 200, [b'{"id": 3, "text": "c"}'])],
+                keep_json=True, decoder=pipeline)
+            messages = self._Take(consumer, 3)
+        self.assertEqual([1, 2, 3], [m.id for m in messages])
+        self.assertEqual(b'{"id": 3, "text": "c"}', messages[2]._json)
+        self.assertEqual(1, consumer.Stats()['network_errors'])
+
+    def testGivesUp(self):
+        '''Test fatal responses and max_retries'''
+        consumer = self._Consumer([FakeResponse(self.clock, 401)])
+        self.assertRaises(twitter.TwitterError, list, consumer.Messages())
+        consumer = self._Consumer([FakeResponse(self.clock, 500)] * 3, max_retries=2)
+        self.assertRaises(twitter.TwitterError, list, consumer.Messages())
+        self.assertEqual([5, 10], self.clock.sleeps)
+        self.assertRaises(ValueError, twitter.StreamConsumer, self.api, 'filter')
+        self.assertRaises(twitter.TwitterError, twitter.StreamConsumer, self.api, 'firehose')
+
+
+class ReadFramesTest(unittest.TestCase):
+
+    MESSAGES = [b'{"id": 1, "text": "caf\xc3\xa9"}', b'', b'{"id": 2, "text": "a\\nb"}',
+                b'{"id": 3}' * 50]
+
+    def _Split(self, data, size):
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    def testNewlines(self):
+        '''Test splitting a newline framed stream, however it is chunked'''
+        data = b'\r\n'.join(self.MESSAGES) + b'\r\n'
+        for size in (1, 2, 7, 64, len(data)):
+            self.assertEqual(self.MESSAGES, list(stream.ReadFrames(self._Split(data, size))))
+        self.assertEqual([b'{}', b'{"id"'], list(stream.ReadFrames([b'{}\n{"id"'])))
+
+    def testLengthDelimited(self):
+        '''Test splitting a length delimited stream, however it is chunked'''
+        data = b''.join(b'%d\r\n%s\r\n' % (len(m) + 2, m) if m else b'\r\n'
+                        for m in self.MESSAGES)
+        for size in (1, 2, 7, 64, len(data)):
+            self.assertEqual(self.MESSAGES,
+                             list(stream.ReadFrames(self._Split(data, size), delimited=True)))
+        self.assertEqual([], list(stream.ReadFrames([b'20\r\n{"id": 1}'], delimited=True)))
+        self.assertRaises(twitter.TwitterError, list,
+                          stream.ReadFrames([b'{"id": 1}\r\n'], delimited=True))
@@ -75,3 +75,19 @@ class TestTweetLength(unittest.TestCase):
         tweets = self.api._TweetTextWrap(test_tweet)
         self.assertEqual(tweets[0], 't.co went t.co of t.co room t.co returned')
         self.assertEqual(tweets[1], 't.co few minutes later')
+
+    def test_parse_created_at(self):
+        from calendar import timegm
+        from email.utils import parsedate
+        from twitter.twitter_utils import parse_created_at, parse_created_at_list
+        for created_at in ['Fri Jan 26 23:17:14 +0000 2007',
+                           'Thu Feb 29 00:00:00 +0000 2024',
+                           'Wed Dec 31 23:59:59 +0000 2036']:
+            self.assertEqual(timegm(parsedate(created_at)), parse_created_at(created_at))
+        # Other offsets and formats go through the generic parser, as before.
+        other = 'Fri Jan 26 15:17:14 -0800 2007'
+        self.assertEqual(timegm(parsedate(other)), parse_created_at(other))
+        self.assertEqual(1169853434, parse_created_at('Fri, 26 Jan 2007 23:17:14 +0000'))
+        self.assertEqual([1169853434, None, 1169853434],
+                         parse_created_at_list(['Fri Jan 26 23:17:14 +0000 2007', None,
+                                                'Fri Jan 26 23:17:14 +0000 2007']))
@@ -51,6 +51,15 @@ class UserTest(unittest.TestCase):
         self.status = self._GetSampleStatus()
         self.assertEqual(4212713, self.status.id)
 
+    def testSlots(self):
+        '''Test that twitter.User has no instance dict and working properties'''
+        user = twitter.User(id=673483, screen_name='dewitt', followers_count=10)
+        self.assertFalse(hasattr(user, '__dict__'))
+        self.assertRaises(AttributeError, setattr, user, 'no_such_field', 1)
+        self.assertEqual(673483, user.Id)
+        self.assertEqual('dewitt', user.ScreenName)
+        self.assertEqual(10, user.FollowersCount)
+
     def testAsJsonString(self):
         '''Test the twitter.User AsJsonString method'''
         self.assertEqual(UserTest.SAMPLE_JSON,
@@ -22,8 +22,6 @@ from __future__ import absolute_import
 __author__ = 'python-twitter@googlegroups.com'
 __version__ = '3.0rc1'
 
-import json                                 # noqa
-
 try:
     from hashlib import md5                 # noqa
 except ImportError:
@@ -31,6 +29,7 @@ except ImportError:
 
 from ._file_cache import _FileCache         # noqa
 from .error import TwitterError             # noqa
+from . import _json as json                 # noqa
 from .direct_message import DirectMessage   # noqa
 from .hashtag import Hashtag                # noqa
 from .parse_tweet import ParseTweet         # noqa
@@ -42,3 +41,17 @@ from .category import Category              # noqa
 from .media import Media                    # noqa
 from .list import List                      # noqa
 from .api import Api                        # noqa
+from .polling import AdaptivePoller         # noqa
+from .search import SearchIterator, SearchMultiplexer  # noqa
+from .backfill import ParallelBackfill      # noqa
+from .merge import MergeTimelines           # noqa
+from .identity import IdentityMap           # noqa
+from .batch import StatusBatch, UserBatch   # noqa
+from .archive import ArchiveReader, ArchiveWriter  # noqa
+from .stream import StreamConsumer            # noqa
+from .hub import StreamHub                    # noqa
+from .pipeline import DecodePipeline          # noqa
+from .messages import StreamDispatcher, StreamMessage  # noqa
+from .messages import StatusDeletion, LimitNotice, StallWarning  # noqa
+from .messages import DisconnectMessage, FriendsList, StreamEvent  # noqa
+from .recording import StreamRecorder, StreamReplayer  # noqa
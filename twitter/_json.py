@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+"""JSON encoding and decoding used throughout python-twitter.
+
+Decoding goes through the fastest backend available: orjson or ujson when
+installed, otherwise the json module of the standard library.  The
+TWITTER_JSON_BACKEND environment variable, or set_backend(), selects a
+backend explicitly.
+
+loads() accepts the raw bytes of a response, so responses do not have to
+be decoded to text before they are parsed, and raises JSONDecodeError
+whatever the backend.  dumps() always uses the standard library, whose
+output format the models' AsJsonString methods document, with one cached
+encoder per set of options; dump_lines() writes many models as JSON Lines.
+
+The functions keep the signatures of the json module: given any of its
+other options, such as indent, separators, cls or object_hook, they call
+it directly.
+"""
+
+import json as _stdlib
+import os
+
+from twitter.error import TwitterError
+
+BACKENDS = ('orjson', 'ujson', 'json')
+
+# A subclass of ValueError, which Python 2 raises instead.
+JSONDecodeError = getattr(_stdlib, 'JSONDecodeError', ValueError)
+
+backend = None
+_loads = None
+
+
+def _StdlibLoads(data):
+    if isinstance(data, bytes) and not isinstance(data, str):
+        data = data.decode('utf-8')
+    return _stdlib.loads(data)
+
+
+def _Import(name):
+    if name == 'json':
+        return _StdlibLoads
+    module = __import__(name)
+    if issubclass(getattr(module, 'JSONDecodeError', ValueError), JSONDecodeError):
+        return module.loads
+    module_loads = module.loads
+
+    def Loads(data):
+        try:
+            return module_loads(data)
+        except ValueError as e:
+            raise JSONDecodeError(str(e), data, 0)
+    return Loads
+
+
+def available_backends():
+    """Return the names of the installed backends, fastest first."""
+    names = []
+    for name in BACKENDS:
+        try:
+            _Import(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def set_backend(name=None):
+    """Select the backend used by loads.
+
+    Args:
+      name:
+        One of 'orjson', 'ujson' or 'json'. Defaults to the fastest
+        installed backend. [Optional]
+
+    Returns:
+      The name of the selected backend.
+    """
+    global backend, _loads
+    if name is None:
+        name = available_backends()[0]
+    if name not in BACKENDS:
+        raise TwitterError({'message': "Unknown JSON backend %r, use one of %s" %
+                            (name, ', '.join(BACKENDS))})
+    try:
+        _loads = _Import(name)
+    except ImportError:
+        raise TwitterError({'message': "JSON backend %r is not installed" % name})
+    backend = name
+    return name
+
+
+def loads(data, **kwargs):
+    """Parse a JSON document.
+
+    Args:
+      data:
+        The document, as bytes encoded in UTF-8 or as text.
+      kwargs:
+        Options of json.loads, which then parses the document. [Optional]
+
+    Returns:
+      The parsed document. Raises JSONDecodeError if it is not valid JSON.
+    """
+    if kwargs:
+        if isinstance(data, bytes) and not isinstance(data, str):
+            data = data.decode('utf-8')
+        return _stdlib.loads(data, **kwargs)
+    return _loads(data)
+
+
+def load(fp, **kwargs):
+    """Parse the JSON document read from a file object, see loads."""
+    return loads(fp.read(), **kwargs)
+
+
+def _Default(obj):
+    # Model objects left in an AsDict result, such as the twitter.Media
+    # of a status, are serialized through their own AsDict.
+    as_dict = getattr(obj, 'AsDict', None)
+    if as_dict is None:
+        raise TypeError("%r is not JSON serializable" % (obj,))
+    return as_dict()
+
+
+# One encoder per combination of options, since building a JSONEncoder
+# costs about as much as encoding a small document.
+_encoders = {}
+
+# dump_lines joins this many lines into each write.
+_LINES_PER_WRITE = 256
+
+
+def _Encoder(sort_keys, ensure_ascii):
+    key = (bool(sort_keys), bool(ensure_ascii))
+    encode = _encoders.get(key)
+    if encode is None:
+        encode = _stdlib.JSONEncoder(sort_keys=key[0], ensure_ascii=key[1],
+                                     default=_Default).encode
+        _encoders[key] = encode
+    return encode
+
+
+def _LinesEncoder(sort_keys, ensure_ascii):
+    # orjson writes compact UTF-8 several times faster than the standard
+    # library, but cannot escape non-ASCII characters.
+    if backend != 'orjson' or ensure_ascii:
+        return _Encoder(sort_keys, ensure_ascii)
+    import orjson
+    option = orjson.OPT_SORT_KEYS if sort_keys else 0
+    dumps = orjson.dumps
+    return lambda obj: dumps(obj, default=_Default, option=option).decode('utf-8')
+
+
+def dumps(obj, sort_keys=False, ensure_ascii=True, **kwargs):
+    """Serialize obj to a JSON formatted str, see json.dumps.
+
+    Objects with an AsDict method, such as models, are serialized as the
+    dict it returns, unless a cls or default is given.
+    """
+    if kwargs:
+        if 'cls' not in kwargs:
+            kwargs.setdefault('default', _Default)
+        return _stdlib.dumps(obj, sort_keys=sort_keys, ensure_ascii=ensure_ascii, **kwargs)
+    return _Encoder(sort_keys, ensure_ascii)(obj)
+
+
+def dump(obj, fp, **kwargs):
+    """Serialize obj as JSON to a file object, see dumps."""
+    fp.write(dumps(obj, **kwargs))
+
+
+def dumps_raw(raw, ensure_ascii=True):
+    """Return the text of a JSON payload kept by a model.
+
+    Args:
+      raw:
+        The payload as received: UTF-8 bytes, text, or the parsed dict.
+      ensure_ascii:
+        Whether to escape non-ASCII characters when a dict has to be
+        serialized. Bytes and text are returned unchanged. [Optional]
+
+    Returns:
+      A str. A dict keeps the key order of the original document.
+    """
+    if isinstance(raw, bytes) and not isinstance(raw, str):
+        return raw.decode('utf-8')
+    if isinstance(raw, dict):
+        return _Encoder(False, ensure_ascii)(raw)
+    return raw
+
+
+def dump_lines(models, f, sort_keys=False, ensure_ascii=True):
+    """Write models to a file object as JSON Lines, one document per line.
+
+    Models that keep their raw JSON, see keep_json on NewFromJsonDict,
+    are written as received; the others are serialized from AsDict.
+    When orjson is the selected backend and ensure_ascii is False, it
+    serializes them, without the spaces the standard library puts after
+    separators.
+
+    Args:
+      models:
+        An iterable of model objects, such as twitter.Status instances.
+      f:
+        A file object opened for writing text.
+      sort_keys:
+        Whether to sort the keys of serialized models. [Optional]
+      ensure_ascii:
+        Whether to escape non-ASCII characters. [Optional]
+
+    Returns:
+      The number of lines written.
+    """
+    encode = _LinesEncoder(sort_keys, ensure_ascii)
+    write = f.write
+    count = 0
+    chunk = []
+    for model in models:
+        raw = getattr(model, '_json', None)
+        if raw is not None:
+            chunk.append(dumps_raw(raw, ensure_ascii=ensure_ascii))
+        else:
+            chunk.append(encode(model.AsDict()))
+        count += 1
+        if len(chunk) == _LINES_PER_WRITE:
+            chunk.append('')
+            write('\n'.join(chunk))
+            chunk = []
+    if chunk:
+        chunk.append('')
+        write('\n'.join(chunk))
+    return count
+
+
+set_backend(os.environ.get('TWITTER_JSON_BACKEND') or None)
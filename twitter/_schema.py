@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+"""Declarative field schemas for the model classes.
+
+A model lists its fields once, as Field objects, and Schema generates the
+methods that would otherwise repeat the field list: __init__, the builder
+behind NewFromJsonDict, AsDict and __eq__.  The generated methods are
+plain straight-line Python compiled once at import, so they do none of
+the per-call loops over parameter dicts that hand-written generic code
+would.  Builders for field projections are compiled the first time a
+projection is used.
+"""
+
+from twitter.error import TwitterError
+
+TRUTHY = 'truthy'
+NOT_NONE = 'not_none'
+
+
+def New(cls):
+    """Create an instance of cls without calling __init__, for unpickling."""
+    return object.__new__(cls)
+
+
+class Field(object):
+    """A field of a model.
+
+    Args:
+      name:
+        The attribute name, also used as key in AsDict.
+      key:
+        The key holding the value in the JSON dict. Defaults to name;
+        None means that the field is not read from JSON. [Optional]
+      parse:
+        A callable taking the JSON dict, the lazy flag and an identity
+        map and returning the value, for fields that need more than a
+        lookup. [Optional]
+      dump:
+        An expression turning the value, written as {0}, into its AsDict
+        form, e.g. '{0}.AsDict()'. None leaves the field out of AsDict.
+        [Optional]
+      dump_if:
+        TRUTHY to include the field in AsDict if its value is true,
+        NOT_NONE if it is not None. [Optional]
+      compare:
+        Whether __eq__ compares the field. [Optional]
+      paths:
+        The dotted JSON paths the field is read from, by which
+        projections can select it. Defaults to the key. [Optional]
+      nested:
+        A callable returning the model class of the value, for fields
+        holding a model whose own fields can be projected, e.g.
+        'user.id'. [Optional]
+      pickle:
+        Whether pickles keep the field. Fields that are not kept, such
+        as caches, are None after unpickling. [Optional]
+    """
+
+    def __init__(self, name, key=False, parse=None, dump='{0}', dump_if=TRUTHY, compare=True,
+                 paths=None, nested=None, pickle=True):
+        self.name = name
+        self.key = name if key is False else key
+        self.parse = parse
+        self.dump = dump
+        self.dump_if = dump_if
+        self.compare = compare
+        if paths is None:
+            paths = (self.key,) if self.key is not None else ()
+        self.paths = tuple(paths)
+        self.nested = nested
+        self.pickle = pickle
+
+    def Read(self, data, lazy=False, identity_map=None):
+        """Return the value of the field in a JSON dict."""
+        if self.parse is not None:
+            return self.parse(data, lazy, identity_map)
+        if self.key is None:
+            return None
+        return data.get(self.key, None)
+
+    def Selects(self, path):
+        """Whether a projection of path selects the whole field."""
+        if self.name.startswith('_'):
+            return False
+        if self.name == path or path in self.paths:
+            return True
+        return any(p.startswith(path + '.') for p in self.paths)
+
+
+class Schema(object):
+    """The fields of a model and the methods generated from them."""
+
+    def __init__(self, model, fields):
+        """Instantiate a new twitter._schema.Schema object.
+
+        Args:
+          model:
+            The name of the model class, used in docstrings.
+          fields:
+            A list of Field objects.
+        """
+        self.model = model
+        self.fields = list(fields)
+        self.by_name = dict((field.name, field) for field in self.fields)
+        self.names = tuple(field.name for field in self.fields)
+        self._projectors = {}
+
+    def _Compile(self, name, lines, namespace=None):
+        namespace = dict(namespace or {})
+        code = compile('\n'.join(lines) + '\n', '<%s schema>' % self.model, 'exec')
+        exec(code, namespace)
+        return namespace[name]
+
+    def Init(self, doc=None, extra_kwargs=True):
+        """Generate an __init__ taking every field as a keyword argument.
+
+        Args:
+          doc:
+            The docstring of the generated method. [Optional]
+          extra_kwargs:
+            If True, unknown keyword arguments are ignored, as the
+            param_defaults loops of the models always did. [Optional]
+        """
+        params = ['self'] + ['%s=None' % field.name for field in self.fields
+                             if not field.name.startswith('_')]
+        if extra_kwargs:
+            params.append('**kwargs')
+        lines = ['def __init__(%s):' % ', '.join(params)]
+        for field in self.fields:
+            value = 'None' if field.name.startswith('_') else field.name
+            lines.append('    self.%s = %s' % (field.name, value))
+        init = self._Compile('__init__', lines)
+        init.__doc__ = doc
+        return init
+
+    def Builder(self):
+        """Generate a classmethod building an instance from a JSON dict.
+
+        The builder bypasses __init__ and assigns every field directly,
+        parsing nested objects eagerly.  It takes the JSON dict and an
+        optional identity map.
+        """
+        namespace = {'_new': object.__new__}
+        lines = ['def _Build(cls, data, identity_map=None):',
+                 '    self = _new(cls)',
+                 '    get = data.get']
+        for field in self.fields:
+            if field.parse is not None:
+                namespace['_parse_' + field.name] = field.parse
+                value = '_parse_%s(data, False, identity_map)' % field.name
+            elif field.key is None:
+                value = 'None'
+            else:
+                value = 'get(%r)' % field.key
+            lines.append('    self.%s = %s' % (field.name, value))
+        lines.append('    return self')
+        return classmethod(self._Compile('_Build', lines, namespace))
+
+    def Projector(self, fields):
+        """Return a function building an instance with only some fields.
+
+        Args:
+          fields:
+            A sequence of field names or dotted JSON paths, such as
+            ('id', 'text', 'user.id', 'entities.hashtags').  A path
+            naming an object, such as 'entities', selects every field
+            read from it.
+
+        Returns:
+          A function taking the model class and a JSON dict.  The fields
+          that were not selected are set to None.  Raises TwitterError
+          for a path that selects no field.
+        """
+        if isinstance(fields, str):
+            fields = (fields,)
+        fields = tuple(fields)
+        projector = self._projectors.get(fields)
+        if projector is None:
+            projector = self._CompileProjector(self._Select(fields))
+            self._projectors[fields] = projector
+        return projector
+
+    def _Select(self, paths):
+        # Maps the name of every selected field to None if it is selected
+        # as a whole, or to the paths selected within a nested model.
+        selected = {}
+        for path in paths:
+            matches = [field for field in self.fields if field.Selects(path)]
+            if matches:
+                for field in matches:
+                    selected[field.name] = None
+                continue
+            head, _, rest = path.partition('.')
+            field = self.by_name.get(head)
+            if field is None or field.nested is None or not rest:
+                raise TwitterError({'message': "Unknown field %r for twitter.%s" % (path, self.model)})
+            if head not in selected:
+                selected[head] = []
+            if selected[head] is not None:
+                selected[head].append(rest)
+        return selected
+
+    def _CompileProjector(self, selected):
+        namespace = {'_new': object.__new__}
+        lines = ['def _Project(cls, data):',
+                 '    self = _new(cls)',
+                 '    get = data.get']
+        for field in self.fields:
+            if field.name not in selected:
+                value = 'None'
+            elif selected[field.name] is not None:
+                model = field.nested()
+                namespace['_model_' + field.name] = model
+                namespace['_project_' + field.name] = model._SCHEMA.Projector(selected[field.name])
+                lines.append('    value = get(%r)' % field.key)
+                value = 'None if value is None else _project_%s(_model_%s, value)' % (
+                    field.name, field.name)
+            elif field.parse is not None:
+                namespace['_parse_' + field.name] = field.parse
+                value = '_parse_%s(data, False, None)' % field.name
+            elif field.key is None:
+                value = 'None'
+            else:
+                value = 'get(%r)' % field.key
+            lines.append('    self.%s = %s' % (field.name, value))
+        lines.append('    return self')
+        return self._Compile('_Project', lines, namespace)
+
+    def AsDict(self):
+        """Generate the AsDict method of the model."""
+        lines = ['def AsDict(self):',
+                 '    data = {}']
+        for field in self.fields:
+            if field.dump is None:
+                continue
+            test = 'value' if field.dump_if == TRUTHY else 'value is not None'
+            lines.extend(['    value = self.%s' % field.name,
+                          '    if %s:' % test,
+                          '        data[%r] = %s' % (field.name, field.dump.format('value'))])
+        lines.append('    return data')
+        as_dict = self._Compile('AsDict', lines)
+        as_dict.__doc__ = ("A dict representation of this twitter.%s instance.\n\n"
+                           "        The return value uses the same key names as the JSON representation.\n\n"
+                           "        Return:\n"
+                           "          A dict representing this twitter.%s instance\n"
+                           "        " % (self.model, self.model))
+        return as_dict
+
+    def Eq(self):
+        """Generate the __eq__ method of the model.
+
+        As before, the result is false for anything that lacks one of the
+        compared attributes.
+        """
+        tests = ['self.%s == other.%s' % (field.name, field.name)
+                 for field in self.fields if field.compare]
+        lines = ['def __eq__(self, other):',
+                 '    try:',
+                 '        return other and \\',
+                 '            ' + ' and \\\n            '.join(tests),
+                 '    except AttributeError:',
+                 '        return False']
+        return self._Compile('__eq__', lines)
+
+    def Reduce(self, model):
+        """Generate the __reduce__ method of the model.
+
+        Instances pickle as the model class and a tuple of the pickled
+        fields in schema order, rather than a dict of attribute names.
+        Nested objects are pickled in turn, once per pickle however many
+        times they are shared.  Use with SetState.
+
+        Args:
+          model:
+            A callable returning the model class; instances of its
+            subclasses, such as lazy models, unpickle as the model.
+        """
+        values = ''.join('self.%s, ' % field.name for field in self.fields if field.pickle)
+        lines = ['def __reduce__(self):',
+                 '    return _new, (_model(),), (%s)' % values]
+        return self._Compile('__reduce__', lines, {'_new': New, '_model': model})
+
+    def SetState(self):
+        """Generate the __setstate__ method restoring a Reduce state."""
+        targets = ''.join('self.%s, ' % field.name for field in self.fields if field.pickle)
+        lines = ['def __setstate__(self, state):',
+                 '    %s= state' % targets]
+        lines.extend('    self.%s = None' % field.name for field in self.fields if not field.pickle)
+        return self._Compile('__setstate__', lines)
+
+    def Slots(self, *extra):
+        """Return the field names plus extra as a value for __slots__."""
+        return self.names + extra
+
+    def PublicNames(self):
+        """Return the names of the fields that do not start with '_'."""
+        return frozenset(name for name in self.names if not name.startswith('_'))
@@ -22,6 +22,7 @@ from __future__ import division
 from __future__ import print_function
 
 import sys
+import copy
 import gzip
 import time
 import types
@@ -51,6 +52,8 @@ except ImportError:
 from twitter import (__version__, _FileCache, json, DirectMessage, List,
                      Status, Trend, TwitterError, User, UserStatus)
 from twitter.category import Category
+from twitter.incremental import JsonArrayReader
+from twitter.stream import ReadFrames, STREAM_CHUNK_SIZE
 
 from twitter.twitter_utils import (
     calc_expected_status_length,
@@ -61,9 +64,63 @@ warnings.simplefilter('always', DeprecationWarning)
 
 CHARACTER_LIMIT = 140
 
+# Size of the reads made while parsing a response incrementally.
+INCREMENTAL_CHUNK_SIZE = 16 * 1024
+
 # A singleton representing a lazily instantiated FileCache.
 DEFAULT_CACHE = object()
 
+# Request profiles, see Api.SetProfile: the values a profile gives the
+# parameters that slim down responses.
+PROFILES = {
+    'full': {'trim_user': 'false',
+             'include_entities': 'true',
+             'skip_status': 'false',
+             'include_user_entities': 'true'},
+    'text_only': {'trim_user': 'false',
+                  'include_entities': 'false',
+                  'skip_status': 'true',
+                  'include_user_entities': 'false'},
+    'ids_only': {'trim_user': 'true',
+                 'include_entities': 'false',
+                 'skip_status': 'true',
+                 'include_user_entities': 'false'},
+}
+
+# The slimming parameters each endpoint accepts, by path relative to the
+# base url, without a trailing id.
+PROFILE_ENDPOINTS = {
+    'account/update_profile': ('include_entities', 'skip_status'),
+    'account/verify_credentials': ('include_entities', 'skip_status'),
+    'blocks/destroy': ('include_entities', 'skip_status'),
+    'blocks/list': ('include_entities', 'skip_status'),
+    'direct_messages': ('include_entities', 'skip_status'),
+    'direct_messages/destroy': ('include_entities',),
+    'direct_messages/new': ('include_entities',),
+    'direct_messages/sent': ('include_entities',),
+    'favorites/create': ('include_entities',),
+    'favorites/destroy': ('include_entities',),
+    'favorites/list': ('include_entities',),
+    'followers/list': ('skip_status', 'include_user_entities'),
+    'friends/list': ('skip_status', 'include_user_entities'),
+    'lists/members': ('include_entities', 'skip_status'),
+    'lists/statuses': ('include_entities',),
+    'lists/subscribers/show': ('include_entities', 'skip_status'),
+    'search/tweets': ('include_entities',),
+    'statuses/destroy': ('trim_user',),
+    'statuses/home_timeline': ('trim_user', 'include_entities'),
+    'statuses/mentions_timeline': ('trim_user', 'include_entities'),
+    'statuses/retweet': ('trim_user',),
+    'statuses/retweets': ('trim_user',),
+    'statuses/retweets_of_me': ('trim_user', 'include_entities', 'include_user_entities'),
+    'statuses/show': ('trim_user', 'include_entities'),
+    'statuses/update': ('trim_user',),
+    'statuses/user_timeline': ('trim_user',),
+    'users/lookup': ('include_entities',),
+    'users/search': ('include_entities',),
+    'users/show': ('include_entities',),
+}
+
 
 class Api(object):
     """A python interface into the Twitter API
@@ -144,7 +201,8 @@ class Api(object):
                  use_gzip_compression=False,
                  debugHTTP=False,
                  timeout=None,
-                 sleep_on_rate_limit=True):
+                 sleep_on_rate_limit=True,
+                 profile=None):
         """Instantiate a new twitter.Api object.
 
         Args:
@@ -180,6 +238,8 @@ class Api(object):
           timeout:
             Set timeout (in seconds) of the http/https requests. If None the
             requests lib default will be used.  Defaults to None. [Optional]
+          profile:
+            The request profile to use, see SetProfile. [Optional]
         """
         self.SetCache(cache)
         self._cache_timeout = Api.DEFAULT_CACHE_TIMEOUT
@@ -188,7 +248,12 @@ class Api(object):
         self._debugHTTP = debugHTTP
         self._shortlink_size = 19
         self._timeout = timeout
+        self._stream_recorder = None
+        self._stream_replayer = None
+        self._lazy = False
+        self._identity_map = None
         self.__auth = None
+        self.SetProfile(profile)
 
         self._InitializeRequestHeaders(request_headers)
         self._InitializeUserAgent()
@@ -279,7 +344,7 @@ class Api(object):
         if self._config is None:
             url = '%s/help/configuration.json' % self.base_url
             resp = self._RequestUrl(url, 'GET')
-            data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            data = self._ParseAndCheckTwitter(resp.content)
             self._config = data
         return self._config
 
@@ -311,7 +376,10 @@ class Api(object):
                   lang=None,
                   locale=None,
                   result_type="mixed",
-                  include_entities=None):
+                  include_entities=None,
+                  return_json=False,
+                  fields=None,
+                  keep_json=False):
         """Return twitter search results for a given term.
 
         Args:
@@ -353,10 +421,22 @@ class Api(object):
             This node offers a variety of metadata about the tweet in a
             discrete structure, including: user_mentions, urls, and
             hashtags. [Optional]
+          return_json:
+            If True, the raw JSON dict of the response is returned,
+            including its search_metadata, instead of a list of
+            twitter.Status instances. [Optional]
+          fields:
+            A projection such as ('id', 'text', 'user.id'): only these
+            fields of each status are built, see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, each status keeps its JSON dict, which its
+            AsJsonString returns as is, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A sequence of twitter.Status instances, one for each message containing
-          the term
+          the term, or the JSON dict of the response if return_json is True.
         """
         # Build request parameters
 
@@ -415,10 +495,14 @@ class Api(object):
         else:
             resp = self._RequestUrl(url, 'GET', data=parameters)
 
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
+
+        if return_json:
+            return data
 
         # Return built list of statuses
-        return [Status.NewFromJsonDict(x) for x in data['statuses']]
+        factory = self._StatusFactory(fields, keep_json)
+        return [factory(x) for x in data['statuses']]
 
     def GetUsersSearch(self,
                        term=None,
@@ -466,7 +550,7 @@ class Api(object):
         # Make and send requests
         url = '%s/users/search.json' % self.base_url
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
         return [User.NewFromJsonDict(x) for x in data]
 
     def GetTrendsCurrent(self, exclude=None):
@@ -503,7 +587,7 @@ class Api(object):
             parameters['exclude'] = exclude
 
         resp = self._RequestUrl(url, verb='GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
         trends = []
         timestamp = data[0]['as_of']
 
@@ -519,7 +603,7 @@ class Api(object):
         """
         url = '%s/users/suggestions.json' % (self.base_url)
         resp = self._RequestUrl(url, verb='GET')
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         categories = []
 
@@ -538,7 +622,7 @@ class Api(object):
         url = '%s/users/suggestions/%s.json' % (self.base_url, category.Slug)
 
         resp = self._RequestUrl(url, verb='GET')
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         users = []
         for user in data['users']:
@@ -552,7 +636,10 @@ class Api(object):
                         trim_user=False,
                         exclude_replies=False,
                         contributor_details=False,
-                        include_entities=True):
+                        include_entities=True,
+                        incremental=False,
+                        fields=None,
+                        keep_json=False):
         """Fetch a collection of the most recent Tweets and retweets posted
         by the authenticating user and the users they follow.
 
@@ -590,9 +677,23 @@ class Api(object):
             This node offers a variety of metadata about the tweet in a
             discreet structure, including: user_mentions, urls, and
             hashtags. [Optional]
+          incremental:
+            If True, return an iterable that parses and yields the
+            statuses while the response is still arriving, instead of a
+            list. [Optional]
+          fields:
+            A projection such as ('id', 'text', 'user.id'): only these
+            fields of each status are built, see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, each status keeps its JSON dict, which its
+            AsJsonString returns as is, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A sequence of twitter.Status instances, one for each message
+          If incremental is True, a twitter.incremental.JsonArrayReader
+          yielding the same instances.
         """
         url = '%s/statuses/home_timeline.json' % self.base_url
 
@@ -622,10 +723,14 @@ class Api(object):
             parameters['contributor_details'] = 1
         if not include_entities:
             parameters['include_entities'] = 'false'
+        factory = self._StatusFactory(fields, keep_json)
+        if incremental:
+            return self._RequestItems(url, parameters, factory)
+
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
-        return [Status.NewFromJsonDict(x) for x in data]
+        return [factory(x) for x in data]
 
     def GetUserTimeline(self,
                         user_id=None,
@@ -635,7 +740,10 @@ class Api(object):
                         count=None,
                         include_rts=True,
                         trim_user=None,
-                        exclude_replies=None):
+                        exclude_replies=None,
+                        incremental=False,
+                        fields=None,
+                        keep_json=False):
         """Fetch the sequence of public Status messages for a single user.
 
         The twitter.Api instance must be authenticated if the user is private.
@@ -674,9 +782,23 @@ class Api(object):
             will receive up-to count tweets - this is because the count parameter
             retrieves that many tweets before filtering out retweets and replies.
             This parameter is only supported for JSON and XML responses. [Optional]
+          incremental:
+            If True, return an iterable that parses and yields the
+            statuses while the response is still arriving, instead of a
+            list. [Optional]
+          fields:
+            A projection such as ('id', 'text', 'user.id'): only these
+            fields of each status are built, see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, each status keeps its JSON dict, which its
+            AsJsonString returns as is, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A sequence of Status instances, one for each message up to count
+          If incremental is True, a twitter.incremental.JsonArrayReader
+          yielding the same instances.
         """
         parameters = {}
         url = '%s/statuses/user_timeline.json' % (self.base_url)
@@ -707,10 +829,14 @@ class Api(object):
         if exclude_replies:
             parameters['exclude_replies'] = 1
 
+        factory = self._StatusFactory(fields, keep_json)
+        if incremental:
+            return self._RequestItems(url, parameters, factory)
+
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
-        return [Status.NewFromJsonDict(x) for x in data]
+        return [factory(x) for x in data]
 
     def GetStatus(self,
                   id,
@@ -756,7 +882,7 @@ class Api(object):
             parameters['include_entities'] = 'none'
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -838,7 +964,7 @@ class Api(object):
             parameters['lang'] = lang
 
         resp = self._RequestUrl(request_url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return data
 
@@ -864,7 +990,7 @@ class Api(object):
             post_data['trim_user'] = 1
 
         resp = self._RequestUrl(url, 'POST', data=post_data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -988,7 +1114,7 @@ class Api(object):
             parameters['trim_user'] = 'true'
 
         resp = self._RequestUrl(url, 'POST', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -1030,7 +1156,7 @@ class Api(object):
             parameters['media_category'] = media_category
 
         resp = self._RequestUrl(url, 'POST', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         try:
             return data['media_id']
@@ -1080,7 +1206,7 @@ class Api(object):
         parameters['total_bytes'] = file_size
 
         resp = self._RequestUrl(url, 'POST', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         try:
             media_id = data['media_id']
@@ -1130,8 +1256,8 @@ class Api(object):
             # The body of the response should be blank, but the normal decoding
             # raises a JSONDecodeError, so we should only do error checking
             # if the response is not blank.
-            if resp.content.decode('utf-8'):
-                return self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            if resp.content:
+                return self._ParseAndCheckTwitter(resp.content)
 
             segment_id += 1
 
@@ -1147,7 +1273,7 @@ class Api(object):
         }
 
         resp = self._RequestUrl(url, 'POST', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         try:
             return data['media_id']
@@ -1225,7 +1351,7 @@ class Api(object):
             data['display_coordinates'] = 'true'
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -1288,7 +1414,7 @@ class Api(object):
                 data['media'] = media[m].read()
 
             resp = self._RequestUrl(url, 'POST', data=data)
-            data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            data = self._ParseAndCheckTwitter(resp.content)
 
             media_ids += str(data['media_id_string'])
             if m is not len(media) - 1:
@@ -1299,7 +1425,7 @@ class Api(object):
         url = '%s/statuses/update.json' % self.base_url
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -1411,7 +1537,7 @@ class Api(object):
         if trim_user:
             data['trim_user'] = 'true'
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -1506,7 +1632,7 @@ class Api(object):
                 raise TwitterError({'message': "count must be an integer"})
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return [Status.NewFromJsonDict(s) for s in data]
 
@@ -1544,7 +1670,7 @@ class Api(object):
                     raise TwitterError({'message': "cursor must be an integer"})
                     break
             resp = self._RequestUrl(url, 'GET', data=parameters)
-            data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            data = self._ParseAndCheckTwitter(resp.content)
             result += [x for x in data['ids']]
             if 'next_cursor' in data:
                 if data['next_cursor'] == 0 or data['next_cursor'] == data['previous_cursor']:
@@ -1609,7 +1735,7 @@ class Api(object):
             parameters['include_user_entities'] = include_user_entities
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return [Status.NewFromJsonDict(s) for s in data]
 
@@ -1655,7 +1781,7 @@ class Api(object):
         while True:
             parameters['cursor'] = cursor
             resp = self._RequestUrl(url, 'GET', data=parameters)
-            data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            data = self._ParseAndCheckTwitter(resp.content)
             result += [User.NewFromJsonDict(x) for x in data['users']]
             if 'next_cursor' in data:
                 if data['next_cursor'] == 0 or data['next_cursor'] == data['previous_cursor']:
@@ -1690,7 +1816,7 @@ class Api(object):
             post_data['trim_user'] = 1
 
         resp = self._RequestUrl(url, 'POST', data=post_data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -1722,7 +1848,7 @@ class Api(object):
         parameters['cursor'] = cursor
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         if 'ids' in data:
             result.extend([x for x in data['ids']])
@@ -1959,7 +2085,8 @@ class Api(object):
                                   cursor=-1,
                                   count=200,
                                   skip_status=False,
-                                  include_user_entities=True):
+                                  include_user_entities=True,
+                                  incremental=False):
 
         """Make a cursor driven call to return the list of 1 page of friends
         or followers.
@@ -1985,10 +2112,17 @@ class Api(object):
             [Optional]
           include_user_entities:
             When True, the user entities will be included. [Optional]
+          incremental:
+            If True, return an iterable that parses and yields the users
+            while the response is still arriving, instead of the tuple.
+            [Optional]
 
         Returns:
           next_cursor, previous_cursor, data sequence of twitter.User
           instances, one for each follower
+          If incremental is True, a twitter.incremental.JsonArrayReader
+          yielding the twitter.User instances; once it is exhausted, its
+          remainder holds next_cursor and previous_cursor.
         """
 
         if user_id and screen_name:
@@ -2014,8 +2148,11 @@ class Api(object):
         parameters['include_user_entities'] = include_user_entities
         parameters['cursor'] = cursor
 
+        if incremental:
+            return self._RequestItems(url, parameters, User.NewFromJsonDict, key='users')
+
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         if 'users' in data:
             users = [User.NewFromJsonDict(user) for user in data['users']]
@@ -2039,7 +2176,8 @@ class Api(object):
                           cursor=-1,
                           count=200,
                           skip_status=False,
-                          include_user_entities=True):
+                          include_user_entities=True,
+                          incremental=False):
         """Make a cursor driven call to return the list of all followers
 
         Args:
@@ -2060,10 +2198,17 @@ class Api(object):
             [Optional]
           include_user_entities:
             When True, the user entities will be included. [Optional]
+          incremental:
+            If True, return an iterable that parses and yields the users
+            while the response is still arriving, instead of the tuple.
+            [Optional]
 
         Returns:
           next_cursor, previous_cursor, data sequence of twitter.User
           instances, one for each follower
+          If incremental is True, a twitter.incremental.JsonArrayReader
+          yielding the twitter.User instances; once it is exhausted, its
+          remainder holds next_cursor and previous_cursor.
         """
         url = '%s/followers/list.json' % self.base_url
         return self._GetFriendsFollowersPaged(url,
@@ -2072,7 +2217,8 @@ class Api(object):
                                               cursor,
                                               count,
                                               skip_status,
-                                              include_user_entities)
+                                              include_user_entities,
+                                              incremental)
 
     def GetFriendsPaged(self,
                         user_id=None,
@@ -2080,7 +2226,8 @@ class Api(object):
                         cursor=-1,
                         count=200,
                         skip_status=False,
-                        include_user_entities=True):
+                        include_user_entities=True,
+                        incremental=False):
         """Make a cursor driven call to return the list of all friends.
 
         Args:
@@ -2101,10 +2248,17 @@ class Api(object):
             [Optional]
           include_user_entities:
             When True, the user entities will be included. [Optional]
+          incremental:
+            If True, return an iterable that parses and yields the users
+            while the response is still arriving, instead of the tuple.
+            [Optional]
 
         Returns:
           next_cursor, previous_cursor, data sequence of twitter.User
           instances, one for each follower
+          If incremental is True, a twitter.incremental.JsonArrayReader
+          yielding the twitter.User instances; once it is exhausted, its
+          remainder holds next_cursor and previous_cursor.
         """
         url = '%s/friends/list.json' % self.base_url
         return self._GetFriendsFollowersPaged(url,
@@ -2113,7 +2267,8 @@ class Api(object):
                                               cursor,
                                               count,
                                               skip_status,
-                                              include_user_entities)
+                                              include_user_entities,
+                                              incremental)
 
     def _GetFriendsFollowers(self,
                              url=None,
@@ -2338,7 +2493,7 @@ class Api(object):
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
         try:
-            data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            data = self._ParseAndCheckTwitter(resp.content)
         except TwitterError as e:
             _, e, _ = sys.exc_info()
             t = e.args[0]
@@ -2380,7 +2535,7 @@ class Api(object):
             parameters['include_entities'] = 'false'
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return User.NewFromJsonDict(data)
 
@@ -2448,7 +2603,7 @@ class Api(object):
             parameters['page'] = page
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return [DirectMessage.NewFromJsonDict(x) for x in data]
 
@@ -2502,7 +2657,7 @@ class Api(object):
             parameters['include_entities'] = 'false'
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return [DirectMessage.NewFromJsonDict(x) for x in data]
 
@@ -2532,7 +2687,7 @@ class Api(object):
             raise TwitterError({'message': "Specify at least one of user_id or screen_name."})
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return DirectMessage.NewFromJsonDict(data)
 
@@ -2555,7 +2710,7 @@ class Api(object):
             data['include_entities'] = 'false'
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return DirectMessage.NewFromJsonDict(data)
 
@@ -2592,7 +2747,7 @@ class Api(object):
         data['{}'.format(follow_key)] = follow_json
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return User.NewFromJsonDict(data)
 
@@ -2638,7 +2793,7 @@ class Api(object):
             raise TwitterError({'message': "Specify at least one of user_id or screen_name."})
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return User.NewFromJsonDict(data)
 
@@ -2666,7 +2821,7 @@ class Api(object):
             raise TwitterError({'message': "Specify at least one of user_id or screen_name."})
 
         resp = self._RequestUrl(url, 'GET', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         if len(data) >= 1:
             return UserStatus.NewFromJsonDict(data[0])
@@ -2704,7 +2859,7 @@ class Api(object):
             data['include_entities'] = 'false'
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -2739,7 +2894,7 @@ class Api(object):
             data['include_entities'] = 'false'
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return Status.NewFromJsonDict(data)
 
@@ -2806,7 +2961,7 @@ class Api(object):
             parameters['include_entities'] = True
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return [Status.NewFromJsonDict(x) for x in data]
 
@@ -2816,7 +2971,9 @@ class Api(object):
                     max_id=None,
                     trim_user=False,
                     contributor_details=False,
-                    include_entities=True):
+                    include_entities=True,
+                    fields=None,
+                    keep_json=False):
         """Returns the 20 most recent mentions (status containing @screen_name)
         for the authenticating user.
 
@@ -2845,6 +3002,14 @@ class Api(object):
             default only the user_id of the contributor is included. [Optional]
           include_entities:
             The entities node will be disincluded when set to False. [Optional]
+          fields:
+            A projection such as ('id', 'text', 'user.id'): only these
+            fields of each status are built, see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, each status keeps its JSON dict, which its
+            AsJsonString returns as is, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A sequence of twitter.Status instances, one for each mention of the user.
@@ -2875,9 +3040,10 @@ class Api(object):
             parameters['include_entities'] = 'false'
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
-        return [Status.NewFromJsonDict(x) for x in data]
+        factory = self._StatusFactory(fields, keep_json)
+        return [factory(x) for x in data]
 
     # List endpoint status
     # done GET lists/list
@@ -2925,7 +3091,7 @@ class Api(object):
             parameters['description'] = description
 
         resp = self._RequestUrl(url, 'POST', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return List.NewFromJsonDict(data)
 
@@ -2975,7 +3141,7 @@ class Api(object):
             raise TwitterError({'message': "Identify list by list_id or owner_screen_name/owner_id and slug"})
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return List.NewFromJsonDict(data)
 
@@ -3025,7 +3191,7 @@ class Api(object):
             raise TwitterError({'message': "Identify list by list_id or owner_screen_name/owner_id and slug"})
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return User.NewFromJsonDict(data)
 
@@ -3075,7 +3241,7 @@ class Api(object):
             raise TwitterError({'message': "Identify list by list_id or owner_screen_name/owner_id and slug"})
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return List.NewFromJsonDict(data)
 
@@ -3152,7 +3318,7 @@ class Api(object):
             data['include_entities'] = True
 
         resp = self._RequestUrl(url, 'GET', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return User.NewFromJsonDict(data)
 
@@ -3207,7 +3373,7 @@ class Api(object):
             raise TwitterError({'message': "Specify user_id or screen_name"})
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return [List.NewFromJsonDict(x) for x in data['lists']]
 
@@ -3311,7 +3477,7 @@ class Api(object):
             parameters['reverse'] = 'true'
 
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return [List.NewFromJsonDict(x) for x in data]
 
@@ -3324,7 +3490,10 @@ class Api(object):
                         max_id=None,
                         count=None,
                         include_rts=True,
-                        include_entities=True):
+                        include_entities=True,
+                        incremental=False,
+                        fields=None,
+                        keep_json=False):
         """Fetch the sequence of Status messages for a given List ID.
 
         The twitter.Api instance must be authenticated if the user is private.
@@ -3363,9 +3532,23 @@ class Api(object):
           include_entities:
             If False, the timeline will not contain additional metadata.
             Defaults to True. [Optional]
+          incremental:
+            If True, return an iterable that parses and yields the
+            statuses while the response is still arriving, instead of a
+            list. [Optional]
+          fields:
+            A projection such as ('id', 'text', 'user.id'): only these
+            fields of each status are built, see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, each status keeps its JSON dict, which its
+            AsJsonString returns as is, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A sequence of Status instances, one for each message up to count
+          If incremental is True, a twitter.incremental.JsonArrayReader
+          yielding the same instances.
         """
         parameters = {}
         url = '%s/lists/statuses.json' % (self.base_url)
@@ -3401,10 +3584,14 @@ class Api(object):
         if not include_entities:
             parameters['include_entities'] = 'false'
 
+        factory = self._StatusFactory(fields, keep_json)
+        if incremental:
+            return self._RequestItems(url, parameters, factory)
+
         resp = self._RequestUrl(url, 'GET', data=parameters)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
-        return [Status.NewFromJsonDict(x) for x in data]
+        return [factory(x) for x in data]
 
     def GetListMembers(self,
                        list_id,
@@ -3474,7 +3661,7 @@ class Api(object):
         while True:
             parameters['cursor'] = cursor
             resp = self._RequestUrl(url, 'GET', data=parameters)
-            data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            data = self._ParseAndCheckTwitter(resp.content)
             result += [User.NewFromJsonDict(x) for x in data['users']]
             if 'next_cursor' in data:
                 if data['next_cursor'] == 0 or data['next_cursor'] == data['previous_cursor']:
@@ -3561,7 +3748,7 @@ class Api(object):
             url = '%s/lists/members/create.json' % self.base_url
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return List.NewFromJsonDict(data)
 
@@ -3638,7 +3825,7 @@ class Api(object):
             url = '%s/lists/members/destroy.json' % (self.base_url)
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return List.NewFromJsonDict(data)
 
@@ -3686,7 +3873,7 @@ class Api(object):
         while True:
             parameters['cursor'] = cursor
             resp = self._RequestUrl(url, 'GET', data=parameters)
-            data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+            data = self._ParseAndCheckTwitter(resp.content)
             result += [List.NewFromJsonDict(x) for x in data['lists']]
             if 'next_cursor' in data:
                 if data['next_cursor'] == 0 or data['next_cursor'] == data['previous_cursor']:
@@ -3754,7 +3941,7 @@ class Api(object):
             data['skip_status'] = skip_status
 
         resp = self._RequestUrl(url, 'POST', data=data)
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return User.NewFromJsonDict(data)
 
@@ -3851,31 +4038,59 @@ class Api(object):
 
         raise TwitterError({'message': "Unkown banner image upload issue"})
 
-    def GetStreamSample(self, delimited=None, stall_warnings=None):
+    def GetStreamSample(self, delimited=None, stall_warnings=None, fields=None,
+                        keep_json=False, decoder=None):
         """Returns a small sample of public statuses.
 
         Args:
           delimited:
-            Specifies a message length. [Optional]
+            Set to 'length' to have every message preceded by its length
+            in bytes, which is faster to parse than newlines. [Optional]
           stall_warnings:
             Set to True to have Twitter deliver stall warnings. [Optional]
+          fields:
+            If given, statuses are yielded as twitter.Status instances
+            built with only these fields, see
+            twitter.Status.NewFromJsonDict. Other messages, such as
+            deletion notices, are yielded as JSON dicts. [Optional]
+          keep_json:
+            If True, statuses are yielded as twitter.Status instances
+            that keep the line they were read from, so AsJsonString
+            returns the exact bytes received. [Optional]
+          decoder:
+            A twitter.DecodePipeline decoding the messages in worker
+            processes, for streams too busy for one CPU, or a
+            twitter.StreamDispatcher yielding typed messages.  The
+            worker processes of a pipeline run until it is closed, with
+            its Close method or a with statement. [Optional]
 
         Returns:
           A Twitter stream
         """
+        resp = self._RequestStream(*self._SampleStream(delimited, stall_warnings))
+        for data in self._StreamMessages(resp, fields, keep_json, bool(delimited), decoder):
+            yield data
+
+    def _SampleStream(self, delimited=None, stall_warnings=None):
+        """Return the url, verb and data of a request for the sample
+        stream, see GetStreamSample."""
         url = '%s/statuses/sample.json' % self.stream_url
-        resp = self._RequestStream(url, 'GET')
-        for line in resp.iter_lines():
-            if line:
-                data = self._ParseAndCheckTwitter(line)
-                yield data
+        data = {}
+        if delimited is not None:
+            data['delimited'] = str(delimited)
+        if stall_warnings is not None:
+            data['stall_warnings'] = str(stall_warnings)
+        return url, 'GET', data
 
     def GetStreamFilter(self,
                         follow=None,
                         track=None,
                         locations=None,
                         delimited=None,
-                        stall_warnings=None):
+                        stall_warnings=None,
+                        fields=None,
+                        keep_json=False,
+                        decoder=None):
         """Returns a filtered view of public statuses.
 
         Args:
@@ -3887,13 +4102,38 @@ class Api(object):
             A list of Latitude,Longitude pairs (as strings) specifying
             bounding boxes for the tweets' origin. [Optional]
           delimited:
-            Specifies a message length. [Optional]
+            Set to 'length' to have every message preceded by its length
+            in bytes, which is faster to parse than newlines. [Optional]
           stall_warnings:
             Set to True to have Twitter deliver stall warnings. [Optional]
+          fields:
+            If given, statuses are yielded as twitter.Status instances
+            built with only these fields, see
+            twitter.Status.NewFromJsonDict. Other messages, such as
+            deletion notices, are yielded as JSON dicts. [Optional]
+          keep_json:
+            If True, statuses are yielded as twitter.Status instances
+            that keep the line they were read from, so AsJsonString
+            returns the exact bytes received. [Optional]
+          decoder:
+            A twitter.DecodePipeline decoding the messages in worker
+            processes, for streams too busy for one CPU, or a
+            twitter.StreamDispatcher yielding typed messages.  The
+            worker processes of a pipeline run until it is closed, with
+            its Close method or a with statement. [Optional]
 
         Returns:
           A twitter stream
         """
+        resp = self._RequestStream(*self._FilterStream(follow, track, locations,
+                                                       delimited, stall_warnings))
+        for data in self._StreamMessages(resp, fields, keep_json, bool(delimited), decoder):
+            yield data
+
+    def _FilterStream(self, follow=None, track=None, locations=None, delimited=None,
+                      stall_warnings=None):
+        """Return the url, verb and data of a request for the filter
+        stream, see GetStreamFilter."""
         if all((follow is None, track is None, locations is None)):
             raise ValueError({'message': "No filter parameters specified."})
         url = '%s/statuses/filter.json' % self.stream_url
@@ -3908,12 +4148,7 @@ class Api(object):
             data['delimited'] = str(delimited)
         if stall_warnings is not None:
             data['stall_warnings'] = str(stall_warnings)
-
-        resp = self._RequestStream(url, 'POST', data=data)
-        for line in resp.iter_lines():
-            if line:
-                data = self._ParseAndCheckTwitter(line)
-                yield data
+        return url, 'POST', data
 
     def GetUserStream(self,
                       replies='all',
@@ -3922,7 +4157,10 @@ class Api(object):
                       locations=None,
                       delimited=None,
                       stall_warnings=None,
-                      stringify_friend_ids=False):
+                      stringify_friend_ids=False,
+                      fields=None,
+                      keep_json=False,
+                      decoder=None):
         """Returns the data from the user stream.
 
         Args:
@@ -3938,16 +4176,42 @@ class Api(object):
             A list of Latitude,Longitude pairs (as strings) specifying
             bounding boxes for the tweets' origin. [Optional]
           delimited:
-            Specifies a message length. [Optional]
+            Set to 'length' to have every message preceded by its length
+            in bytes, which is faster to parse than newlines. [Optional]
           stall_warnings:
             Set to True to have Twitter deliver stall warnings. [Optional]
           stringify_friend_ids:
             Specifies whether to send the friends list preamble as an array of
             integers or an array of strings. [Optional]
+          fields:
+            If given, statuses are yielded as twitter.Status instances
+            built with only these fields, see
+            twitter.Status.NewFromJsonDict. Other messages, such as
+            deletion notices, are yielded as JSON dicts. [Optional]
+          keep_json:
+            If True, statuses are yielded as twitter.Status instances
+            that keep the line they were read from, so AsJsonString
+            returns the exact bytes received. [Optional]
+          decoder:
+            A twitter.DecodePipeline decoding the messages in worker
+            processes, for streams too busy for one CPU, or a
+            twitter.StreamDispatcher yielding typed messages.  The
+            worker processes of a pipeline run until it is closed, with
+            its Close method or a with statement. [Optional]
 
         Returns:
           A twitter stream
         """
+        resp = self._RequestStream(*self._UserStream(replies, withuser, track, locations,
+                                                     delimited, stall_warnings,
+                                                     stringify_friend_ids))
+        for data in self._StreamMessages(resp, fields, keep_json, bool(delimited), decoder):
+            yield data
+
+    def _UserStream(self, replies='all', withuser='user', track=None, locations=None,
+                    delimited=None, stall_warnings=None, stringify_friend_ids=False):
+        """Return the url, verb and data of a request for the user stream,
+        see GetUserStream."""
         url = 'https://userstream.twitter.com/1.1/user.json'
         data = {}
         if stringify_friend_ids:
@@ -3964,12 +4228,7 @@ class Api(object):
             data['delimited'] = str(delimited)
         if stall_warnings is not None:
             data['stall_warnings'] = str(stall_warnings)
-
-        resp = self._RequestStream(url, 'POST', data=data)
-        for line in resp.iter_lines():
-            if line:
-                data = self._ParseAndCheckTwitter(line)
-                yield data
+        return url, 'POST', data
 
     def VerifyCredentials(self):
         """Returns a twitter.User instance if the authenticating user is valid.
@@ -3980,7 +4239,7 @@ class Api(object):
         """
         url = '%s/account/verify_credentials.json' % self.base_url
         resp = self._RequestUrl(url, 'GET')  # No_cache
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return User.NewFromJsonDict(data)
 
@@ -4057,6 +4316,119 @@ class Api(object):
         """
         self._default_params['source'] = source
 
+    def SetLazyParsing(self, lazy):
+        """Build the statuses returned by the timeline, search and stream
+        methods lazily.
+
+        Statuses are then twitter.status.LazyStatus instances, which keep
+        their JSON dict and build each attribute, their author included,
+        the first time it is read.  Streams yield statuses rather than
+        JSON dicts while lazy parsing is on.  Methods given fields build
+        projections instead, and the worker processes of a
+        twitter.DecodePipeline do not parse lazily.
+
+        Args:
+          lazy:
+            True to parse lazily, False to build every attribute at once.
+        """
+        self._lazy = bool(lazy)
+
+    def SetIdentityMap(self, identity_map):
+        """Share the users and statuses returned by the timeline, search
+        and stream methods through an identity map.
+
+        Streams yield statuses rather than JSON dicts while a map is set.
+        Methods given fields build projections instead, and the worker
+        processes of a twitter.DecodePipeline do not use the map.
+
+        Args:
+          identity_map:
+            A twitter.IdentityMap, or None to build separate instances.
+        """
+        self._identity_map = identity_map
+
+    def SetStreamRecorder(self, recorder):
+        """Record the raw bytes of every stream connection.
+
+        Args:
+          recorder:
+            A twitter.StreamRecorder, or None to stop recording.
+        """
+        self._stream_recorder = recorder
+
+    def SetStreamReplayer(self, replayer):
+        """Answer stream requests from a recording instead of the network.
+
+        Args:
+          replayer:
+            A twitter.StreamReplayer, or None to connect to Twitter again.
+        """
+        self._stream_replayer = replayer
+
+    def SetProfile(self, profile):
+        """Set the request profile, which slims down responses.
+
+        A profile sets the trim_user, include_entities, skip_status and
+        include_user_entities parameters of every endpoint that accepts
+        them, taking precedence over the corresponding method arguments:
+
+          'full':
+            Everything is included.
+          'text_only':
+            Statuses come without entities but with their full author,
+            users without entities and without their latest status.
+          'ids_only':
+            As text_only, but the author of a status is trimmed to its id.
+
+        Args:
+          profile:
+            One of the names in twitter.api.PROFILES, or None to leave
+            the parameters to the methods.
+        """
+        if profile is not None and profile not in PROFILES:
+            raise TwitterError({'message': "Unknown profile %r, use one of %s" %
+                                (profile, ', '.join(sorted(PROFILES)))})
+        self._profile = profile
+
+    def WithProfile(self, profile):
+        """Return a copy of this instance using another request profile.
+
+        The copy shares the credentials and the cache of this instance,
+        but not its default parameters and request headers, which makes
+        it suitable for a single call:
+
+          >>> users = api.WithProfile('ids_only').GetFollowers()
+
+        Args:
+          profile:
+            The request profile, see SetProfile.
+
+        Returns:
+          A twitter.Api instance.
+        """
+        api = copy.copy(self)
+        api._default_params = dict(self._default_params)
+        api._request_headers = dict(self._request_headers)
+        api.SetProfile(profile)
+        return api
+
+    def _ProfileParameters(self, url, data):
+        """Return data with the parameters of the current profile that
+        apply to the endpoint of url."""
+        path = urlparse(url).path
+        base_path = urlparse(self.base_url).path
+        if path.startswith(base_path):
+            path = path[len(base_path):]
+        path = re.sub(r'(/\d+)?\.json$', '', path).strip('/')
+        names = PROFILE_ENDPOINTS.get(path)
+        if not names:
+            return data
+        data = dict(data or {})
+        values = PROFILES[self._profile]
+        for name in names:
+            data[name] = values[name]
+        return data
+
     def GetRateLimitStatus(self, resource_families=None):
         """Fetch the rate limit status for the currently authorized user.
 
@@ -4077,7 +4449,7 @@ class Api(object):
             parameters['resources'] = resource_families
 
         resp = self._RequestUrl(url, 'GET', data=parameters)  # No-Cache
-        data = self._ParseAndCheckTwitter(resp.content.decode('utf-8'))
+        data = self._ParseAndCheckTwitter(resp.content)
 
         return data
 
@@ -4237,11 +4609,17 @@ class Api(object):
 
         This is a purely defensive check because during some Twitter
         network outages it will return an HTML failwhale page.
+
+        Args:
+          json_data:
+            The body of the response, as bytes or as text.
         """
         try:
             data = json.loads(json_data)
             self._CheckForTwitterError(data)
         except ValueError:
+            if isinstance(json_data, bytes):
+                json_data = json_data.decode('utf-8', 'replace')
             if "<title>Twitter / Over capacity</title>" in json_data:
                 raise TwitterError({'message': "Capacity Error"})
             if "<title>Twitter / Error</title>" in json_data:
@@ -4281,7 +4659,7 @@ class Api(object):
         except requests.RequestException as e:
             raise TwitterError(str(e))
 
-    def _RequestUrl(self, url, verb, data=None):
+    def _RequestUrl(self, url, verb, data=None, stream=False):
         """Request a url.
 
         Args:
@@ -4291,6 +4669,9 @@ class Api(object):
                 Either POST or GET.
             data:
                 A dict of (str, unicode) key/value pairs.
+            stream:
+                If True, the body of a GET response is not read until it
+                is iterated over. [Optional]
 
         Returns:
             A JSON object.
@@ -4298,6 +4679,9 @@ class Api(object):
         if not self.__auth:
             raise TwitterError({'error': "The twitter.Api instance must be authenticated."})
 
+        if self._profile is not None:
+            data = self._ProfileParameters(url, data)
+
         if verb == 'POST':
             if 'media_ids' in data:
                 url = self._BuildUrl(url, extra_params={'media_ids': data['media_ids']})
@@ -4327,13 +4711,79 @@ class Api(object):
                 return requests.get(
                     url,
                     auth=self.__auth,
-                    timeout=self._timeout
+                    timeout=self._timeout,
+                    stream=stream
                 )
             except requests.RequestException as e:
                 raise TwitterError(str(e))
         return 0  # if not a POST or GET request
 
-    def _RequestStream(self, url, verb, data=None):
+    def _StatusFactory(self, fields=None, keep_json=False):
+        """Return a callable building a twitter.Status, or only the
+        given fields of one, from a JSON dict, as set by SetLazyParsing
+        and SetIdentityMap."""
+        lazy = self._lazy and fields is None
+        identity_map = self._identity_map if fields is None else None
+        if fields is None and not keep_json and not lazy and identity_map is None:
+            return Status.NewFromJsonDict
+        return lambda data: Status.NewFromJsonDict(data, lazy=lazy, identity_map=identity_map,
+                                                   fields=fields, keep_json=keep_json)
+
+    def _StreamMessages(self, resp, fields=None, keep_json=False, delimited=False,
+                        decoder=None):
+        """Parse the messages of a stream, building statuses if fields are
+        given, keep_json is set, parsing is lazy or an identity map is set,
+        in the processes of decoder if one is given.  See twitter.stream.ReadFrames for delimited."""
+        frames = ReadFrames(resp.iter_content(STREAM_CHUNK_SIZE), delimited)
+        if decoder is not None:
+            for data in decoder.Decode(frames, fields, keep_json):
+                yield data
+            return
+        for line in frames:
+            if line:
+                yield self._StreamMessage(line, fields, keep_json)
+
+    def _StreamMessage(self, line, fields=None, keep_json=False):
+        """Parse one message of a stream, see _StreamMessages."""
+        data = self._ParseAndCheckTwitter(line)
+        lazy = self._lazy and fields is None
+        identity_map = self._identity_map if fields is None else None
+        if not (fields is not None or keep_json or lazy or identity_map is not None):
+            return data
+        if 'id' not in data or 'text' not in data:
+            return data
+        if identity_map is not None:
+            return identity_map.Status(data, lazy=lazy, raw=line if keep_json else None)
+        data = Status.NewFromJsonDict(data, lazy=lazy, fields=fields)
+        if keep_json:
+            data._json = line
+        return data
+
+    def _RequestItems(self, url, parameters, factory, key=None):
+        """Request a url and parse the elements of an array in its response
+        while they arrive.
+
+        Args:
+            url:
+                The web location we want to retrieve.
+            parameters:
+                A dict of (str, unicode) key/value pairs.
+            factory:
+                A callable building a model from each element.
+            key:
+                The top-level member holding the array, if the response
+                is not an array itself. [Optional]
+
+        Returns:
+            A twitter.incremental.JsonArrayReader.
+        """
+        resp = self._RequestUrl(url, 'GET', data=parameters, stream=True)
+        return JsonArrayReader(resp.iter_content(INCREMENTAL_CHUNK_SIZE),
+                               key=key,
+                               factory=factory,
+                               parse_remainder=self._ParseAndCheckTwitter)
+
+    def _RequestStream(self, url, verb, data=None, timeout=None):
         """Request a stream of data.
 
            Args:
@@ -4343,22 +4793,37 @@ class Api(object):
                Either POST or GET.
              data:
                A dict of (str, unicode) key/value pairs.
+             timeout:
+               The timeout of the request, see requests. Defaults to the
+               timeout of the Api. [Optional]
 
            Returns:
-             A twitter stream.
+             A twitter stream, recorded or replayed if SetStreamRecorder or
+             SetStreamReplayer was called.
         """
+        if self._stream_replayer is not None:
+            return self._stream_replayer.Connect(url)
+        resp = self._OpenStream(url, verb, data, timeout)
+        if self._stream_recorder is not None and getattr(resp, 'status_code', None) == 200:
+            resp = self._stream_recorder.Tee(resp, url)
+        return resp
+
+    def _OpenStream(self, url, verb, data=None, timeout=None):
+        """Request a stream of data from Twitter, see _RequestStream."""
+        if timeout is None:
+            timeout = self._timeout
         if verb == 'POST':
             try:
                 return requests.post(url, data=data, stream=True,
                                      auth=self.__auth,
-                                     timeout=self._timeout)
+                                     timeout=timeout)
             except requests.RequestException as e:
                 raise TwitterError(str(e))
         if verb == 'GET':
             url = self._BuildUrl(url, extra_params=data)
             try:
                 return requests.get(url, stream=True, auth=self.__auth,
-                                    timeout=self._timeout)
+                                    timeout=timeout)
             except requests.RequestException as e:
                 raise TwitterError(str(e))
         return 0  # if not a POST or GET request
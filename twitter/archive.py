@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+"""An append-only binary archive of statuses and users.
+
+An archive is a data file of records and an index file next to it, named
+after it with '.idx' appended.
+
+The data file starts with a magic string, followed by the records in the
+order they were appended.  Each record is a header packed as RECORD,
+holding the length of the payload, the kind and flags, the id and the
+creation time in seconds since the epoch, followed by the payload: the
+JSON document of the status or user as returned by the API, compactly
+encoded and by default compressed with zlib.
+
+The index file is written when a writer is closed.  It holds the length
+of the data file it covers and two sorted arrays of ENTRY structs, one by
+(kind, id) and one by (kind, created_at, id), which the reader binary
+searches in place through mmap.  Only the last record appended for an id
+is indexed.  A reader rebuilds the index in memory from the record
+headers if the index file is missing or does not cover the data file.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+
+from twitter import json, TwitterError
+from twitter.status import Status
+from twitter.twitter_utils import parse_created_at
+from twitter.user import User
+
+MAGIC = b'TWARCHV1'
+INDEX_MAGIC = b'TWINDXV1'
+
+# length, kind | flags, id, created_at
+RECORD = struct.Struct('<IBqq')
+# kind, id, created_at, offset of the record
+ENTRY = struct.Struct('<BqqQ')
+# length of the data file covered, number of entries
+INDEX_HEADER = struct.Struct('<QQ')
+
+KINDS = {'status': 1, 'user': 2}
+_MODELS = {1: Status, 2: User}
+_COMPRESSED = 0x80
+_KIND_MASK = 0x7f
+
+
+def _Kind(kind):
+    try:
+        return KINDS[kind]
+    except KeyError:
+        raise TwitterError({'message': "Unknown archive kind %r, use one of %s" %
+                            (kind, ', '.join(sorted(KINDS)))})
+
+
+def _ScanRecords(buf, size):
+    """Return the (kind, id, created_at, offset) of every record in buf,
+    and the offset after the last complete record."""
+    entries = []
+    offset = len(MAGIC)
+    while offset + RECORD.size <= size:
+        length, kind, id, created_at = RECORD.unpack_from(buf, offset)
+        if offset + RECORD.size + length > size:
+            # A record cut short by a crash while appending.
+            break
+        entries.append((kind & _KIND_MASK, id, created_at, offset))
+        offset += RECORD.size + length
+    return entries, offset
+
+
+def _UnpackEntries(buf):
+    """Iterate over the entries packed in buf."""
+    for offset in range(0, len(buf), ENTRY.size):
+        yield ENTRY.unpack_from(buf, offset)
+
+
+def _IndexBytes(entries, size):
+    """Pack the index of the last record of every (kind, id)."""
+    latest = {}
+    for entry in entries:
+        latest[entry[:2]] = entry
+    by_id = sorted(latest.values())
+    by_time = sorted(by_id, key=lambda entry: (entry[0], entry[2], entry[1]))
+    parts = [INDEX_MAGIC, INDEX_HEADER.pack(size, len(by_id))]
+    parts.extend(ENTRY.pack(*entry) for entry in by_id)
+    parts.extend(ENTRY.pack(*entry) for entry in by_time)
+    return b''.join(parts)
+
+
+class ArchiveWriter(object):
+    """Appends statuses and users to an archive, see twitter.archive.
+
+    Records are written as they are appended, and only their packed
+    index entries are kept in memory.  Appending to an existing archive
+    keeps its records; the index is rewritten on Close to cover all of
+    them.
+
+    Example usage:
+
+      >>> with twitter.ArchiveWriter('sample.twar') as archive:
+      ...     for data in api.GetStreamSample():
+      ...         if 'id' in data and 'text' in data:
+      ...             archive.AppendJsonDict(data)
+    """
+
+    def __init__(self, path, compress=True):
+        """Open an archive for appending.
+
+        Args:
+          path:
+            The path of the data file, created if it does not exist.
+          compress:
+            Whether to compress the payloads of new records with zlib.
+            [Optional]
+        """
+        self.path = path
+        self.compress = compress
+        self._entries = bytearray()
+        self._file = open(path, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(MAGIC)
+            size = len(MAGIC)
+        else:
+            try:
+                reader = ArchiveReader(path)
+            except TwitterError:
+                self._file.close()
+                raise
+            with reader:
+                self._entries = bytearray(reader._EntryBytes())
+                size = reader._end
+            # Drop a record cut short by a crash.
+            self._file.truncate(size)
+        self._offset = size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def __len__(self):
+        return len(self._entries) // ENTRY.size
+
+    def AppendJsonDict(self, data, kind='status'):
+        """Append a status or user as a JSON dict, as returned by the API.
+
+        Args:
+          data:
+            The JSON dict. It must have an id.
+          kind:
+            'status' or 'user'. [Optional]
+        """
+        code = _Kind(kind)
+        if data.get('id') is None:
+            raise TwitterError({'message': "Cannot archive a %s without an id" % kind})
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self._Append(code, data['id'], data.get('created_at'), payload)
+
+    def ExtendJsonDicts(self, dicts, kind='status'):
+        """Append a sequence of JSON dicts, see AppendJsonDict."""
+        for data in dicts:
+            self.AppendJsonDict(data, kind)
+
+    def Append(self, model):
+        """Append a twitter.Status or twitter.User.
+
+        The model must keep the JSON it was built from, see keep_json on
+        NewFromJsonDict, since its attributes do not round-trip to the
+        JSON of the API.
+        """
+        kind = 'user' if isinstance(model, User) else 'status'
+        raw = getattr(model, '_json', None)
+        if raw is None:
+            raise TwitterError({'message': "Only models created with keep_json can be archived"})
+        if isinstance(raw, dict):
+            return self.AppendJsonDict(raw, kind)
+        if not isinstance(raw, bytes):
+            raw = raw.encode('utf-8')
+        self._Append(_Kind(kind), model.id, model.created_at, raw)
+
+    def _Append(self, code, id, created_at, payload):
+        created_at = parse_created_at(created_at) if created_at else 0
+        if self.compress:
+            payload = zlib.compress(payload)
+            code |= _COMPRESSED
+        self._file.write(RECORD.pack(len(payload), code, id, created_at))
+        self._file.write(payload)
+        self._entries += ENTRY.pack(code & _KIND_MASK, id, created_at, self._offset)
+        self._offset += RECORD.size + len(payload)
+
+    def Close(self):
+        """Flush the records and write the index."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        with open(self.path + '.idx', 'wb') as f:
+            f.write(_IndexBytes(_UnpackEntries(self._entries), self._offset))
+
+
+class ArchiveReader(object):
+    """Reads an archive written by twitter.ArchiveWriter.
+
+    The data and index files are memory-mapped, so opening an archive
+    reads nothing but the index header, and each lookup touches only the
+    index entries of a binary search and the record it finds.  Models are
+    returned as lazy views, see twitter.status.LazyStatus, whose
+    AsJsonString returns the archived JSON unchanged.
+
+    Example usage:
+
+      >>> with twitter.ArchiveReader('sample.twar') as archive:
+      ...     status = archive.Get(675055636267298821)
+      ...     for status in archive.ScanTime(since=1449705600, until=1449792000):
+      ...         print(status.text)
+    """
+
+    def __init__(self, path):
+        """Open an archive for reading.
+
+        Args:
+          path:
+            The path of the data file.
+        """
+        self.path = path
+        self._index_file = None
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(MAGIC):
+            self._file.close()
+            raise TwitterError({'message': "%s is not a twitter archive" % path})
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(MAGIC)] != MAGIC:
+            self.Close()
+            raise TwitterError({'message': "%s is not a twitter archive" % path})
+        self._index = self._OpenIndex(size)
+        covered, self._count = INDEX_HEADER.unpack_from(self._index, len(INDEX_MAGIC))
+        self._by_id = len(INDEX_MAGIC) + INDEX_HEADER.size
+        self._by_time = self._by_id + self._count * ENTRY.size
+
+    def _OpenIndex(self, size):
+        self._end = size
+        try:
+            self._index_file = open(self.path + '.idx', 'rb')
+        except IOError:
+            return self._RebuildIndex(size)
+        if os.fstat(self._index_file.fileno()).st_size:
+            index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if index[:len(INDEX_MAGIC)] == INDEX_MAGIC:
+                covered = INDEX_HEADER.unpack_from(index, len(INDEX_MAGIC))[0]
+                if covered == size:
+                    return index
+            index.close()
+        # Stale, for instance after a writer that was not closed.
+        self._index_file.close()
+        self._index_file = None
+        return self._RebuildIndex(size)
+
+    def _RebuildIndex(self, size):
+        entries, self._end = _ScanRecords(self._data, size)
+        return _IndexBytes(entries, size)
+
+    def _EntryBytes(self):
+        return self._index[self._by_id:self._by_time]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def __len__(self):
+        return self._count
+
+    def Close(self):
+        """Unmap and close the archive."""
+        for mapping in (getattr(self, '_index', None), self._data):
+            if isinstance(mapping, mmap.mmap):
+                mapping.close()
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        self._file.close()
+
+    def _Entry(self, section, i):
+        return ENTRY.unpack_from(self._index, section + i * ENTRY.size)
+
+    def _Bisect(self, section, key, position):
+        # The first entry of the section whose key, as returned by
+        # position, is not less than key.
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if position(self._Entry(section, mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _Model(self, offset):
+        length, code, _, _ = RECORD.unpack_from(self._data, offset)
+        start = offset + RECORD.size
+        payload = self._data[start:start + length]
+        if code & _COMPRESSED:
+            payload = zlib.decompress(payload)
+        model = _MODELS[code & _KIND_MASK].NewFromJsonDict(json.loads(payload), lazy=True)
+        model._json = payload
+        return model
+
+    def Get(self, id, kind='status'):
+        """Return the status or user with an id, or None.
+
+        Args:
+          id:
+            The id of the status or user.
+          kind:
+            'status' or 'user'. [Optional]
+
+        Returns:
+          A twitter.status.LazyStatus or twitter.user.LazyUser.
+        """
+        code = _Kind(kind)
+        i = self._Bisect(self._by_id, (code, id), lambda entry: entry[:2])
+        if i < self._count:
+            entry = self._Entry(self._by_id, i)
+            if entry[:2] == (code, id):
+                return self._Model(entry[3])
+        return None
+
+    def Scan(self, start_id=None, end_id=None, kind='status'):
+        """Iterate over the statuses or users with start_id <= id < end_id,
+        in ascending id order.
+
+        Args:
+          start_id:
+            The lowest id returned. Defaults to the lowest in the archive.
+            [Optional]
+          end_id:
+            The id after the highest returned. Defaults to no limit.
+            [Optional]
+          kind:
+            'status' or 'user'. [Optional]
+        """
+        code = _Kind(kind)
+        return self._Range(self._by_id, code, start_id, end_id, lambda entry: entry[1])
+
+    def ScanTime(self, since=None, until=None, kind='status'):
+        """Iterate over the statuses or users created in since <= t < until,
+        in ascending time order.
+
+        Args:
+          since:
+            The earliest creation time, in seconds since the epoch.
+            [Optional]
+          until:
+            The creation time after the latest returned. [Optional]
+          kind:
+            'status' or 'user'. [Optional]
+        """
+        code = _Kind(kind)
+        return self._Range(self._by_time, code, since, until, lambda entry: entry[2])
+
+    def _Range(self, section, code, start, end, value):
+        if start is None:
+            i = self._Bisect(section, (code,), lambda entry: entry[:1])
+        else:
+            i = self._Bisect(section, (code, start), lambda entry: (entry[0], value(entry)))
+        while i < self._count:
+            entry = self._Entry(section, i)
+            if entry[0] != code or (end is not None and value(entry) >= end):
+                break
+            yield self._Model(entry[3])
+            i += 1
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+from __future__ import division
+
+from multiprocessing.pool import ThreadPool
+
+from twitter import TwitterError
+from twitter.twitter_utils import timestamp_to_id
+
+
+def TimeWindows(start, end, windows):
+    """Split a time range into id windows of equal duration.
+
+    Args:
+      start:
+        Start of the range, in seconds since the epoch.
+      end:
+        End of the range, in seconds since the epoch.
+      windows:
+        The number of windows to create.
+
+    Returns:
+      A list of (since_id, max_id) tuples, newest window first.  The
+      windows do not overlap and together cover exactly the statuses
+      created in [start, end).
+    """
+    if end <= start:
+        raise TwitterError({'message': "end must be after start"})
+    if windows < 1:
+        raise TwitterError({'message': "windows must be at least 1"})
+    step = (end - start) / windows
+    bounds = [timestamp_to_id(start + step * i) for i in range(windows)]
+    bounds.append(timestamp_to_id(end))
+    return [(bounds[i] - 1, bounds[i + 1] - 1) for i in reversed(range(windows))]
+
+
+def WalkTimeline(fetch, since_id=None, max_id=None, max_pages=None):
+    """Fetch all statuses of an id range by walking max_id backwards.
+
+    Args:
+      fetch:
+        A callable taking since_id and max_id keyword arguments and
+        returning one page of twitter.Status instances, newest first.
+      since_id:
+        Only statuses newer than this id are fetched. [Optional]
+      max_id:
+        Only statuses with an id less than or equal to this id are
+        fetched. [Optional]
+      max_pages:
+        The maximum number of pages to fetch. [Optional]
+
+    Returns:
+      A generator of twitter.Status instances, newest first.
+    """
+    pages = 0
+    while max_pages is None or pages < max_pages:
+        page = fetch(since_id=since_id, max_id=max_id)
+        pages += 1
+        for status in page:
+            if since_id is not None and status.id <= since_id:
+                return
+            yield status
+        if not page:
+            return
+        max_id = page[-1].id - 1
+
+
+def SearchFetcher(term=None, **kwargs):
+    """Return a fetch function for ParallelBackfill that runs a search.
+
+    Args:
+      term:
+        Term to search by.
+      kwargs:
+        Any further arguments for Api.GetSearch. [Optional]
+    """
+    kwargs.setdefault('result_type', 'recent')
+    kwargs.setdefault('count', 100)
+
+    def Fetch(api, since_id=None, max_id=None):
+        return api.GetSearch(term=term, since_id=since_id, max_id=max_id, **kwargs)
+    return Fetch
+
+
+def UserTimelineFetcher(user_id=None, screen_name=None, **kwargs):
+    """Return a fetch function for ParallelBackfill that reads a user
+    timeline.
+
+    Args:
+      user_id:
+        The id of the user. [Optional]
+      screen_name:
+        The screen name of the user. [Optional]
+      kwargs:
+        Any further arguments for Api.GetUserTimeline. [Optional]
+    """
+    kwargs.setdefault('count', 200)
+
+    def Fetch(api, since_id=None, max_id=None):
+        return api.GetUserTimeline(user_id=user_id, screen_name=screen_name,
+                                   since_id=since_id, max_id=max_id, **kwargs)
+    return Fetch
+
+
+def ParallelBackfill(apis, fetch, start, end, windows=8, threads=None):
+    """Fetch all statuses created in a time range, several id windows at
+    a time.
+
+    Status ids encode their creation time, so the range is split into
+    since_id/max_id windows up front and the windows are walked
+    concurrently, instead of one max_id walk that has to wait for each
+    page before requesting the next.  Windows are spread over the given
+    Api instances round robin, which lets several credentials share the
+    work.
+
+    Example usage:
+
+      >>> fetch = twitter.backfill.SearchFetcher('python')
+      >>> for status in twitter.ParallelBackfill([api1, api2], fetch, start, end):
+      ...     archive(status)
+
+    Args:
+      apis:
+        A twitter.Api instance, or a sequence of them.
+      fetch:
+        A callable taking an Api instance, since_id and max_id and
+        returning one page of twitter.Status instances, newest first.
+        See SearchFetcher and UserTimelineFetcher.
+      start:
+        Start of the range, in seconds since the epoch.
+      end:
+        End of the range, in seconds since the epoch.
+      windows:
+        The number of windows to split the range into. [Optional]
+      threads:
+        The number of windows fetched at the same time. Defaults to
+        the number of windows. [Optional]
+
+    Returns:
+      A generator of twitter.Status instances in descending id order.
+      The statuses of a window are yielded as soon as it and all newer
+      windows are complete.
+    """
+    if not isinstance(apis, (list, tuple)):
+        apis = [apis]
+    if not apis:
+        raise TwitterError({'message': "At least one Api instance is required"})
+
+    jobs = [(apis[i % len(apis)], since_id, max_id)
+            for i, (since_id, max_id) in enumerate(TimeWindows(start, end, windows))]
+
+    def FetchWindow(job):
+        api, since_id, max_id = job
+
+        def Page(since_id, max_id):
+            return fetch(api, since_id=since_id, max_id=max_id)
+        return list(WalkTimeline(Page, since_id=since_id, max_id=max_id))
+
+    pool = ThreadPool(threads or len(jobs))
+    try:
+        for statuses in pool.imap(FetchWindow, jobs):
+            for status in statuses:
+                yield status
+    finally:
+        pool.terminate()
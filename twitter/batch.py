@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+from __future__ import division
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from twitter import TwitterError
+from twitter.twitter_utils import parse_created_at
+
+try:
+    array('q')
+    _INT64 = 'q'
+except ValueError:
+    # Python 2 has no 'q' typecode; 'l' is 64 bits wide on LP64 platforms.
+    _INT64 = 'l'
+
+
+def _Epoch(created_at):
+    if not created_at:
+        return 0
+    return parse_created_at(created_at)
+
+
+class _Batch(object):
+    """Column-wise storage for a sequence of model objects.
+
+    Subclasses define INT_COLUMNS, a list of (column, getter) pairs
+    stored in typed arrays, and TEXT_COLUMNS, stored in lists.  The
+    getters take a JSON dict.
+    """
+
+    INT_COLUMNS = []
+    TEXT_COLUMNS = []
+
+    def __init__(self):
+        for column, _ in self.INT_COLUMNS:
+            setattr(self, column, array(_INT64))
+        for column in self.TEXT_COLUMNS:
+            setattr(self, column, [])
+
+    def __len__(self):
+        return len(getattr(self, self.INT_COLUMNS[0][0]))
+
+    def AppendJsonDict(self, data):
+        """Append the fields of a JSON dict, as returned by the API."""
+        for column, get in self.INT_COLUMNS:
+            getattr(self, column).append(get(data) or 0)
+        for column in self.TEXT_COLUMNS:
+            getattr(self, column).append(data.get(column))
+
+    def ExtendJsonDicts(self, dicts):
+        """Append the fields of a sequence of JSON dicts."""
+        for data in dicts:
+            self.AppendJsonDict(data)
+
+    def Append(self, model):
+        """Append the fields of a model object."""
+        self.AppendJsonDict(model.AsDict())
+
+    def Extend(self, models):
+        """Append the fields of a sequence of model objects."""
+        for model in models:
+            self.Append(model)
+
+    def Column(self, column):
+        """Return a column as a NumPy array sharing the memory of the batch.
+
+        The view is only valid until the batch grows, since growing may
+        move the underlying buffer.
+        """
+        if numpy is None:
+            raise TwitterError({'message': "NumPy is required for Column"})
+        values = getattr(self, column)
+        if isinstance(values, list):
+            return numpy.array(values, dtype=object)
+        if not values:
+            return numpy.zeros(0, dtype=numpy.int64)
+        return numpy.frombuffer(values, dtype='i%d' % values.itemsize)
+
+    def AsNumpy(self):
+        """Return a dict of all columns as NumPy arrays, see Column."""
+        columns = [c for c, _ in self.INT_COLUMNS] + list(self.TEXT_COLUMNS)
+        return dict((column, self.Column(column)) for column in columns)
+
+    def TimeBuckets(self, width):
+        """Count the items created in each interval of width seconds.
+
+        Args:
+          width:
+            The length of the intervals in seconds, e.g. 3600 for hourly
+            buckets.
+
+        Returns:
+          A list of (bucket_start, count) tuples in ascending time order.
+          Items without a creation time are not counted.
+        """
+        width = int(width)
+        if width <= 0:
+            raise TwitterError({'message': "width must be positive"})
+        if numpy is not None and len(self):
+            created = self.Column('created_at')
+            created = created[created > 0]
+            starts, counts = numpy.unique(created // width * width, return_counts=True)
+            return list(zip(starts.tolist(), counts.tolist()))
+        counts = {}
+        for created in self.created_at:
+            if created > 0:
+                start = created // width * width
+                counts[start] = counts.get(start, 0) + 1
+        return sorted(counts.items())
+
+    def Stats(self, column):
+        """Return the total, mean and maximum of an integer column.
+
+        Returns:
+          A dict with the keys 'total', 'mean' and 'max'. The mean and
+          maximum of an empty batch are None.
+        """
+        if not len(self):
+            return {'total': 0, 'mean': None, 'max': None}
+        if numpy is not None:
+            values = self.Column(column)
+            total = int(values.sum())
+            maximum = int(values.max())
+        else:
+            values = getattr(self, column)
+            total = sum(values)
+            maximum = max(values)
+        return {'total': total, 'mean': total / len(self), 'max': maximum}
+
+
+class StatusBatch(_Batch):
+    """A page or stream of statuses stored column-wise.
+
+    Ids, creation times (in seconds since the epoch), author ids and
+    counts are kept in typed arrays of 64-bit integers and the texts in a
+    list, which takes a fraction of the memory of twitter.Status objects
+    and lets NumPy work on whole columns at once.  Missing numbers are
+    stored as 0.
+
+    Example usage:
+
+      >>> batch = twitter.StatusBatch()
+      >>> batch.ExtendJsonDicts(api.GetSearch(term='python', return_json=True)['statuses'])
+      >>> batch.TimeBuckets(3600)
+      >>> batch.EngagementStats()
+    """
+
+    INT_COLUMNS = [
+        ('id', lambda data: data.get('id')),
+        ('created_at', lambda data: _Epoch(data.get('created_at'))),
+        ('user_id', lambda data: (data.get('user') or {}).get('id')),
+        ('retweet_count', lambda data: data.get('retweet_count')),
+        ('favorite_count', lambda data: data.get('favorite_count')),
+    ]
+    TEXT_COLUMNS = ['text']
+
+    def EngagementStats(self):
+        """Return Stats for the retweet and favorite counts.
+
+        Returns:
+          A dict mapping 'retweet_count', 'favorite_count' and
+          'engagement', their sum per status, to Stats results.
+        """
+        stats = {'retweet_count': self.Stats('retweet_count'),
+                 'favorite_count': self.Stats('favorite_count')}
+        total = stats['retweet_count']['total'] + stats['favorite_count']['total']
+        if numpy is not None and len(self):
+            maximum = int((self.Column('retweet_count') + self.Column('favorite_count')).max())
+        else:
+            maximum = max([r + f for r, f in zip(self.retweet_count, self.favorite_count)] or [None])
+        stats['engagement'] = {'total': total,
+                               'mean': total / len(self) if len(self) else None,
+                               'max': maximum}
+        return stats
+
+
+class UserBatch(_Batch):
+    """A page of users stored column-wise, see StatusBatch."""
+
+    INT_COLUMNS = [
+        ('id', lambda data: data.get('id')),
+        ('created_at', lambda data: _Epoch(data.get('created_at'))),
+        ('followers_count', lambda data: data.get('followers_count')),
+        ('friends_count', lambda data: data.get('friends_count')),
+        ('statuses_count', lambda data: data.get('statuses_count')),
+        ('favourites_count', lambda data: data.get('favourites_count')),
+        ('listed_count', lambda data: data.get('listed_count')),
+    ]
+    TEXT_COLUMNS = ['screen_name']
@@ -1,13 +1,21 @@
 #!/usr/bin/env python
 
-from calendar import timegm
+from twitter import json
+from twitter._schema import Field, Schema
+from twitter.twitter_utils import parse_created_at
 
-try:
-    from rfc822 import parsedate
-except ImportError:
-    from email.utils import parsedate
 
-from twitter import json
+_DIRECT_MESSAGE_SCHEMA = Schema('DirectMessage', [
+    Field('id'),
+    Field('created_at'),
+    Field('sender_id'),
+    Field('sender_screen_name'),
+    Field('recipient_id'),
+    Field('recipient_screen_name'),
+    Field('text'),
+    Field('_created_at_cache', key=None, dump=None, compare=False, pickle=False),
+    Field('_json', key=None, dump=None, compare=False),
+])
 
 
 class DirectMessage(object):
@@ -25,15 +33,9 @@ class DirectMessage(object):
       direct_message.text
     """
 
-    def __init__(self,
-                 id=None,
-                 created_at=None,
-                 sender_id=None,
-                 sender_screen_name=None,
-                 recipient_id=None,
-                 recipient_screen_name=None,
-                 text=None):
-        """An object to hold a Twitter direct message.
+    _SCHEMA = _DIRECT_MESSAGE_SCHEMA
+
+    __init__ = _DIRECT_MESSAGE_SCHEMA.Init(extra_kwargs=False, doc="""An object to hold a Twitter direct message.
 
         This class is normally instantiated by the twitter.Api class and
         returned in a sequence.
@@ -55,14 +57,7 @@ class DirectMessage(object):
             The name of the twitter that received this message. [Optional]
           text:
             The text of this direct message. [Optional]
-        """
-        self.id = id
-        self.created_at = created_at
-        self.sender_id = sender_id
-        self.sender_screen_name = sender_screen_name
-        self.recipient_id = recipient_id
-        self.recipient_screen_name = recipient_screen_name
-        self.text = text
+        """)
 
     # Functions that you should be able to set.
 
@@ -129,10 +124,16 @@ class DirectMessage(object):
     def CreatedAtInSeconds(self):
         """Get the time this direct message was posted, in seconds since the epoch.
 
+        The value is computed once and cached until created_at changes.
+
         Returns:
           The time this direct message was posted, in seconds since the epoch.
         """
-        return timegm(parsedate(self.created_at))
+        cache = self._created_at_cache
+        if cache is None or cache[0] is not self.created_at:
+            cache = (self.created_at, parse_created_at(self.created_at))
+            self._created_at_cache = cache
+        return cache[1]
 
     @property
     def SenderScreenName(self):
@@ -155,18 +156,11 @@ class DirectMessage(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
-    def __eq__(self, other):
-        try:
-            return other and \
-                   self.id == other.id and \
-                   self.created_at == other.created_at and \
-                   self.sender_id == other.sender_id and \
-                   self.sender_screen_name == other.sender_screen_name and \
-                   self.recipient_id == other.recipient_id and \
-                   self.recipient_screen_name == other.recipient_screen_name and \
-                   self.text == other.text
-        except AttributeError:
-            return False
+    __eq__ = _DIRECT_MESSAGE_SCHEMA.Eq()
+
+    __reduce__ = _DIRECT_MESSAGE_SCHEMA.Reduce(lambda: DirectMessage)
+
+    __setstate__ = _DIRECT_MESSAGE_SCHEMA.SetState()
 
     def __str__(self):
         """A string representation of this twitter.DirectMessage instance.
@@ -178,54 +172,43 @@ class DirectMessage(object):
         """
         return self.AsJsonString()
 
-    def AsJsonString(self):
+    def AsJsonString(self, sort_keys=True):
         """A JSON string representation of this twitter.DirectMessage instance.
+        Set sort_keys=False for faster output in no particular key order.
 
         Returns:
-          A JSON string representation of this twitter.DirectMessage instance
+          A JSON string representation of this twitter.DirectMessage instance, or
+          the original payload if it was created with keep_json.
        """
-        return json.dumps(self.AsDict(), sort_keys=True)
-
-    def AsDict(self):
-        """A dict representation of this twitter.DirectMessage instance.
+        if self._json is not None:
+            return json.dumps_raw(self._json)
+        return json.dumps(self.AsDict(), sort_keys=sort_keys)
 
-        The return value uses the same key names as the JSON representation.
-
-        Return:
-          A dict representing this twitter.DirectMessage instance
-        """
-        data = {}
-        if self.id:
-            data['id'] = self.id
-        if self.created_at:
-            data['created_at'] = self.created_at
-        if self.sender_id:
-            data['sender_id'] = self.sender_id
-        if self.sender_screen_name:
-            data['sender_screen_name'] = self.sender_screen_name
-        if self.recipient_id:
-            data['recipient_id'] = self.recipient_id
-        if self.recipient_screen_name:
-            data['recipient_screen_name'] = self.recipient_screen_name
-        if self.text:
-            data['text'] = self.text
-        return data
+    AsDict = _DIRECT_MESSAGE_SCHEMA.AsDict()
 
     @staticmethod
-    def NewFromJsonDict(data):
+    def NewFromJsonDict(data, fields=None, keep_json=False):
         """Create a new instance based on a JSON dict.
 
         Args:
           data:
             A JSON dict, as converted from the JSON in the twitter API
+          fields:
+            A projection such as ('id', 'text'), see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, keep data for AsJsonString, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A twitter.DirectMessage instance
         """
-        return DirectMessage(created_at=data.get('created_at', None),
-                             recipient_id=data.get('recipient_id', None),
-                             sender_id=data.get('sender_id', None),
-                             text=data.get('text', None),
-                             sender_screen_name=data.get('sender_screen_name', None),
-                             id=data.get('id', None),
-                             recipient_screen_name=data.get('recipient_screen_name', None))
+        if fields is not None:
+            obj = _DIRECT_MESSAGE_SCHEMA.Projector(fields)(DirectMessage, data)
+        else:
+            obj = DirectMessage._Build(data)
+        if keep_json:
+            obj._json = data
+        return obj
+
+    _Build = _DIRECT_MESSAGE_SCHEMA.Builder()
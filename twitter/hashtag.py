@@ -4,10 +4,15 @@
 class Hashtag(object):
     """ A class representing a twitter hashtag """
 
+    __slots__ = ('text',)
+
     def __init__(self,
                  text=None):
         self.text = text
 
+    def __reduce__(self):
+        return Hashtag, (self.text,)
+
     @staticmethod
     def NewFromJsonDict(data):
         """Create a new instance based on a JSON dict.
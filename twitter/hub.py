@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+
+import collections
+import threading
+import time
+
+from twitter import TwitterError
+
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+
+class _Ring(object):
+    """A bounded FIFO of (arrival time, message) pairs, guarded by a
+    condition that signals both new messages and free space."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = collections.deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.error = None
+
+    def Full(self):
+        return len(self.items) >= self.capacity
+
+
+class Subscription(object):
+    """The messages of a twitter.StreamHub delivered to one consumer.
+
+    Instances are created with StreamHub.Subscribe.  Iterating over a
+    subscription yields its messages until it, or the hub, is closed, and
+    then raises the error that ended the stream, if any.
+    """
+
+    def __init__(self, hub, capacity, policy, clock):
+        self._hub = hub
+        self._ring = _Ring(capacity)
+        self._clock = clock
+        self.policy = policy
+        self.delivered = 0
+        self.dropped = 0
+        self.blocked = 0.0
+
+    def __iter__(self):
+        while True:
+            message = self.Get()
+            if message is None:
+                return
+            yield message
+
+    def Get(self, timeout=None):
+        """Return the next message, waiting for up to timeout seconds.
+
+        Returns:
+          The message, or None if the timeout expired or the subscription
+          is closed and drained.  A subscription closed by an error of
+          the stream raises it instead, see StreamHub.
+        """
+        ring = self._ring
+        deadline = None if timeout is None else time.time() + timeout
+        with ring.cond:
+            while not ring.items and not ring.closed:
+                if deadline is None:
+                    ring.cond.wait()
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    ring.cond.wait(remaining)
+            if not ring.items:
+                if ring.closed and ring.error is not None:
+                    raise ring.error
+                return None
+            _, message = ring.items.popleft()
+            self.delivered += 1
+            ring.cond.notify_all()
+            return message
+
+    def Close(self):
+        """Stop delivering to this subscription."""
+        self._hub._Unsubscribe(self)
+        self._Close()
+
+    def _Close(self, error=None):
+        ring = self._ring
+        with ring.cond:
+            ring.closed = True
+            ring.error = error
+            ring.cond.notify_all()
+
+    def _Put(self, arrived, message, stopping):
+        # Called by the dispatcher only.
+        ring = self._ring
+        with ring.cond:
+            if ring.closed:
+                return
+            if ring.Full():
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.policy == DROP_OLDEST:
+                    ring.items.popleft()
+                    self.dropped += 1
+                else:
+                    start = self._clock()
+                    while ring.Full() and not ring.closed and not stopping():
+                        ring.cond.wait(0.1)
+                    self.blocked += self._clock() - start
+                    if ring.closed or ring.Full():
+                        return
+            ring.items.append((arrived, message))
+            ring.cond.notify_all()
+
+    def Stats(self):
+        """Return the delivery statistics of this subscription.
+
+        Returns:
+          A dict with the policy, the capacity, the number of messages
+          delivered and dropped, the lag in messages queued and in
+          seconds since the oldest queued message arrived, and the
+          seconds the hub spent blocked on this subscription.
+        """
+        ring = self._ring
+        with ring.cond:
+            lag = len(ring.items)
+            lag_seconds = self._clock() - ring.items[0][0] if lag else 0.0
+        return {'policy': self.policy,
+                'capacity': ring.capacity,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'lag': lag,
+                'lag_seconds': lag_seconds,
+                'blocked': self.blocked}
+
+
+class StreamHub(object):
+    """Shares one stream between many consumers.
+
+    A reader thread consumes the stream and appends every message, parsed
+    once, to an intake buffer; it never waits for subscribers, so a slow
+    consumer cannot slow down the connection and make Twitter drop it.  A
+    dispatcher thread copies the messages from the intake to the bounded
+    buffer of every subscription, applying the policy of the subscription
+    when its buffer is full:
+
+      'block':
+        Wait for the subscriber to make room.  This delays all
+        subscriptions, while the intake buffer absorbs the stream.
+      'drop_oldest':
+        Discard the oldest queued message.
+      'drop_newest':
+        Discard the new message.
+
+    If the intake buffer itself fills up, its oldest messages are
+    dropped.  All subscribers receive the same message objects, which
+    they should not modify.
+
+    If reading the stream raises an exception, it is kept in the error
+    attribute, the subscriptions are closed once the messages received
+    before it have been dispatched, and each raises it to its consumer
+    after delivering them.
+
+    Example usage:
+
+      >>> hub = twitter.StreamHub(twitter.StreamConsumer(api, 'filter', track=['python']))
+      >>> archive = hub.Subscribe(capacity=100000, policy='block')
+      >>> dashboard = hub.Subscribe(capacity=100, policy='drop_oldest')
+      >>> hub.Start()
+      >>> for message in dashboard:
+      ...     show(message)
+    """
+
+    def __init__(self, stream, intake_capacity=100000, clock=time.time):
+        """Instantiate a new twitter.StreamHub object.
+
+        Args:
+          stream:
+            The stream to share: a twitter.StreamConsumer, or any object
+            with a Messages method returning an iterable and a Stop
+            method.
+          intake_capacity:
+            The number of messages buffered between the reader and the
+            dispatcher. [Optional]
+          clock:
+            A callable returning the current time in seconds. [Optional]
+        """
+        if intake_capacity <= 0:
+            raise TwitterError({'message': "intake_capacity must be positive"})
+        self._stream = stream
+        self._intake = _Ring(intake_capacity)
+        self._clock = clock
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stopping = False
+        self.error = None
+        self.received = 0
+        self.intake_dropped = 0
+
+    def Subscribe(self, capacity=1000, policy=DROP_OLDEST):
+        """Add a subscriber.
+
+        Args:
+          capacity:
+            The number of messages the subscription buffers. [Optional]
+          policy:
+            'block', 'drop_oldest' or 'drop_newest', see StreamHub.
+            [Optional]
+
+        Returns:
+          A twitter.hub.Subscription receiving the messages that arrive
+          from now on.
+        """
+        if policy not in POLICIES:
+            raise TwitterError({'message': "Unknown policy %r, use one of %s" %
+                                (policy, ', '.join(POLICIES))})
+        if capacity <= 0:
+            raise TwitterError({'message': "capacity must be positive"})
+        subscription = Subscription(self, capacity, policy, self._clock)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def _Unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def Start(self):
+        """Start reading the stream and dispatching its messages."""
+        if self._threads:
+            raise TwitterError({'message': "The hub is already started"})
+        self._stopping = False
+        self.error = None
+        self._threads = [threading.Thread(target=self._ReadLoop, name='StreamHub reader'),
+                         threading.Thread(target=self._DispatchLoop, name='StreamHub dispatcher')]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def Join(self, timeout=None):
+        """Wait until the stream has ended and all its messages have been
+        dispatched, for up to timeout seconds."""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def Stop(self, timeout=None):
+        """Stop the stream and close every subscription once the messages
+        already received have been dispatched.  Deliveries blocked on a
+        full subscription are abandoned."""
+        self._stream.Stop()
+        self._stopping = True
+        with self._intake.cond:
+            self._intake.closed = True
+            self._intake.cond.notify_all()
+        self.Join(timeout)
+        self._threads = []
+
+    def Stats(self):
+        """Return the statistics of the hub and of every subscription.
+
+        Returns:
+          A dict with the number of messages received, the intake lag
+          and drops, and a list of Subscription.Stats results.
+        """
+        with self._intake.cond:
+            intake_lag = len(self._intake.items)
+        return {'received': self.received,
+                'intake_lag': intake_lag,
+                'intake_dropped': self.intake_dropped,
+                'subscriptions': [s.Stats() for s in self._subscriptions]}
+
+    def _ReadLoop(self):
+        intake = self._intake
+        try:
+            for message in self._stream.Messages():
+                with intake.cond:
+                    if intake.Full():
+                        intake.items.popleft()
+                        self.intake_dropped += 1
+                    intake.items.append((self._clock(), message))
+                    self.received += 1
+                    intake.cond.notify_all()
+                if self._stopping:
+                    break
+        except Exception as e:
+            self.error = e
+        finally:
+            with intake.cond:
+                intake.closed = True
+                intake.cond.notify_all()
+
+    def _DispatchLoop(self):
+        intake = self._intake
+        while True:
+            with intake.cond:
+                while not intake.items and not intake.closed:
+                    intake.cond.wait()
+                if not intake.items:
+                    break
+                arrived, message = intake.items.popleft()
+            for subscription in self._subscriptions:
+                subscription._Put(arrived, message, self._Stopping)
+        for subscription in self._subscriptions:
+            subscription._Close(self.error)
+
+    def _Stopping(self):
+        return self._stopping
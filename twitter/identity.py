@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+import weakref
+
+from twitter import TwitterError
+from twitter.status import Status, _STATUS_FIELDS
+from twitter.user import User, _USER_FIELDS
+
+
+def _UserCounters(get):
+    return get('statuses_count') or 0
+
+
+def _StatusCounters(get):
+    return (get('retweet_count') or 0) + (get('favorite_count') or 0)
+
+
+class IdentityMap(object):
+    """Shares a single twitter.User or twitter.Status instance between all
+    copies of the same user or status.
+
+    A timeline of 200 tweets by one author carries 200 copies of the
+    author; parsed through an identity map they become one twitter.User.
+    The map only holds weak references, so its scope is whatever the
+    caller makes it: a map created per response deduplicates within that
+    response, a map kept for a session deduplicates across responses
+    without keeping objects alive that are no longer used elsewhere.
+
+    When a user or status is seen again, the policy decides which copy
+    the shared instance reflects:
+
+      'first':
+        The first copy is kept, and repeats are not parsed at all.
+      'last':
+        Every repeat overwrites the shared instance.
+      'freshest':
+        A repeat overwrites the shared instance if its counters are
+        higher: statuses_count for users, retweet_count plus
+        favorite_count for statuses.  Counters only grow, so the shared
+        instance ends up with the most recent copy whatever the order in
+        which copies arrive.
+
+    Lazily parsed statuses resolve their nested users when they are first
+    read, so for them the policy applies in the order of access.
+
+    Users in user_mentions only carry an id, a name and a screen name.
+    They are shared among themselves, but never with full users.
+
+    Example usage:
+
+      >>> api.SetIdentityMap(twitter.IdentityMap())
+      >>> statuses = api.GetHomeTimeline(count=200)
+    """
+
+    POLICIES = ('first', 'last', 'freshest')
+
+    def __init__(self, policy='freshest'):
+        """Instantiate a new twitter.IdentityMap object.
+
+        Args:
+          policy:
+            One of 'first', 'last' or 'freshest'. [Optional]
+        """
+        if policy not in self.POLICIES:
+            raise TwitterError({'message': "policy must be one of %s" % ', '.join(self.POLICIES)})
+        self._policy = policy
+        self._users = weakref.WeakValueDictionary()
+        self._statuses = weakref.WeakValueDictionary()
+        self._mentions = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._users) + len(self._statuses) + len(self._mentions)
+
+    def User(self, data, lazy=False, raw=None):
+        """Return the shared twitter.User for a JSON dict.
+
+        Args:
+          data:
+            A JSON dict, as converted from the JSON in the twitter API
+          lazy:
+            If True, a new user is built as a twitter.user.LazyUser.
+            [Optional]
+          raw:
+            The payload to keep for AsJsonString, see keep_json of
+            NewFromJsonDict.  It is only kept if the attributes of the
+            shared instance are taken from this copy. [Optional]
+        """
+        return self._Get(self._users, data, lazy, raw, User._FromJsonDict,
+                         _UserCounters, _USER_FIELDS)
+
+    def Status(self, data, lazy=False, raw=None):
+        """Return the shared twitter.Status for a JSON dict.
+
+        Args:
+          data:
+            A JSON dict, as converted from the JSON in the twitter API
+          lazy:
+            If True, a new status is built as a twitter.status.LazyStatus.
+            [Optional]
+          raw:
+            The payload to keep for AsJsonString, see keep_json of
+            NewFromJsonDict.  It is only kept if the attributes of the
+            shared instance are taken from this copy. [Optional]
+        """
+        return self._Get(self._statuses, data, lazy, raw, Status._FromJsonDict,
+                         _StatusCounters, _STATUS_FIELDS)
+
+    def Mention(self, data):
+        """Return the shared twitter.User for a user_mentions entity."""
+        key = data.get('id')
+        user = self._mentions.get(key) if key is not None else None
+        if user is None:
+            user = User._FromJsonDict(data)
+            if key is not None:
+                self._mentions[key] = user
+        return user
+
+    def Clear(self):
+        """Forget all users and statuses seen so far."""
+        self._users.clear()
+        self._statuses.clear()
+        self._mentions.clear()
+
+    def _Get(self, table, data, lazy, raw, build, counters, fields):
+        key = data.get('id')
+        shared = table.get(key) if key is not None else None
+        if shared is None:
+            shared = build(data, lazy, self)
+            if key is not None:
+                table[key] = shared
+        elif self._Replaces(data, shared, counters):
+            fresh = build(data, False, self)
+            for field in fields:
+                setattr(shared, field, getattr(fresh, field))
+        else:
+            return shared
+        shared._json = raw
+        return shared
+
+    def _Replaces(self, data, shared, counters):
+        # Whether a repeat of a shared instance overwrites its attributes.
+        if self._policy == 'freshest':
+            return counters(data.get) > counters(lambda field: getattr(shared, field))
+        return self._policy == 'last'
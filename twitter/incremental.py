@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+
+import codecs
+import json as _stdlib
+import re
+
+from twitter import json
+
+_DECODER = _stdlib.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+
+
+class _Incomplete(Exception):
+    """Raised when a step needs more of the document than has arrived."""
+
+
+class _Buffer(object):
+    """The part of a document that has arrived but was not consumed yet."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = u''
+        self.pos = 0
+        self.eof = False
+        self._record = None
+        self._mark = 0
+
+    def Fill(self):
+        """Read the next chunk, dropping the consumed text.
+
+        Returns:
+          False once the document is complete.
+        """
+        if self._record is not None:
+            self._record.append(self.text[self._mark:self.pos])
+            self._mark = 0
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            self.text += self._decoder.decode(chunk)
+            return True
+        self.text += self._decoder.decode(b'', True)
+        self.eof = True
+        return False
+
+    def Step(self, step):
+        """Run step until enough of the document has arrived for it."""
+        while True:
+            start = self.pos
+            try:
+                return step()
+            except _Incomplete:
+                self.pos = start
+                if self.eof:
+                    raise ValueError("Truncated JSON document")
+                # Read at least as much again as is pending, so that a
+                # value spanning many small chunks is not reparsed for
+                # every one of them.
+                pending = len(self.text) - start
+                while self.Fill() and len(self.text) < 2 * pending:
+                    pass
+
+    def Peek(self):
+        self.pos = _WHITESPACE.match(self.text, self.pos).end()
+        if self.pos == len(self.text):
+            raise _Incomplete()
+        return self.text[self.pos]
+
+    def Next(self):
+        char = self.Peek()
+        self.pos += 1
+        return char
+
+    def Value(self):
+        self.Peek()
+        try:
+            value, end = _DECODER.raw_decode(self.text, self.pos)
+        except ValueError:
+            if self.eof:
+                raise
+            raise _Incomplete()
+        if end == len(self.text) and not self.eof:
+            # A number or literal may continue in the next chunk.
+            raise _Incomplete()
+        self.pos = end
+        return value
+
+    def StartRecording(self, prefix=u''):
+        self._record = [prefix]
+        self._mark = self.pos
+
+    def StopRecording(self):
+        self._record.append(self.text[self._mark:self.pos])
+        text = u''.join(self._record)
+        self._record = None
+        return text
+
+    def Rest(self):
+        while self.Fill():
+            pass
+        return self.text
+
+
+class JsonArrayReader(object):
+    """Parses the elements of a JSON array while the document is still
+    arriving.
+
+    The reader parses the elements of one array as the chunks of a
+    response come in: the document itself, or the member named key of a
+    top-level object, such as 'statuses' or 'users'.  Each element is
+    yielded as soon as it is complete, so only the element being read is
+    held in memory besides the rest of the document.
+
+    Everything outside the array is available as remainder once the
+    document is complete, e.g. the next_cursor of a page of followers.
+    The array itself is left empty in the remainder.  A document of any
+    other shape, such as an error response, yields no elements and ends
+    up in the remainder as a whole.
+
+    Example usage:
+
+      >>> reader = JsonArrayReader(resp.iter_content(8192), key='users',
+      ...                          factory=twitter.User.NewFromJsonDict)
+      >>> for user in reader:
+      ...     handle(user)
+      >>> cursor = reader.remainder['next_cursor']
+    """
+
+    def __init__(self, chunks, key=None, factory=None, parse_remainder=None):
+        """Instantiate a new twitter.incremental.JsonArrayReader object.
+
+        Args:
+          chunks:
+            An iterable of bytes making up a UTF-8 encoded document.
+          key:
+            The name of the top-level member holding the array. If None,
+            the document must be an array. [Optional]
+          factory:
+            A callable applied to every element, e.g.
+            twitter.Status.NewFromJsonDict. [Optional]
+          parse_remainder:
+            A callable parsing the text of the remainder. Defaults to
+            twitter.json.loads. [Optional]
+        """
+        self._chunks = chunks
+        self._key = key
+        self._factory = factory
+        self._parse_remainder = parse_remainder or json.loads
+        self._started = False
+        self.remainder = None
+
+    def __iter__(self):
+        if self._started:
+            raise ValueError("A JsonArrayReader can only be iterated once")
+        self._started = True
+        return self._Parse()
+
+    def _Parse(self):
+        buf = _Buffer(self._chunks)
+        buf.StartRecording()
+        try:
+            first = buf.Step(buf.Peek)
+        except ValueError:
+            first = None
+
+        if self._key is None and first == u'[':
+            buf.pos += 1
+            buf.StopRecording()
+            for item in self._Array(buf):
+                yield item
+            self.remainder = []
+        elif self._key is not None and first == u'{':
+            found = False
+            buf.pos += 1
+            if buf.Step(buf.Peek) == u'}':
+                buf.pos += 1
+            else:
+                while True:
+                    name = buf.Step(buf.Value)
+                    if buf.Step(buf.Next) != u':':
+                        raise ValueError("Expected ':' after %r" % name)
+                    if name == self._key and not found and buf.Step(buf.Peek) == u'[':
+                        found = True
+                        buf.pos += 1
+                        prefix = buf.StopRecording()
+                        for item in self._Array(buf):
+                            yield item
+                        buf.StartRecording(prefix + u']')
+                    else:
+                        buf.Step(buf.Value)
+                    char = buf.Step(buf.Next)
+                    if char == u'}':
+                        break
+                    if char != u',':
+                        raise ValueError("Expected ',' or '}'")
+            self.remainder = self._parse_remainder(buf.StopRecording() + buf.Rest())
+        else:
+            buf.StopRecording()
+            self.remainder = self._parse_remainder(buf.Rest())
+
+    def _Array(self, buf):
+        # Called after the opening bracket; consumes the closing one.
+        if buf.Step(buf.Peek) == u']':
+            buf.pos += 1
+            return
+        while True:
+            item = buf.Step(buf.Value)
+            if self._factory is not None:
+                item = self._factory(item)
+            yield item
+            char = buf.Step(buf.Next)
+            if char == u']':
+                return
+            if char != u',':
+                raise ValueError("Expected ',' or ']'")
@@ -1,6 +1,30 @@
 #!/usr/bin/env python
 
 from twitter import json, User
+from twitter._schema import Field, Schema, NOT_NONE
+
+
+def _ParseUser(data, lazy=False, identity_map=None):
+    if 'user' in data:
+        return User.NewFromJsonDict(data['user'])
+    return None
+
+
+_LIST_SCHEMA = Schema('List', [
+    Field('id'),
+    Field('name'),
+    Field('slug'),
+    Field('description'),
+    Field('full_name'),
+    Field('mode'),
+    Field('uri'),
+    Field('member_count', dump_if=NOT_NONE),
+    Field('subscriber_count', dump_if=NOT_NONE),
+    Field('following', dump_if=NOT_NONE),
+    Field('user', parse=_ParseUser, dump_if=NOT_NONE, dump='{0}.AsDict()',
+          nested=lambda: User),
+    Field('_json', key=None, dump=None, compare=False),
+])
 
 
 class List(object):
@@ -20,22 +44,9 @@ class List(object):
       list.following
     """
 
-    def __init__(self, **kwargs):
-        param_defaults = {
-            'id': None,
-            'name': None,
-            'slug': None,
-            'description': None,
-            'full_name': None,
-            'mode': None,
-            'uri': None,
-            'member_count': None,
-            'subscriber_count': None,
-            'following': None,
-            'user': None}
-
-        for (param, default) in param_defaults.items():
-            setattr(self, param, kwargs.get(param, default))
+    _SCHEMA = _LIST_SCHEMA
+
+    __init__ = _LIST_SCHEMA.Init()
 
     @property
     def Id(self):
@@ -139,23 +150,11 @@ class List(object):
     def __ne__(self, other):
         return not self.__eq__(other)
 
-    def __eq__(self, other):
-        try:
-            return other and \
-                   self.id == other.id and \
-                   self.name == other.name and \
-                   self.slug == other.slug and \
-                   self.description == other.description and \
-                   self.full_name == other.full_name and \
-                   self.mode == other.mode and \
-                   self.uri == other.uri and \
-                   self.member_count == other.member_count and \
-                   self.subscriber_count == other.subscriber_count and \
-                   self.following == other.following and \
-                   self.user == other.user
-
-        except AttributeError:
-            return False
+    __eq__ = _LIST_SCHEMA.Eq()
+
+    __reduce__ = _LIST_SCHEMA.Reduce(lambda: List)
+
+    __setstate__ = _LIST_SCHEMA.SetState()
 
     def __str__(self):
         """A string representation of this twitter.List instance.
@@ -167,70 +166,43 @@ class List(object):
         """
         return self.AsJsonString()
 
-    def AsJsonString(self):
+    def AsJsonString(self, sort_keys=True):
         """A JSON string representation of this twitter.List instance.
+        Set sort_keys=False for faster output in no particular key order.
 
         Returns:
-          A JSON string representation of this twitter.List instance
+          A JSON string representation of this twitter.List instance, or
+          the original payload if it was created with keep_json.
        """
-        return json.dumps(self.AsDict(), sort_keys=True)
-
-    def AsDict(self):
-        """A dict representation of this twitter.List instance.
+        if self._json is not None:
+            return json.dumps_raw(self._json)
+        return json.dumps(self.AsDict(), sort_keys=sort_keys)
 
-        The return value uses the same key names as the JSON representation.
-
-        Return:
-          A dict representing this twitter.List instance
-        """
-        data = {}
-        if self.id:
-            data['id'] = self.id
-        if self.name:
-            data['name'] = self.name
-        if self.slug:
-            data['slug'] = self.slug
-        if self.description:
-            data['description'] = self.description
-        if self.full_name:
-            data['full_name'] = self.full_name
-        if self.mode:
-            data['mode'] = self.mode
-        if self.uri:
-            data['uri'] = self.uri
-        if self.member_count is not None:
-            data['member_count'] = self.member_count
-        if self.subscriber_count is not None:
-            data['subscriber_count'] = self.subscriber_count
-        if self.following is not None:
-            data['following'] = self.following
-        if self.user is not None:
-            data['user'] = self.user.AsDict()
-        return data
+    AsDict = _LIST_SCHEMA.AsDict()
 
     @staticmethod
-    def NewFromJsonDict(data):
+    def NewFromJsonDict(data, fields=None, keep_json=False):
         """Create a new instance based on a JSON dict.
 
         Args:
           data:
             A JSON dict, as converted from the JSON in the twitter API
+          fields:
+            A projection such as ('id', 'slug', 'user.id'), see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, keep data for AsJsonString, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A twitter.List instance
         """
-        if 'user' in data:
-            user = User.NewFromJsonDict(data['user'])
+        if fields is not None:
+            obj = _LIST_SCHEMA.Projector(fields)(List, data)
         else:
-            user = None
-        return List(id=data.get('id', None),
-                    name=data.get('name', None),
-                    slug=data.get('slug', None),
-                    description=data.get('description', None),
-                    full_name=data.get('full_name', None),
-                    mode=data.get('mode', None),
-                    uri=data.get('uri', None),
-                    member_count=data.get('member_count', None),
-                    subscriber_count=data.get('subscriber_count', None),
-                    following=data.get('following', None),
-                    user=user)
+            obj = List._Build(data)
+        if keep_json:
+            obj._json = data
+        return obj
+
+    _Build = _LIST_SCHEMA.Builder()
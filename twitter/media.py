@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 import json
 
+from twitter._schema import New
+
 
 class Media(object):
 
@@ -16,6 +18,17 @@ class Media(object):
       media.type
     """
 
+    __slots__ = (
+        'id',
+        'expanded_url',
+        'display_url',
+        'url',
+        'media_url_https',
+        'media_url',
+        'type',
+        'variants',
+    )
+
     def __init__(self, **kwargs):
         """An object to the information for each Media entity for a tweet
         This class is normally instantiated by the twitter.Api class and
@@ -72,6 +85,13 @@ class Media(object):
     def __hash__(self):
         return hash((self.Media_url, self.Type))
 
+    def __reduce__(self):
+        return New, (Media,), tuple(getattr(self, name) for name in Media.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(Media.__slots__, state):
+            setattr(self, name, value)
+
     def __str__(self):
         """A string representation of this twitter.Media instance.
 
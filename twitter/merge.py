@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+import heapq
+
+
+def _OriginalId(status):
+    retweeted_status = getattr(status, 'retweeted_status', None)
+    if retweeted_status is not None:
+        return retweeted_status.id
+    return status.id
+
+
+def MergeTimelines(sources, dedup=True, max_results=None):
+    """Lazily merge timelines into a single timeline ordered by id.
+
+    Each source only has to be ordered newest first; statuses are pulled
+    from a source when they are about to be yielded, so memory use grows
+    with the number of sources rather than with the length of the merged
+    timeline.
+
+    Example usage:
+
+      >>> from functools import partial
+      >>> from twitter.backfill import WalkTimeline
+      >>> sources = [WalkTimeline(partial(api.GetUserTimeline, screen_name=name, count=200))
+      ...            for name in screen_names]
+      >>> for status in twitter.MergeTimelines(sources, max_results=500):
+      ...     render(status)
+
+    Args:
+      sources:
+        A sequence of iterables of twitter.Status instances, each in
+        descending id order, e.g. user, list or search timelines.
+      dedup:
+        If True, a status that was already yielded is skipped, as is a
+        retweet of a status that was already yielded as an original or
+        as another retweet. [Optional]
+      max_results:
+        The maximum number of statuses to yield. [Optional]
+
+    Returns:
+      A generator of twitter.Status instances in descending id order.
+    """
+    heap = []
+    for index, source in enumerate(sources):
+        iterator = iter(source)
+        for status in iterator:
+            heap.append((-status.id, index, status, iterator))
+            break
+    heapq.heapify(heap)
+
+    seen = set()
+    yielded = 0
+    while heap and (max_results is None or yielded < max_results):
+        _, index, status, iterator = heap[0]
+        for following in iterator:
+            heapq.heapreplace(heap, (-following.id, index, following, iterator))
+            break
+        else:
+            heapq.heappop(heap)
+
+        if dedup:
+            original_id = _OriginalId(status)
+            if status.id in seen or original_id in seen:
+                continue
+            seen.add(status.id)
+            seen.add(original_id)
+        yielded += 1
+        yield status
@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+
+import re
+
+from twitter import json, Status, TwitterError, User
+from twitter._schema import Field, Schema, NOT_NONE
+
+STATUS = 'status'
+DELETE = 'delete'
+LIMIT = 'limit'
+WARNING = 'warning'
+DISCONNECT = 'disconnect'
+FRIENDS = 'friends'
+EVENT = 'event'
+OTHER = 'other'
+KINDS = (STATUS, DELETE, LIMIT, WARNING, DISCONNECT, FRIENDS, EVENT, OTHER)
+
+# Error responses, which raise a TwitterError when decoded.
+ERROR = 'error'
+
+# Rare messages that are decoded whether or not a handler was registered
+# for them: errors, and the messages a twitter.StreamConsumer reacts to.
+CONTROL_KINDS = frozenset([ERROR, WARNING, DISCONNECT])
+
+# Every message but statuses and events is an object with a single member
+# naming its type.
+_ENVELOPES = {
+    b'delete': DELETE,
+    b'limit': LIMIT,
+    b'warning': WARNING,
+    b'disconnect': DISCONNECT,
+    b'friends': FRIENDS,
+    b'friends_str': FRIENDS,
+    b'event': EVENT,
+    b'scrub_geo': OTHER,
+    b'status_withheld': OTHER,
+    b'user_withheld': OTHER,
+    b'direct_message': OTHER,
+    b'control': OTHER,
+    b'for_user': OTHER,
+    b'error': ERROR,
+    b'errors': ERROR,
+}
+
+_FIRST_KEY = re.compile(br'\s*\{\s*"(\w+)"')
+
+# Inside JSON strings quotes are escaped, so these bytes only occur as the
+# key of an event.
+_EVENT_KEY = b'"event":'
+
+
+def Classify(frame):
+    """Return the kind of a stream message from its bytes, without decoding
+    it.
+
+    The first key of the object names the type of every message but
+    statuses and events; events are told apart from statuses by their
+    event key.  Anything else, including an undecodable message, is
+    classified as a status, so its errors surface when it is decoded.
+
+    Args:
+      frame:
+        A message of a stream as bytes, as yielded by
+        twitter.stream.ReadFrames.
+
+    Returns:
+      One of the KINDS, or 'error' for an error response.
+    """
+    match = _FIRST_KEY.match(frame)
+    if match is not None:
+        kind = _ENVELOPES.get(match.group(1))
+        if kind is not None:
+            return kind
+    if _EVENT_KEY in frame:
+        return EVENT
+    return STATUS
+
+
+def _Path(*keys):
+    def parse(data, lazy=False, identity_map=None):
+        for key in keys:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+        return data
+    return parse
+
+
+def _ParseUser(key):
+    def parse(data, lazy=False, identity_map=None):
+        if data.get(key) is None:
+            return None
+        return User.NewFromJsonDict(data[key])
+    return parse
+
+
+def _ParseFriends(data, lazy=False, identity_map=None):
+    return data.get('friends', data.get('friends_str'))
+
+
+class StreamMessage(object):
+    """The base class of the messages of a stream other than statuses.
+
+    Subclasses set KIND, the kind returned by Classify, and a schema.
+    """
+
+    KIND = None
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join(
+            '%s=%r' % item for item in sorted(self.AsDict().items())))
+
+    def AsJsonString(self, sort_keys=True):
+        """A JSON string representation of the fields of this message."""
+        return json.dumps(self.AsDict(), sort_keys=sort_keys)
+
+    @classmethod
+    def NewFromJsonDict(cls, data):
+        """Create a new instance based on a JSON dict.
+
+        Args:
+          data: A JSON dict, as converted from the JSON in the twitter API
+        Returns:
+          An instance of the class
+        """
+        return cls._Build(data)
+
+
+_DELETION_SCHEMA = Schema('StatusDeletion', [
+    Field('id', parse=_Path('delete', 'status', 'id')),
+    Field('user_id', parse=_Path('delete', 'status', 'user_id')),
+    Field('timestamp_ms', parse=_Path('delete', 'timestamp_ms'), dump_if=NOT_NONE),
+])
+
+
+class StatusDeletion(StreamMessage):
+    """A notice that a status was deleted, which should be removed from
+    anything kept of the stream.
+
+      deletion.id
+      deletion.user_id
+      deletion.timestamp_ms
+    """
+
+    KIND = DELETE
+    _SCHEMA = _DELETION_SCHEMA
+    __init__ = _DELETION_SCHEMA.Init()
+    _Build = _DELETION_SCHEMA.Builder()
+    AsDict = _DELETION_SCHEMA.AsDict()
+    __eq__ = _DELETION_SCHEMA.Eq()
+    __reduce__ = _DELETION_SCHEMA.Reduce(lambda: StatusDeletion)
+    __setstate__ = _DELETION_SCHEMA.SetState()
+
+
+_LIMIT_SCHEMA = Schema('LimitNotice', [
+    Field('track', parse=_Path('limit', 'track'), dump_if=NOT_NONE),
+    Field('timestamp_ms', parse=_Path('limit', 'timestamp_ms'), dump_if=NOT_NONE),
+])
+
+
+class LimitNotice(StreamMessage):
+    """A notice that a filtered stream matched more statuses than it may
+    deliver.
+
+      limit.track      The number of statuses withheld since connecting
+      limit.timestamp_ms
+    """
+
+    KIND = LIMIT
+    _SCHEMA = _LIMIT_SCHEMA
+    __init__ = _LIMIT_SCHEMA.Init()
+    _Build = _LIMIT_SCHEMA.Builder()
+    AsDict = _LIMIT_SCHEMA.AsDict()
+    __eq__ = _LIMIT_SCHEMA.Eq()
+    __reduce__ = _LIMIT_SCHEMA.Reduce(lambda: LimitNotice)
+    __setstate__ = _LIMIT_SCHEMA.SetState()
+
+
+_WARNING_SCHEMA = Schema('StallWarning', [
+    Field('code', parse=_Path('warning', 'code')),
+    Field('message', parse=_Path('warning', 'message')),
+    Field('percent_full', parse=_Path('warning', 'percent_full'), dump_if=NOT_NONE),
+])
+
+
+class StallWarning(StreamMessage):
+    """A warning that the client reads too slowly and will be disconnected.
+
+      warning.code
+      warning.message
+      warning.percent_full
+    """
+
+    KIND = WARNING
+    _SCHEMA = _WARNING_SCHEMA
+    __init__ = _WARNING_SCHEMA.Init()
+    _Build = _WARNING_SCHEMA.Builder()
+    AsDict = _WARNING_SCHEMA.AsDict()
+    __eq__ = _WARNING_SCHEMA.Eq()
+    __reduce__ = _WARNING_SCHEMA.Reduce(lambda: StallWarning)
+    __setstate__ = _WARNING_SCHEMA.SetState()
+
+
+_DISCONNECT_SCHEMA = Schema('DisconnectMessage', [
+    Field('code', parse=_Path('disconnect', 'code')),
+    Field('stream_name', parse=_Path('disconnect', 'stream_name')),
+    Field('reason', parse=_Path('disconnect', 'reason')),
+])
+
+
+class DisconnectMessage(StreamMessage):
+    """The reason Twitter is about to close the connection.
+
+      disconnect.code
+      disconnect.stream_name
+      disconnect.reason
+    """
+
+    KIND = DISCONNECT
+    _SCHEMA = _DISCONNECT_SCHEMA
+    __init__ = _DISCONNECT_SCHEMA.Init()
+    _Build = _DISCONNECT_SCHEMA.Builder()
+    AsDict = _DISCONNECT_SCHEMA.AsDict()
+    __eq__ = _DISCONNECT_SCHEMA.Eq()
+    __reduce__ = _DISCONNECT_SCHEMA.Reduce(lambda: DisconnectMessage)
+    __setstate__ = _DISCONNECT_SCHEMA.SetState()
+
+
+_FRIENDS_SCHEMA = Schema('FriendsList', [
+    Field('ids', parse=_ParseFriends),
+])
+
+
+class FriendsList(StreamMessage):
+    """The ids of the users followed, sent first on a user stream.
+
+      friends.ids      Integers, or strings if stringify_friend_ids was set
+    """
+
+    KIND = FRIENDS
+    _SCHEMA = _FRIENDS_SCHEMA
+    __init__ = _FRIENDS_SCHEMA.Init()
+    _Build = _FRIENDS_SCHEMA.Builder()
+    AsDict = _FRIENDS_SCHEMA.AsDict()
+    __eq__ = _FRIENDS_SCHEMA.Eq()
+    __reduce__ = _FRIENDS_SCHEMA.Reduce(lambda: FriendsList)
+    __setstate__ = _FRIENDS_SCHEMA.SetState()
+
+
+_EVENT_SCHEMA = Schema('StreamEvent', [
+    Field('event'),
+    Field('created_at'),
+    Field('source', parse=_ParseUser('source'), dump='{0}.AsDict()'),
+    Field('target', parse=_ParseUser('target'), dump='{0}.AsDict()'),
+    Field('target_object'),
+])
+
+
+class StreamEvent(StreamMessage):
+    """An action by or on the user of a user stream, such as a follow or a
+    favorite.
+
+      event.event          The name of the action, e.g. 'favorite'
+      event.created_at
+      event.source         The twitter.User acting
+      event.target         The twitter.User acted on
+      event.target_object  The JSON dict of the status or list acted on
+    """
+
+    KIND = EVENT
+    _SCHEMA = _EVENT_SCHEMA
+    __init__ = _EVENT_SCHEMA.Init()
+    _Build = _EVENT_SCHEMA.Builder()
+    AsDict = _EVENT_SCHEMA.AsDict()
+    __eq__ = _EVENT_SCHEMA.Eq()
+    __reduce__ = _EVENT_SCHEMA.Reduce(lambda: StreamEvent)
+    __setstate__ = _EVENT_SCHEMA.SetState()
+
+
+_MESSAGE_CLASSES = dict((cls.KIND, cls) for cls in (
+    StatusDeletion, LimitNotice, StallWarning, DisconnectMessage, FriendsList, StreamEvent))
+
+
+class StreamDispatcher(object):
+    """Calls the handlers registered for each kind of stream message.
+
+    Each message is classified from its first bytes (see Classify), and
+    only decoded if a handler was registered for its kind, so that a
+    dispatcher interested in deletions skips the statuses of a sample
+    stream without parsing them.  Stall warnings and disconnect messages
+    are always decoded, as a twitter.StreamConsumer reacts to them.
+
+    Statuses are passed as twitter.Status instances, messages that are
+    not statuses nor listed in KINDS (such as scrub_geo) as JSON dicts of
+    kind 'other', and all others as instances of the StreamMessage
+    subclasses of this module.
+
+    A dispatcher can be given as decoder to the stream methods of
+    twitter.Api and to twitter.StreamConsumer, which then yield the
+    decoded messages after calling their handlers.
+
+    Example usage:
+
+      >>> dispatcher = twitter.StreamDispatcher()
+      >>> dispatcher.Register('delete', lambda deletion: forget(deletion.id))
+      >>> for _ in api.GetStreamSample(decoder=dispatcher):
+      ...     pass
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self.decoded = dict((kind, 0) for kind in KINDS)
+        self.skipped = dict((kind, 0) for kind in KINDS)
+
+    def Register(self, kind, handler):
+        """Call handler with every message of a kind.
+
+        Args:
+          kind:
+            One of KINDS: 'status', 'delete', 'limit', 'warning',
+            'disconnect', 'friends', 'event' or 'other'.
+          handler:
+            A callable taking the message.
+        """
+        if kind not in KINDS:
+            raise TwitterError({'message': "Unknown message kind %r, use one of %s" %
+                                (kind, ', '.join(KINDS))})
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def Unregister(self, kind, handler):
+        """Stop calling a handler registered with Register."""
+        handlers = [h for h in self._handlers.get(kind, ()) if h != handler]
+        if handlers:
+            self._handlers[kind] = handlers
+        else:
+            self._handlers.pop(kind, None)
+
+    def Dispatch(self, frame, fields=None, keep_json=False):
+        """Decode one message and call its handlers, if it has any.
+
+        Args:
+          frame:
+            A message of a stream as bytes.
+          fields:
+            See twitter.Api.GetStreamSample. [Optional]
+          keep_json:
+            See twitter.Api.GetStreamSample. [Optional]
+
+        Returns:
+          The decoded message, or None if it was skipped.
+        """
+        kind = Classify(frame)
+        if kind not in self._handlers and kind not in CONTROL_KINDS:
+            self.skipped[kind] += 1
+            return None
+        message, kind = self._Decode(frame, kind, fields, keep_json)
+        self.decoded[kind] += 1
+        for handler in self._handlers.get(kind, ()):
+            handler(message)
+        return message
+
+    def Decode(self, frames, fields=None, keep_json=False):
+        """Dispatch the messages of a stream.
+
+        Args:
+          frames:
+            An iterable of the messages of a stream as bytes, as returned
+            by twitter.stream.ReadFrames.
+          fields:
+            See twitter.Api.GetStreamSample. [Optional]
+          keep_json:
+            See twitter.Api.GetStreamSample. [Optional]
+
+        Returns:
+          A generator of the messages that were not skipped, yielded once
+          their handlers have been called.
+        """
+        for frame in frames:
+            if frame:
+                message = self.Dispatch(frame, fields, keep_json)
+                if message is not None:
+                    yield message
+
+    def _Decode(self, frame, kind, fields, keep_json):
+        try:
+            data = json.loads(frame)
+        except ValueError:
+            raise TwitterError({'message': "json decoding"})
+        if 'error' in data:
+            raise TwitterError(data['error'])
+        if 'errors' in data:
+            raise TwitterError(data['errors'])
+        if kind == STATUS:
+            if 'id' not in data or 'text' not in data:
+                return data, OTHER
+            status = Status.NewFromJsonDict(data, fields=fields)
+            if keep_json:
+                status._json = frame
+            return status, STATUS
+        cls = _MESSAGE_CLASSES.get(kind)
+        if cls is None:
+            return data, kind
+        return cls.NewFromJsonDict(data), kind
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+
+import collections
+import multiprocessing
+import pickle
+import sys
+import threading
+import time
+
+from twitter import TwitterError
+
+# The Api instance decoding messages in a worker process, see _DecodeBatch.
+_worker_api = None
+
+
+def _DecodeBatch(frames, fields, keep_json):
+    """Decode a batch of stream messages in a worker process.
+
+    Returns:
+      A tuple of the decoded messages and of the error raised by the
+      first message that could not be decoded, or None.  The error is
+      returned rather than raised so the results of a batch always reach
+      the callback of the pool, and replaced by a TwitterError if it
+      cannot be pickled.
+    """
+    global _worker_api
+    if _worker_api is None:
+        from twitter.api import Api
+        _worker_api = Api()
+    messages = []
+    try:
+        for frame in frames:
+            messages.append(_worker_api._StreamMessage(frame, fields, keep_json))
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception:
+            e = TwitterError({'message': "Could not decode a stream message: %r" % e})
+        return messages, e
+    return messages, None
+
+
+class _Feed(object):
+    """Reads the frames of a stream in a thread into a bounded buffer."""
+
+    def __init__(self, frames, capacity, clock):
+        self.items = collections.deque()
+        self.cond = threading.Condition()
+        self.capacity = capacity
+        self.since = None
+        self.done = False
+        self.error = None
+        self._clock = clock
+        self._stopped = False
+        self._thread = threading.Thread(target=self._Run, args=(frames,),
+                                        name='DecodePipeline reader')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _Run(self, frames):
+        try:
+            for frame in frames:
+                if not frame:
+                    continue
+                with self.cond:
+                    while len(self.items) >= self.capacity and not self._stopped:
+                        self.cond.wait()
+                    if self._stopped:
+                        return
+                    if not self.items:
+                        self.since = self._clock()
+                    self.items.append(frame)
+                    self.cond.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.cond:
+                self.done = True
+                self.cond.notify_all()
+
+    def Take(self, count):
+        # Called with the condition held.
+        batch = [self.items.popleft() for _ in range(min(count, len(self.items)))]
+        self.since = self._clock() if self.items else None
+        self.cond.notify_all()
+        return batch
+
+    def Finish(self, batch, result):
+        # Called by the result thread of the pool.
+        with self.cond:
+            batch.result = result
+            self.cond.notify_all()
+
+    def Stop(self):
+        with self.cond:
+            self._stopped = True
+            self.cond.notify_all()
+
+
+class _Batch(object):
+    """A batch of frames sent to the pool, and its result once decoded."""
+
+    __slots__ = ('result',)
+
+    def __init__(self):
+        self.result = None
+
+
+class DecodePipeline(object):
+    """Decodes the messages of a stream in a pool of processes.
+
+    Decoding JSON and building statuses takes a full CPU well below the
+    rates of the firehose.  With a pipeline, a reader thread only splits
+    the stream into messages; batches of them are decoded in worker
+    processes and the results, statuses included, come back pickled in
+    the compact form of the models.  Unpickling a status still costs the
+    consuming thread about half as much as building it, so a pipeline
+    pays off for statuses rather than plain dicts, and only with CPUs to
+    spare.
+
+    A batch is sent to the pool once it holds batch_size messages or its
+    oldest message has waited max_delay seconds, so quiet streams are not
+    delayed.  Messages are yielded in the order they arrived unless
+    ordered is False, in which case batches are yielded as they finish;
+    the messages of a batch always keep their order.
+
+    The worker processes are started by the first Decode and run until
+    the pipeline is closed, so a pipeline is best used in a with
+    statement.
+
+    Example usage:
+
+      >>> with twitter.DecodePipeline(processes=4) as pipeline:
+      ...     for status in api.GetStreamSample(keep_json=True, decoder=pipeline):
+      ...         handle(status)
+    """
+
+    def __init__(self,
+                 processes=None,
+                 batch_size=200,
+                 max_delay=0.05,
+                 ordered=True,
+                 backlog=100000,
+                 clock=time.time):
+        """Instantiate a new twitter.DecodePipeline object.
+
+        Args:
+          processes:
+            The number of worker processes. Defaults to the number of
+            CPUs. [Optional]
+          batch_size:
+            The largest number of messages sent to a worker at a time.
+            [Optional]
+          max_delay:
+            The number of seconds a message waits for its batch to fill
+            up. [Optional]
+          ordered:
+            If False, messages are yielded as soon as their batch is
+            decoded rather than in the order they arrived. [Optional]
+          backlog:
+            The number of messages buffered before the reader thread
+            waits for the workers. [Optional]
+          clock:
+            A callable returning the current time in seconds. [Optional]
+        """
+        if processes is not None and processes <= 0:
+            raise TwitterError({'message': "processes must be positive"})
+        if batch_size <= 0:
+            raise TwitterError({'message': "batch_size must be positive"})
+        if backlog <= 0:
+            raise TwitterError({'message': "backlog must be positive"})
+        self.processes = processes or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.ordered = ordered
+        self.backlog = backlog
+        self._clock = clock
+        self._pool = None
+        # Batches in flight beyond this many wait, so the backlog rather
+        # than the queue of the pool absorbs a burst.
+        self._max_pending = 2 * self.processes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def Close(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def Decode(self, frames, fields=None, keep_json=False):
+        """Decode the messages of a stream.
+
+        Args:
+          frames:
+            An iterable of the messages of a stream as bytes, as returned
+            by twitter.stream.ReadFrames.  It is consumed in a thread.
+          fields:
+            See twitter.Api.GetStreamSample. [Optional]
+          keep_json:
+            See twitter.Api.GetStreamSample. [Optional]
+
+        Returns:
+          A generator of the messages, as yielded by
+          twitter.Api.GetStreamSample.  An error raised while reading the
+          frames or decoding a message is raised once the messages before
+          it have been yielded.
+        """
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes)
+        pool = self._pool
+        feed = _Feed(frames, self.backlog, self._clock)
+        pending = collections.deque()
+        try:
+            while True:
+                with feed.cond:
+                    batch = self._Wait(feed, pending)
+                if batch:
+                    pending.append(self._Submit(pool, feed, batch, fields, keep_json))
+                with feed.cond:
+                    finished = self._Finished(pending)
+                for messages, error in finished:
+                    for message in messages:
+                        yield message
+                    if error is not None:
+                        raise error
+                if feed.done and not feed.items and not pending:
+                    break
+            if feed.error is not None:
+                raise feed.error
+        finally:
+            feed.Stop()
+
+    def _Submit(self, pool, feed, frames, fields, keep_json):
+        batch = _Batch()
+        kwargs = {}
+        if sys.version_info[0] >= 3:
+            # A result that cannot be pickled, for instance, would
+            # otherwise never reach the callback.
+            kwargs['error_callback'] = lambda e: feed.Finish(batch, ([], e))
+        pool.apply_async(_DecodeBatch, (frames, fields, keep_json),
+                         callback=lambda result: feed.Finish(batch, result), **kwargs)
+        return batch
+
+    def _Wait(self, feed, pending):
+        # Called with the condition of the feed held.  Waits until a batch
+        # has finished, or returns the next batch to send once it is due.
+        while True:
+            if self._Finished(pending, peek=True):
+                return None
+            if feed.items and len(pending) < self._max_pending:
+                wait = feed.since + self.max_delay - self._clock()
+                if len(feed.items) >= self.batch_size or feed.done or wait <= 0:
+                    return feed.Take(self.batch_size)
+            else:
+                wait = None
+            if feed.done and not feed.items and not pending:
+                return None
+            feed.cond.wait(wait)
+
+    def _Finished(self, pending, peek=False):
+        # Called with the condition of the feed held.  Removes and returns
+        # the results of the batches that can be yielded.
+        if self.ordered:
+            finished = []
+            while pending and pending[0].result is not None:
+                if peek:
+                    return True
+                finished.append(pending.popleft().result)
+            return finished
+        done = [batch for batch in pending if batch.result is not None]
+        if peek:
+            return bool(done)
+        for batch in done:
+            pending.remove(batch)
+        return [batch.result for batch in done]
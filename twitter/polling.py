@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+
+from __future__ import division
+
+import heapq
+import time
+
+from twitter import TwitterError
+
+
+class _PollSource(object):
+    """Scheduling state for a single polled timeline."""
+
+    def __init__(self, key, method, parameters, since_id=None):
+        self.key = key
+        self.method = method
+        self.parameters = parameters
+        self.since_id = since_id
+        self.max_id = None
+        self.newest_id = None
+        self.rate = None
+        self.last_poll = None
+        self.next_poll = None
+        self.interval = None
+
+
+class AdaptivePoller(object):
+    """Polls many user and list timelines, spacing the polls of each source
+    according to how often that source posts.
+
+    Every source keeps an estimate of its posting rate (tweets per second),
+    smoothed over successive polls.  A source is polled again once it is
+    expected to have produced ``tweets_per_poll`` new tweets, clamped to
+    [min_interval, max_interval], so busy accounts are polled often and
+    dormant accounts rarely.  If the combined polling rate of all sources
+    exceeds the request budget, every interval is stretched by the same
+    factor so the budget is never exceeded.
+
+    Each poll passes the newest id seen so far as since_id, so a poll of a
+    quiet source returns an empty page and costs a single request.
+
+    Example usage:
+
+      >>> poller = twitter.AdaptivePoller(api)
+      >>> poller.AddUser(screen_name='twitterapi')
+      >>> poller.AddList(list_id=1234)
+      >>> for key, statuses in poller.Run():
+      ...     handle(statuses)
+    """
+
+    def __init__(self,
+                 api,
+                 requests_per_window=900,
+                 window=15 * 60,
+                 min_interval=60,
+                 max_interval=6 * 60 * 60,
+                 tweets_per_poll=5,
+                 smoothing=0.3,
+                 count=200,
+                 max_pages=5,
+                 clock=time.time,
+                 sleep=time.sleep):
+        """Instantiate a new twitter.AdaptivePoller object.
+
+        Args:
+          api:
+            The twitter.Api instance used to make requests.
+          requests_per_window:
+            The number of requests the poller may make per window.
+            Defaults to 900, the user_timeline rate limit. [Optional]
+          window:
+            Length of the rate limit window in seconds. [Optional]
+          min_interval:
+            The shortest time, in seconds, between two polls of one
+            source. [Optional]
+          max_interval:
+            The longest time, in seconds, between two polls of one
+            source. [Optional]
+          tweets_per_poll:
+            The number of new tweets a source is expected to have
+            produced when it is polled. [Optional]
+          smoothing:
+            Weight, between 0 and 1, of the newest observation in the
+            posting rate estimate. [Optional]
+          count:
+            Number of statuses to request per page. May not be greater
+            than 200. [Optional]
+          max_pages:
+            The maximum number of pages fetched by one poll when a
+            source has posted more than count tweets since the last poll.
+            [Optional]
+          clock:
+            A callable returning the current time in seconds. [Optional]
+          sleep:
+            A callable used to wait until the next poll is due. [Optional]
+        """
+        if requests_per_window <= 0 or window <= 0:
+            raise TwitterError({'message': "requests_per_window and window must be positive"})
+        if min_interval > max_interval:
+            raise TwitterError({'message': "min_interval may not be greater than max_interval"})
+        if not 0 < smoothing <= 1:
+            raise TwitterError({'message': "smoothing must be between 0 and 1"})
+
+        self._api = api
+        self._budget = requests_per_window / window
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._tweets_per_poll = tweets_per_poll
+        self._smoothing = smoothing
+        self._count = min(int(count), 200)
+        self._max_pages = max_pages
+        self._clock = clock
+        self._sleep = sleep
+
+        self._sources = {}
+        self._queue = []
+        self._sequence = 0
+        self._demand = 0.0
+        self._next_request = None
+        self.requests = 0
+
+    def AddUser(self, user_id=None, screen_name=None, since_id=None, **kwargs):
+        """Start polling the timeline of a user.
+
+        Args:
+          user_id:
+            The id of the user to poll. [Optional]
+          screen_name:
+            The screen name of the user to poll. [Optional]
+          since_id:
+            Only statuses newer than this id are returned by the first
+            poll. [Optional]
+          kwargs:
+            Any further arguments for Api.GetUserTimeline, e.g.
+            include_rts or trim_user. [Optional]
+
+        Returns:
+          The key identifying this source in the results of Poll.
+        """
+        if user_id is None and screen_name is None:
+            raise TwitterError({'message': "Specify at least one of user_id or screen_name."})
+        key = ('user', user_id or screen_name)
+        kwargs.update(user_id=user_id, screen_name=screen_name)
+        self._AddSource(key, self._api.GetUserTimeline, kwargs, since_id)
+        return key
+
+    def AddList(self,
+                list_id=None,
+                slug=None,
+                owner_id=None,
+                owner_screen_name=None,
+                since_id=None,
+                **kwargs):
+        """Start polling the timeline of a list.
+
+        Args:
+          list_id:
+            The id of the list to poll. [Optional]
+          slug:
+            The slug of the list to poll. Requires owner_id or
+            owner_screen_name. [Optional]
+          owner_id:
+            The id of the user owning the list. [Optional]
+          owner_screen_name:
+            The screen name of the user owning the list. [Optional]
+          since_id:
+            Only statuses newer than this id are returned by the first
+            poll. [Optional]
+          kwargs:
+            Any further arguments for Api.GetListTimeline. [Optional]
+
+        Returns:
+          The key identifying this source in the results of Poll.
+        """
+        if list_id is None and slug is None:
+            raise TwitterError({'message': "Specify at least one of list_id or slug."})
+        key = ('list', list_id or (owner_id or owner_screen_name, slug))
+        kwargs.update(list_id=list_id,
+                      slug=slug,
+                      owner_id=owner_id,
+                      owner_screen_name=owner_screen_name)
+        self._AddSource(key, self._api.GetListTimeline, kwargs, since_id)
+        return key
+
+    def Remove(self, key):
+        """Stop polling a source.
+
+        Args:
+          key:
+            The key returned by AddUser or AddList.
+        """
+        source = self._sources.pop(key)
+        if source.interval is not None:
+            self._demand -= 1 / self._DesiredInterval(source)
+
+    def GetSinceId(self, key):
+        """Return the id up to which all statuses of a source were returned."""
+        return self._sources[key].since_id
+
+    def GetRate(self, key):
+        """Return the estimated posting rate of a source in tweets per
+        second, or None if the source has not been polled yet."""
+        return self._sources[key].rate
+
+    def GetInterval(self, key):
+        """Return the current time in seconds between polls of a source."""
+        return self._sources[key].interval
+
+    def NextPollTime(self):
+        """Return the time at which the next poll is due, or None if there
+        are no sources."""
+        self._DropStaleEntries()
+        if not self._queue:
+            return None
+        due = self._queue[0][0]
+        if self._next_request is not None:
+            due = max(due, self._next_request)
+        return due
+
+    def Poll(self):
+        """Wait until the next poll is due and perform it.
+
+        Returns:
+          A tuple of (key, statuses), where statuses are the new
+          twitter.Status instances of the polled source, newest first.
+          Returns None if there are no sources.
+        """
+        due = self.NextPollTime()
+        if due is None:
+            return None
+        now = self._clock()
+        if due > now:
+            self._sleep(due - now)
+
+        _, _, key = heapq.heappop(self._queue)
+        source = self._sources[key]
+        try:
+            statuses = self._Fetch(source)
+        except Exception:
+            self._Reschedule(source, self._clock(), None)
+            raise
+        self._Reschedule(source, self._clock(), statuses)
+        return key, statuses
+
+    def Run(self, max_polls=None):
+        """Poll the sources forever, or until max_polls polls were made.
+
+        Args:
+          max_polls:
+            Number of polls after which to stop. [Optional]
+
+        Returns:
+          A generator of (key, statuses) tuples, see Poll.
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            result = self.Poll()
+            if result is None:
+                return
+            polls += 1
+            yield result
+
+    def _AddSource(self, key, method, parameters, since_id):
+        if key in self._sources:
+            raise TwitterError({'message': "Source %r is already polled." % (key,)})
+        source = _PollSource(key, method, parameters, since_id)
+        self._sources[key] = source
+        self._Push(source, self._clock())
+
+    def _Push(self, source, when):
+        source.next_poll = when
+        self._sequence += 1
+        heapq.heappush(self._queue, (when, self._sequence, source.key))
+
+    def _DropStaleEntries(self):
+        while self._queue:
+            when, _, key = self._queue[0]
+            source = self._sources.get(key)
+            if source is not None and source.next_poll == when:
+                return
+            heapq.heappop(self._queue)
+
+    def _DesiredInterval(self, source):
+        if not source.rate:
+            return self._max_interval
+        interval = self._tweets_per_poll / source.rate
+        return min(max(interval, self._min_interval), self._max_interval)
+
+    @staticmethod
+    def _InitialRate(statuses, now):
+        created = [s.CreatedAtInSeconds for s in statuses if s.created_at]
+        if not created:
+            return 0.0
+        return len(statuses) / max(now - min(created), 1.0)
+
+    def _Fetch(self, source):
+        # Walks down from max_id (or the newest status) to since_id.  If the
+        # walk is cut short by max_pages, since_id stays put and the next
+        # poll resumes the walk from the remembered max_id, so the gap is
+        # closed before newer statuses are fetched.
+        statuses = []
+        max_id = source.max_id
+        newest_id = source.newest_id
+        complete = True
+        for _ in range(self._max_pages):
+            self.requests += 1
+            page = source.method(since_id=source.since_id,
+                                 max_id=max_id,
+                                 count=self._count,
+                                 **source.parameters)
+            self._next_request = self._clock() + 1 / self._budget
+            statuses.extend(page)
+            if page:
+                newest_id = max(newest_id or 0, page[0].id)
+            if len(page) < self._count or source.since_id is None:
+                break
+            max_id = page[-1].id - 1
+        else:
+            complete = False
+
+        if complete:
+            if newest_id is not None:
+                source.since_id = max(source.since_id or 0, newest_id)
+            source.max_id = None
+            source.newest_id = None
+        else:
+            source.max_id = max_id
+            source.newest_id = newest_id
+        return statuses
+
+    def _Reschedule(self, source, now, statuses):
+        if source.interval is not None:
+            self._demand -= 1 / self._DesiredInterval(source)
+
+        if statuses is not None:
+            if source.last_poll is None:
+                # Seed the estimate from the timestamps of the first page.
+                source.rate = self._InitialRate(statuses, now)
+            else:
+                elapsed = max(now - source.last_poll, 1e-6)
+                observed = len(statuses) / elapsed
+                previous = (1 - self._smoothing) * source.rate
+                source.rate = self._smoothing * observed + previous
+            source.last_poll = now
+
+        desired = self._DesiredInterval(source)
+        self._demand += 1 / desired
+        source.interval = desired * max(1.0, self._demand / self._budget)
+        self._Push(source, now + source.interval)
@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+"""Recording of streams and their replay, for offline load tests.
+
+A recording is a directory of segment files named stream-NNNNNN.rec, or
+stream-NNNNNN.rec.gz when compressed with gzip, in the order of their
+number.  Each segment starts with a magic string, followed by records: a
+header packed as RECORD, holding the time the bytes were received in
+seconds since the epoch, the kind of record and the length of the
+payload, followed by the payload:
+
+  CONNECT:
+    The url of a stream connection that was established.
+  DATA:
+    A chunk of the response exactly as it was read, keep-alive lines and
+    length prefixes included.
+  CLOSE:
+    The end of the connection, with the reason as payload.
+
+A connection may span segments, which are rotated between records.
+"""
+
+from __future__ import division
+
+import gzip
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+
+from twitter import TwitterError
+
+MAGIC = b'TWSTRMV1'
+
+# received at, kind, length
+RECORD = struct.Struct('<dBI')
+
+CONNECT = 1
+DATA = 2
+CLOSE = 3
+
+_SEGMENT = re.compile(r'stream-(\d+)\.rec(\.gz)?$')
+
+
+def _Segments(path):
+    """Return the paths of the segments of a recording in order."""
+    if not os.path.isdir(path):
+        return [path]
+    segments = []
+    for name in os.listdir(path):
+        match = _SEGMENT.match(name)
+        if match is not None:
+            segments.append((int(match.group(1)), os.path.join(path, name)))
+    return [segment for _, segment in sorted(segments)]
+
+
+def _Open(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def ReadRecords(path):
+    """Read the records of a recording.
+
+    Args:
+      path:
+        The directory of a recording, or a single segment file.
+
+    Returns:
+      A generator of (received at, kind, payload) tuples.  A record cut
+      short by a crash ends its segment.
+    """
+    for segment in _Segments(path):
+        with _Open(segment, 'rb') as f:
+            try:
+                magic = f.read(len(MAGIC))
+            except (EOFError, zlib.error):
+                magic = b''
+            if magic != MAGIC:
+                if MAGIC.startswith(magic):
+                    # Cut short before its first record.
+                    continue
+                raise TwitterError({'message': "%s is not a stream recording" % segment})
+            for record in _SegmentRecords(f):
+                yield record
+
+
+def _SegmentRecords(f):
+    while True:
+        try:
+            header = f.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            received, kind, length = RECORD.unpack(header)
+            payload = f.read(length)
+        except (EOFError, zlib.error):
+            # A compressed segment cut short.
+            return
+        if len(payload) < length:
+            return
+        yield received, kind, payload
+
+
+class _TeeResponse(object):
+    """Wraps a streaming response to record the chunks read from it."""
+
+    def __init__(self, resp, recorder):
+        self._resp = resp
+        self._recorder = recorder
+        self._closed = False
+        self.status_code = resp.status_code
+
+    def __getattr__(self, name):
+        return getattr(self._resp, name)
+
+    def iter_content(self, chunk_size=1):
+        reason = 'end of stream'
+        try:
+            for chunk in self._resp.iter_content(chunk_size):
+                self._recorder._Write(DATA, chunk)
+                yield chunk
+        except Exception as e:
+            reason = str(e) or type(e).__name__
+            raise
+        finally:
+            self._Closed(reason)
+
+    def close(self):
+        self._Closed('closed')
+        self._resp.close()
+
+    def _Closed(self, reason):
+        if not self._closed:
+            self._closed = True
+            self._recorder._Write(CLOSE, reason.encode('utf-8'))
+
+
+class StreamRecorder(object):
+    """Records the raw bytes of stream connections.
+
+    Every chunk is written with the time it was received, into segment
+    files that are rotated once they hold segment_size bytes or are
+    segment_seconds old, see twitter.recording.  The segment is flushed
+    whenever a connection opens or closes.
+
+    Example usage:
+
+      >>> with twitter.StreamRecorder('recordings/sample') as recorder:
+      ...     api.SetStreamRecorder(recorder)
+      ...     for message in api.GetStreamSample():
+      ...         handle(message)
+    """
+
+    def __init__(self, directory, segment_size=64 * 1024 * 1024, segment_seconds=3600,
+                 compress=True, clock=time.time):
+        """Instantiate a new twitter.StreamRecorder object.
+
+        Args:
+          directory:
+            The directory of the segments, created if needed.  Numbering
+            continues after the segments it already holds.
+          segment_size:
+            The number of bytes, before compression, after which a new
+            segment is started. [Optional]
+          segment_seconds:
+            The age in seconds after which a new segment is started, or
+            None. [Optional]
+          compress:
+            Whether to compress the segments with gzip. [Optional]
+          clock:
+            A callable returning the current time in seconds. [Optional]
+        """
+        if segment_size <= 0:
+            raise TwitterError({'message': "segment_size must be positive"})
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self._segment_size = segment_size
+        self._segment_seconds = segment_seconds
+        self._compress = compress
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = None
+        self._written = 0
+        self._started = None
+        existing = _Segments(directory)
+        self._number = 0
+        if existing:
+            self._number = int(_SEGMENT.match(os.path.basename(existing[-1])).group(1))
+        self.segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def Tee(self, resp, url):
+        """Record a stream response while it is read.
+
+        Args:
+          resp:
+            A streaming response of requests.
+          url:
+            The url of the stream.
+
+        Returns:
+          A response whose iter_content yields the chunks of resp after
+          recording them.
+        """
+        self._Write(CONNECT, url.encode('utf-8'))
+        return _TeeResponse(resp, self)
+
+    def Close(self):
+        """Close the current segment."""
+        with self._lock:
+            self._CloseSegment()
+
+    def _CloseSegment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _Expired(self, now):
+        # Whether the current segment is due for rotation.
+        if self._written >= self._segment_size:
+            return True
+        return self._segment_seconds is not None and now - self._started >= self._segment_seconds
+
+    def _Write(self, kind, payload):
+        now = self._clock()
+        with self._lock:
+            if self._file is not None and self._Expired(now):
+                self._CloseSegment()
+            if self._file is None:
+                self._number += 1
+                path = os.path.join(self.directory, 'stream-%06d.rec%s' % (
+                    self._number, '.gz' if self._compress else ''))
+                self._file = _Open(path, 'wb')
+                self._file.write(MAGIC)
+                self._written = len(MAGIC)
+                self._started = now
+                self.segments.append(path)
+            self._file.write(RECORD.pack(now, kind, len(payload)))
+            self._file.write(payload)
+            self._written += RECORD.size + len(payload)
+            if kind != DATA:
+                self._file.flush()
+
+
+class _ReplayResponse(object):
+    """Serves the recorded chunks of one connection, paced by the
+    replayer."""
+
+    status_code = 200
+
+    def __init__(self, replayer, url):
+        self._replayer = replayer
+        self.url = url
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        # Recorded chunks are served whole, whatever chunk_size is.
+        for chunk in self._replayer._Chunks():
+            if self.closed:
+                break
+            yield chunk
+
+    def close(self):
+        # The rest of the connection is skipped by the next Connect.
+        self.closed = True
+
+
+class StreamReplayer(object):
+    """Replays a recording through twitter.Api.SetStreamReplayer.
+
+    Every recorded connection answers one stream request, whatever its
+    parameters, and serves its chunks at the pace they were received,
+    scaled by speed, so that the stream methods, a twitter.StreamConsumer
+    and everything downstream run as they would on the live stream.
+    Once the recording is exhausted on_end, if given, is called, e.g.
+    with the Stop method of a consumer, and stream requests raise a
+    TwitterError.
+
+    Example usage:
+
+      >>> replayer = twitter.StreamReplayer('recordings/sample', speed=10)
+      >>> api.SetStreamReplayer(replayer)
+      >>> consumer = twitter.StreamConsumer(api)
+      >>> replayer.on_end = consumer.Stop
+      >>> for message in consumer.Messages():
+      ...     handle(message)
+    """
+
+    def __init__(self, path, speed=1.0, on_end=None, clock=time.time, sleep=time.sleep):
+        """Instantiate a new twitter.StreamReplayer object.
+
+        Args:
+          path:
+            The directory of a recording, or a single segment file.
+          speed:
+            1 to replay in real time, 10 to replay ten times faster, or
+            None to replay as fast as the consumer reads. [Optional]
+          on_end:
+            A callable called once, when the last recorded chunk has been
+            served or a connection is requested after it. [Optional]
+          clock:
+            A callable returning the current time in seconds. [Optional]
+          sleep:
+            A callable used to wait for the next chunk. [Optional]
+        """
+        if speed is not None and speed <= 0:
+            raise TwitterError({'message': "speed must be positive or None"})
+        self.speed = speed
+        self.on_end = on_end
+        self._records = ReadRecords(path)
+        self._clock = clock
+        self._sleep = sleep
+        self._next = None
+        self._origin = None
+        self._ended = False
+        self.connections = 0
+        self.chunks = 0
+        self.bytes = 0
+
+    def Connect(self, url=None):
+        """Return a response serving the next recorded connection.
+
+        Args:
+          url:
+            The url requested, which is not checked against the recorded
+            one. [Optional]
+        """
+        while True:
+            record = self._Read()
+            if record is None:
+                self._End()
+                raise TwitterError({'message': "The stream recording has ended"})
+            if record[1] == CONNECT:
+                break
+        self._Pace(record[0])
+        self.connections += 1
+        return _ReplayResponse(self, record[2].decode('utf-8'))
+
+    def _Read(self):
+        if self._next is not None:
+            record, self._next = self._next, None
+            return record
+        return next(self._records, None)
+
+    def _Chunks(self):
+        # The chunks up to the end of the current connection.
+        while True:
+            record = self._Read()
+            if record is None:
+                self._End()
+                return
+            received, kind, payload = record
+            if kind == CONNECT:
+                self._next = record
+                return
+            if kind == CLOSE:
+                # Look ahead, to end the replay with the last connection.
+                self._next = self._Read()
+                if self._next is None:
+                    self._End()
+                return
+            self._Pace(received)
+            self.chunks += 1
+            self.bytes += len(payload)
+            yield payload
+
+    def _End(self):
+        if not self._ended:
+            self._ended = True
+            if self.on_end is not None:
+                self.on_end()
+
+    def _Pace(self, received):
+        # Waits until the replay time of a record received at received.
+        if self._origin is None:
+            self._origin = (received, self._clock())
+        if self.speed is None:
+            return
+        due = self._origin[1] + (received - self._origin[0]) / self.speed
+        wait = due - self._clock()
+        if wait > 0:
+            self._sleep(wait)
@@ -0,0 +1,557 @@
+#!/usr/bin/env python
+
+import re
+import time
+
+from twitter import Status, TwitterError
+
+# The longest query string accepted by search/tweets, operators included.
+MAX_QUERY_LENGTH = 500
+
+_TOKEN_RE = re.compile(r'(-?)("[^"]*"|\S+)', re.UNICODE)
+_WORD_RE = re.compile(r'[#@]?\w+', re.UNICODE)
+_OPERATORS = ('from', 'to', 'lang')
+_COUNT_RE = re.compile(r'(^|&)count=\d*')
+
+# The largest page size accepted by search/tweets.
+MAX_COUNT = 100
+
+
+class _Term(object):
+    """A single condition of a search query."""
+
+    def __init__(self, kind, value, negated=False):
+        self.kind = kind
+        self.value = value
+        self.negated = negated
+
+    def Matches(self, words, text, status):
+        if self.kind == 'word':
+            result = any(word in words for word in
+                         (self.value, '#' + self.value, '@' + self.value))
+        elif self.kind == 'phrase':
+            result = re.search(r'(?<!\w)%s(?!\w)' % re.escape(self.value),
+                               text, re.UNICODE) is not None
+        elif self.kind == 'tag':
+            result = self.value in words
+        elif self.kind == 'from':
+            screen_name = status.user.screen_name if status.user else None
+            result = bool(screen_name) and screen_name.lower() == self.value
+        elif self.kind == 'to':
+            result = (status.in_reply_to_screen_name or '').lower() == self.value
+        else:
+            result = (status.lang or '').lower() == self.value
+        return result != self.negated
+
+
+class QueryMatcher(object):
+    """Evaluates a standing search query against statuses locally.
+
+    Supports the subset of the search syntax that can be decided from a
+    status alone: plain words, "quoted phrases", #hashtags, @mentions,
+    OR between adjacent terms, negation with a leading '-' and the
+    from:, to: and lang: operators.  Matching is case-insensitive.
+    """
+
+    def __init__(self, query):
+        """Parse a search query.
+
+        Args:
+          query:
+            The search query string.
+
+        Raises:
+          TwitterError if the query uses syntax that can not be
+          evaluated locally.
+        """
+        self.query = query
+        self._groups = []
+        join = False
+        for negated, token in _TOKEN_RE.findall(query):
+            if token == 'OR' and not negated:
+                if not self._groups or join:
+                    raise TwitterError({'message': "Misplaced OR in query %r" % query})
+                join = True
+                continue
+            term = self._ParseTerm(token, bool(negated))
+            if join:
+                self._groups[-1].append(term)
+                join = False
+            else:
+                self._groups.append([term])
+        if join or not self._groups:
+            raise TwitterError({'message': "Incomplete query %r" % query})
+
+    def _ParseTerm(self, token, negated):
+        if token.startswith('"') and token.endswith('"') and len(token) > 1:
+            phrase = token[1:-1].strip().lower()
+            if phrase:
+                return _Term('phrase', phrase, negated)
+        elif ':' in token:
+            operator, _, value = token.partition(':')
+            if operator in _OPERATORS and value:
+                return _Term(operator, value.lstrip('@').lower(), negated)
+        else:
+            match = _WORD_RE.match(token)
+            if match and match.group(0) == token:
+                if token[0] in '#@':
+                    return _Term('tag', token.lower(), negated)
+                return _Term('word', token.lower(), negated)
+        raise TwitterError({'message': "Can not match %r of query %r locally" % (token, self.query)})
+
+    def Matches(self, status):
+        """Return True if the status satisfies the query.
+
+        Args:
+          status:
+            A twitter.Status instance.
+        """
+        text = _SearchableText(status)
+        words = set(_WORD_RE.findall(text))
+        for group in self._groups:
+            if not any(term.Matches(words, text, status) for term in group):
+                return False
+        return True
+
+
+def _SearchableText(status):
+    parts = [status.text or '']
+    for url in status.urls or ():
+        if url.expanded_url:
+            parts.append(url.expanded_url)
+    for user in status.user_mentions or ():
+        if user.screen_name:
+            parts.append('@' + user.screen_name)
+    for hashtag in status.hashtags or ():
+        if hashtag.text:
+            parts.append('#' + hashtag.text)
+    return ' '.join(parts).lower()
+
+
+def _Quote(query):
+    if len(query.split()) > 1:
+        return '(%s)' % query
+    return query
+
+
+def PackQueries(queries, max_length=MAX_QUERY_LENGTH):
+    """Combine search queries into as few OR-ed queries as possible.
+
+    Uses first-fit decreasing packing, so the number of combined queries
+    is close to the minimum.
+
+    Args:
+      queries:
+        A sequence of search query strings.
+      max_length:
+        The longest combined query allowed. [Optional]
+
+    Returns:
+      A list of lists of the original queries, one list per combined
+      query.  Join them with ' OR ' after parenthesising multi-term
+      queries, or use CombineQueries.
+    """
+    bins = []
+    for query in sorted(set(queries), key=lambda q: (-len(_Quote(q)), q)):
+        size = len(_Quote(query))
+        if size > max_length:
+            raise TwitterError({'message': "Query %r is longer than %d characters" % (query, max_length)})
+        for b in bins:
+            if b[0] + len(' OR ') + size <= max_length:
+                b[0] += len(' OR ') + size
+                b[1].append(query)
+                break
+        else:
+            bins.append([size, [query]])
+    return [b[1] for b in bins]
+
+
+def CombineQueries(queries):
+    """Join search queries into a single query matching any of them."""
+    return ' OR '.join(_Quote(q) for q in queries)
+
+
+class SearchMultiplexer(object):
+    """Polls many standing search queries with as few GetSearch calls as
+    possible.
+
+    The queries are OR-combined into as few search strings as fit the
+    search query length limit.  Every poll runs each combined query once
+    through a SearchIterator, incrementally from the newest result seen,
+    and routes each result back to the standing queries it matches with a
+    QueryMatcher.  Queries whose syntax the matcher cannot evaluate are
+    polled on their own.
+
+    A query's since_id only advances once everything newer has been
+    fetched.  When a poll stops at max_pages, the next poll resumes below
+    the last page fetched, so no results are skipped.
+
+    Example usage:
+
+      >>> mux = twitter.SearchMultiplexer(api, ['python', '#django', 'from:gvanrossum'])
+      >>> for query, statuses in mux.Poll().items():
+      ...     handle(query, statuses)
+    """
+
+    def __init__(self,
+                 api,
+                 queries=None,
+                 max_query_length=MAX_QUERY_LENGTH,
+                 max_pages=5,
+                 **kwargs):
+        """Instantiate a new twitter.SearchMultiplexer object.
+
+        Args:
+          api:
+            The twitter.Api instance used to make requests.
+          queries:
+            A sequence of search query strings to poll. [Optional]
+          max_query_length:
+            The longest combined query sent to Twitter. [Optional]
+          max_pages:
+            The maximum number of pages fetched for one combined query
+            per poll. [Optional]
+          kwargs:
+            Any further arguments for SearchIterator, e.g. lang or
+            geocode. [Optional]
+        """
+        self._api = api
+        self._max_query_length = max_query_length
+        self._max_pages = max_pages
+        self._search_parameters = kwargs
+        self._matchers = {}
+        self._since_ids = {}
+        # query -> (low, high): results with low < id <= high were already
+        # delivered, but the range below low down to since_id was not.
+        self._pending = {}
+        self._groups = None
+        self.requests = 0
+        for query in queries or ():
+            self.Add(query)
+
+    def Add(self, query, since_id=None):
+        """Start polling a query.
+
+        Args:
+          query:
+            A search query string.
+          since_id:
+            Only results newer than this id are returned for the query.
+            Without it, the first poll returns the newest page of results.
+            [Optional]
+        """
+        try:
+            self._matchers[query] = QueryMatcher(query)
+        except TwitterError:
+            self._matchers[query] = None
+        self._since_ids[query] = since_id
+        self._pending.pop(query, None)
+        self._groups = None
+
+    def Remove(self, query):
+        """Stop polling a query."""
+        del self._matchers[query]
+        del self._since_ids[query]
+        self._pending.pop(query, None)
+        self._groups = None
+
+    def GetSinceId(self, query):
+        """Return the id up to which all results of a query were returned."""
+        return self._since_ids[query]
+
+    def GetCombinedQueries(self):
+        """Return the combined query strings sent to Twitter."""
+        return [CombineQueries(group) for group in self._GetGroups()]
+
+    def _GetGroups(self):
+        if self._groups is None:
+            packable = [q for q, m in self._matchers.items() if m is not None]
+            self._groups = PackQueries(packable, self._max_query_length)
+            self._groups.extend([q] for q, m in sorted(self._matchers.items())
+                                if m is None)
+        return self._groups
+
+    def Poll(self):
+        """Run every combined query once.
+
+        Returns:
+          A dict mapping each standing query with new results to a list of
+          twitter.Status instances, newest first.
+        """
+        results = {}
+        for group in self._GetGroups():
+            since_ids = [self._since_ids[q] for q in group
+                         if self._since_ids[q] is not None]
+            since_id = since_ids and min(since_ids) or None
+
+            # Resume an unfinished walk if every query of the group shares
+            # it; otherwise start from the top and skip what was delivered.
+            pending = set(self._pending.get(q) for q in group)
+            max_id = None
+            high = None
+            if len(pending) == 1 and None not in pending:
+                low, high = pending.pop()
+                max_id = low
+
+            search = SearchIterator(self._api,
+                                    term=CombineQueries(group),
+                                    **self._search_parameters)
+            statuses, resume_id = search.GetRange(
+                since_id=since_id,
+                max_id=max_id,
+                max_pages=self._max_pages if since_id is not None else 1)
+            self.requests += search.requests
+            if statuses:
+                high = max(high or 0, statuses[0].id)
+
+            for query in group:
+                matcher = self._matchers[query]
+                query_since_id = self._since_ids[query]
+                delivered = self._pending.get(query)
+                matched = [s for s in statuses
+                           if query_since_id is None or s.id > query_since_id]
+                if delivered:
+                    matched = [s for s in matched if not delivered[0] < s.id <= delivered[1]]
+                if len(group) > 1:
+                    matched = [s for s in matched if matcher.Matches(s)]
+                if matched:
+                    results[query] = matched
+                if high is None:
+                    continue
+                if resume_id is None:
+                    self._since_ids[query] = max(query_since_id or 0, high)
+                    self._pending.pop(query, None)
+                else:
+                    low = resume_id
+                    if delivered and low <= delivered[1]:
+                        low = min(low, delivered[0])
+                    self._pending[query] = (low, max(high, delivered and delivered[1] or 0))
+        return results
+
+
+def _WithMaxCount(query):
+    query = query.lstrip('?')
+    count = 'count=%d' % MAX_COUNT
+    if _COUNT_RE.search(query):
+        return _COUNT_RE.sub(lambda m: m.group(1) + count, query, count=1)
+    return '%s&%s' % (query, count)
+
+
+class SearchIterator(object):
+    """Iterates over the results of a search by following the
+    search_metadata of each page.
+
+    Backfill walks back in time through next_results; Refresh polls
+    forward through refresh_url.  Every request asks for the largest page
+    Twitter allows, and statuses are yielded as soon as their page
+    arrives.
+
+    Example usage:
+
+      >>> search = twitter.SearchIterator(api, term='python')
+      >>> for status in search.Backfill(max_results=1000):
+      ...     archive(status)
+      >>> for status in search.Refresh(interval=60):
+      ...     handle(status)
+    """
+
+    def __init__(self,
+                 api,
+                 term=None,
+                 raw_query=None,
+                 geocode=None,
+                 lang=None,
+                 locale=None,
+                 result_type='recent',
+                 include_entities=None,
+                 clock=time.time,
+                 sleep=time.sleep):
+        """Instantiate a new twitter.SearchIterator object.
+
+        Args:
+          api:
+            The twitter.Api instance used to make requests.
+          term:
+            Term to search by. [Optional]
+          raw_query:
+            A complete query string, see Api.GetSearch. [Optional]
+          geocode:
+            Geolocation information in the form (latitude, longitude,
+            radius). [Optional]
+          lang:
+            Language for results as ISO 639-1 code. [Optional]
+          locale:
+            Language of the search query. [Optional]
+          result_type:
+            Type of result which should be returned. Defaults to
+            "recent". [Optional]
+          include_entities:
+            If True, each tweet will include a node called "entities".
+            [Optional]
+          clock:
+            A callable returning the current time in seconds. [Optional]
+          sleep:
+            A callable used to wait between refreshes. [Optional]
+        """
+        if term is None and geocode is None and raw_query is None:
+            raise TwitterError({'message': "Specify at least one of term, geocode or raw_query."})
+        self._api = api
+        self._parameters = dict(term=term,
+                                geocode=geocode,
+                                lang=lang,
+                                locale=locale,
+                                result_type=result_type,
+                                include_entities=include_entities)
+        self._raw_query = raw_query and _WithMaxCount(raw_query)
+        self._clock = clock
+        self._sleep = sleep
+        self.refresh_url = None
+        self.requests = 0
+
+    def _GetPage(self, raw_query=None, update_refresh_url=True, **kwargs):
+        self.requests += 1
+        if raw_query is None and self._raw_query is None:
+            parameters = dict(self._parameters)
+            parameters.update(kwargs)
+            data = self._api.GetSearch(count=MAX_COUNT, return_json=True, **parameters)
+        else:
+            data = self._api.GetSearch(raw_query=raw_query or self._raw_query,
+                                       return_json=True)
+        statuses = data.get('statuses', [])
+        metadata = data.get('search_metadata', {})
+        # Empty pages do not advance the refresh point.
+        if update_refresh_url and metadata.get('refresh_url'):
+            if statuses or self.refresh_url is None:
+                self.refresh_url = _WithMaxCount(metadata['refresh_url'])
+        return statuses, metadata.get('next_results')
+
+    def GetRange(self, since_id=None, max_id=None, max_pages=None):
+        """Fetch the statuses with since_id < id <= max_id, following
+        next_results.
+
+        Args:
+          since_id:
+            Only statuses newer than this id are fetched. Without it
+            only the first page is fetched. [Optional]
+          max_id:
+            Only statuses with an id less than or equal to this id are
+            fetched. [Optional]
+          max_pages:
+            The maximum number of pages to fetch. [Optional]
+
+        Returns:
+          A tuple of (statuses, resume_id).  statuses is a list of
+          twitter.Status instances, newest first.  resume_id is None if the
+          whole range was fetched; otherwise the range below resume_id,
+          down to since_id, is still missing and can be fetched by calling
+          GetRange again with max_id=resume_id.
+        """
+        if self._raw_query is not None:
+            raise TwitterError({'message': "GetRange can not be combined with raw_query."})
+        results = []
+        pages = 0
+        page, next_results = self._GetPage(update_refresh_url=False,
+                                           since_id=since_id,
+                                           max_id=max_id)
+        while True:
+            pages += 1
+            for data in page:
+                if since_id is not None and data['id'] <= since_id:
+                    return results, None
+                results.append(Status.NewFromJsonDict(data))
+            if not page or not next_results or since_id is None:
+                return results, None
+            if max_pages is not None and pages >= max_pages:
+                return results, results[-1].id - 1
+            page, next_results = self._GetPage(_WithMaxCount(next_results),
+                                               update_refresh_url=False)
+
+    def Backfill(self, max_results=None, oldest=None, max_id=None):
+        """Yield matching statuses from the newest back in time.
+
+        Args:
+          max_results:
+            Stop after this many statuses. [Optional]
+          oldest:
+            Stop at the first status posted before this time, in seconds
+            since the epoch. [Optional]
+          max_id:
+            Start with statuses with an id less than or equal to this
+            id. [Optional]
+
+        Returns:
+          A generator of twitter.Status instances, newest first.
+        """
+        if max_id is not None and self._raw_query is not None:
+            raise TwitterError({'message': "max_id can not be combined with raw_query."})
+        if max_results is not None and max_results <= 0:
+            return
+        results = 0
+        statuses, next_results = self._GetPage(max_id=max_id)
+        while True:
+            for data in statuses:
+                if max_results is not None and results >= max_results:
+                    return
+                status = Status.NewFromJsonDict(data)
+                if oldest is not None and status.CreatedAtInSeconds < oldest:
+                    return
+                results += 1
+                yield status
+            if not statuses or not next_results:
+                return
+            statuses, next_results = self._GetPage(_WithMaxCount(next_results),
+                                                   update_refresh_url=False)
+
+    def Refresh(self, interval=30, max_results=None, deadline=None):
+        """Poll for new matching statuses.
+
+        The first poll continues from the newest status seen by Backfill,
+        if Backfill was used.  When more statuses arrived than fit a page,
+        next_results is followed until the gap is closed.
+
+        Args:
+          interval:
+            Seconds to wait between polls. [Optional]
+          max_results:
+            Stop after this many statuses. [Optional]
+          deadline:
+            Stop polling at this time, in seconds since the epoch.
+            [Optional]
+
+        Returns:
+          A generator of twitter.Status instances, newest first within
+          each poll.
+        """
+        if max_results is not None and max_results <= 0:
+            return
+        results = 0
+        first = True
+        while deadline is None or self._clock() < deadline:
+            if not first:
+                self._sleep(interval)
+                if deadline is not None and self._clock() >= deadline:
+                    return
+            first = False
+
+            refresh_url = self.refresh_url
+            since_id = None
+            if refresh_url is None:
+                statuses, next_results = self._GetPage()
+            else:
+                match = re.search(r'(?:^|&)since_id=(\d+)', refresh_url)
+                since_id = match and int(match.group(1))
+                statuses, next_results = self._GetPage(refresh_url)
+
+            while True:
+                for data in statuses:
+                    if since_id is not None and data['id'] <= since_id:
+                        next_results = None
+                        break
+                    results += 1
+                    yield Status.NewFromJsonDict(data)
+                    if max_results is not None and results >= max_results:
+                        return
+                if not statuses or not next_results or since_id is None:
+                    break
+                statuses, next_results = self._GetPage(_WithMaxCount(next_results),
+                                                       update_refresh_url=False)
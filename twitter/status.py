@@ -1,12 +1,6 @@
 #!/usr/bin/env python
 
 from __future__ import division
-from calendar import timegm
-
-try:
-    from rfc822 import parsedate
-except ImportError:
-    from email.utils import parsedate
 
 import time
 # TODO remove this if/when v2.7+ is ever deprecated
@@ -15,8 +9,108 @@ try:
 except ImportError:
   Set = set
 
-from twitter import json, Hashtag, Url
+from twitter import json, Hashtag, Url, TwitterError
+from twitter._schema import Field, Schema, NOT_NONE
 from twitter.media import Media
+from twitter.twitter_utils import parse_created_at
+from twitter.user import User as _User
+
+
+def _ParseUser(data, lazy=False, identity_map=None):
+    if 'user' not in data:
+        return None
+    return _User.NewFromJsonDict(data['user'], lazy=lazy, identity_map=identity_map)
+
+
+def _ParseRetweetedStatus(data, lazy=False, identity_map=None):
+    retweeted_status = data.get('retweeted_status')
+    if retweeted_status is None:
+        return None
+    return Status.NewFromJsonDict(retweeted_status, lazy=lazy, identity_map=identity_map)
+
+
+def _ParseCurrentUserRetweet(data, lazy=False, identity_map=None):
+    if 'current_user_retweet' in data:
+        return data['current_user_retweet']['id']
+    return None
+
+
+def _ParseUrls(data, lazy=False, identity_map=None):
+    entities = data.get('entities')
+    if entities is None or 'urls' not in entities:
+        return None
+    return [Url.NewFromJsonDict(u) for u in entities['urls']]
+
+
+def _ParseUserMentions(data, lazy=False, identity_map=None):
+    entities = data.get('entities')
+    if entities is None or 'user_mentions' not in entities:
+        return None
+    if identity_map is not None:
+        return [identity_map.Mention(u) for u in entities['user_mentions']]
+    return [_User.NewFromJsonDict(u) for u in entities['user_mentions']]
+
+
+def _ParseHashtags(data, lazy=False, identity_map=None):
+    entities = data.get('entities')
+    if entities is None or 'hashtags' not in entities:
+        return None
+    return [Hashtag.NewFromJsonDict(h) for h in entities['hashtags']]
+
+
+def _ParseMedia(data, lazy=False, identity_map=None):
+    media = Set()
+    if 'entities' in data and 'media' in data['entities']:
+        for m in data['entities']['media']:
+            media.add(Media.NewFromJsonDict(m))
+    # the new extended entities
+    if 'extended_entities' in data and 'media' in data['extended_entities']:
+        for m in data['extended_entities']['media']:
+            media.add(Media.NewFromJsonDict(m))
+    return media
+
+
+_STATUS_SCHEMA = Schema('Status', [
+    Field('coordinates'),
+    Field('contributors'),
+    Field('created_at'),
+    Field('current_user_retweet', parse=_ParseCurrentUserRetweet),
+    Field('favorited', dump_if=NOT_NONE),
+    Field('favorite_count'),
+    Field('geo'),
+    Field('id'),
+    Field('id_str', key=None, dump=None, compare=False),
+    Field('in_reply_to_screen_name'),
+    Field('in_reply_to_user_id'),
+    Field('in_reply_to_status_id'),
+    Field('lang', compare=False),
+    Field('location'),
+    Field('now', key=None, dump=None, compare=False),
+    Field('place'),
+    Field('possibly_sensitive'),
+    Field('retweeted', dump_if=NOT_NONE),
+    Field('retweeted_status', parse=_ParseRetweetedStatus, dump='{0}.AsDict()',
+          nested=lambda: Status),
+    Field('retweet_count'),
+    Field('scopes'),
+    Field('source'),
+    Field('text'),
+    Field('truncated', dump_if=NOT_NONE),
+    Field('urls', parse=_ParseUrls, compare=False, paths=['entities.urls'],
+          dump='dict([(url.url, url.expanded_url) for url in {0}])'),
+    Field('user', parse=_ParseUser, dump='{0}.AsDict()', nested=lambda: _User),
+    Field('user_mentions', parse=_ParseUserMentions, compare=False,
+          paths=['entities.user_mentions'], dump='[um.AsDict() for um in {0}]'),
+    Field('hashtags', parse=_ParseHashtags, compare=False, paths=['entities.hashtags'],
+          dump='[h.text for h in {0}]'),
+    Field('media', parse=_ParseMedia, compare=False,
+          paths=['entities.media', 'extended_entities.media'], dump='[m for m in {0}]'),
+    Field('withheld_copyright'),
+    Field('withheld_in_countries'),
+    Field('withheld_scope'),
+    Field('_created_at_cache', key=None, dump=None, compare=False, pickle=False),
+    Field('_json', key=None, dump=None, compare=False),
+])
 
 
 class Status(object):
@@ -50,8 +144,11 @@ class Status(object):
       status.hashtags
     """
 
-    def __init__(self, **kwargs):
-        """An object to hold a Twitter status message.
+    __slots__ = _STATUS_SCHEMA.Slots('__weakref__')
+
+    _SCHEMA = _STATUS_SCHEMA
+
+    __init__ = _STATUS_SCHEMA.Init(doc="""An object to hold a Twitter status message.
 
         This class is normally instantiated by the twitter.Api class and
         returned in a sequence.
@@ -97,44 +194,7 @@ class Status(object):
           withheld_copyright:
           withheld_in_countries:
           withheld_scope:
-        """
-        param_defaults = {
-            'coordinates': None,
-            'contributors': None,
-            'created_at': None,
-            'current_user_retweet': None,
-            'favorited': None,
-            'favorite_count': None,
-            'geo': None,
-            'id': None,
-            'id_str': None,
-            'in_reply_to_screen_name': None,
-            'in_reply_to_user_id': None,
-            'in_reply_to_status_id': None,
-            'lang': None,
-            'location': None,
-            'now': None,
-            'place': None,
-            'possibly_sensitive': None,
-            'retweeted': None,
-            'retweeted_status': None,
-            'retweet_count': None,
-            'scopes': None,
-            'source': None,
-            'text': None,
-            'truncated': None,
-            'urls': None,
-            'user': None,
-            'user_mentions': None,
-            'hashtags': None,
-            'media': None,
-            'withheld_copyright': None,
-            'withheld_in_countries': None,
-            'withheld_scope': None,
-        }
-
-        for (param, default) in param_defaults.items():
-            setattr(self, param, kwargs.get(param, default))
+        """)
 
     # Properties that you should be able to set yourself.
 
@@ -145,43 +205,43 @@ class Status(object):
         Returns:
           The text of this status message.
         """
-        return self._text
+        return self.text
 
     @Text.setter
     def Text(self, text):
-        self._text = text
+        self.text = text
 
     @property
     def InReplyToStatusId(self):
-        return self._in_reply_to_status_id
+        return self.in_reply_to_status_id
 
     @InReplyToStatusId.setter
     def InReplyToStatusId(self, in_reply_to_status_id):
-        self._in_reply_to_status_id = in_reply_to_status_id
+        self.in_reply_to_status_id = in_reply_to_status_id
 
     @property
     def Possibly_sensitive(self):
-        return self._possibly_sensitive
+        return self.possibly_sensitive
 
     @Possibly_sensitive.setter
     def Possibly_sensitive(self, possibly_sensitive):
-        self._possibly_sensitive = possibly_sensitive
+        self.possibly_sensitive = possibly_sensitive
 
     @property
     def Place(self):
-        return self._place
+        return self.place
 
     @Place.setter
     def Place(self, place):
-        self._place = place
+        self.place = place
 
     @property
     def Coordinates(self):
-        return self._coordinates
+        return self.coordinates
 
     @Coordinates.setter
     def Coordinates(self, coordinates):
-        self._coordinates = coordinates
+        self.coordinates = coordinates
 
     # Missing the following, media_ids, trim_user, display_coordinates,
     # lat and long
@@ -193,16 +253,22 @@ class Status(object):
         Returns:
           The time this status message was posted
         """
-        return self._created_at
+        return self.created_at
 
     @property
     def CreatedAtInSeconds(self):
         """Get the time this status message was posted, in seconds since the epoch.
 
+        The value is computed once and cached until created_at changes.
+
         Returns:
           The time this status message was posted, in seconds since the epoch.
         """
-        return timegm(parsedate(self.created_at))
+        cache = self._created_at_cache
+        if cache is None or cache[0] is not self.created_at:
+            cache = (self.created_at, parse_created_at(self.created_at))
+            self._created_at_cache = cache
+        return cache[1]
 
     @property
     def RelativeCreatedAt(self):
@@ -212,7 +278,7 @@ class Status(object):
           A human readable string representing the posting time
         """
         fudge = 1.25
-        delta = int(self.now) - int(self.CreatedAtInSeconds)
+        delta = int(self.Now) - int(self.CreatedAtInSeconds)
 
         if delta < (1 * fudge):
             return 'about a second ago'
@@ -238,7 +304,7 @@ class Status(object):
         Returns:
           True if this status message is favorited; False otherwise
         """
-        return self._favorited
+        return self.favorited
 
     @property
     def FavoriteCount(self):
@@ -247,7 +313,7 @@ class Status(object):
         Returns:
           number of times this status message has been favorited
         """
-        return self._favorite_count
+        return self.favorite_count
 
     @property
     def Id(self):
@@ -256,7 +322,7 @@ class Status(object):
         Returns:
           The unique id of this status message
         """
-        return self._id
+        return self.id
 
     @property
     def IdStr(self):
@@ -265,27 +331,27 @@ class Status(object):
         Returns:
           The unique id_str of this status message
         """
-        return self._id_str
+        return self.id_str
 
     @property
     def InReplyToScreenName(self):
-        return self._in_reply_to_screen_name
+        return self.in_reply_to_screen_name
 
     @property
     def InReplyToUserId(self):
-        return self._in_reply_to_user_id
+        return self.in_reply_to_user_id
 
     @property
     def Truncated(self):
-        return self._truncated
+        return self.truncated
 
     @property
     def Retweeted(self):
-        return self._retweeted
+        return self.retweeted
 
     @property
     def Source(self):
-        return self._source
+        return self.source
 
     @property
     def Lang(self):
@@ -294,7 +360,7 @@ class Status(object):
         Returns:
           The machine-detected language  code of this status message.
         """
-        return self._lang
+        return self.lang
 
     @property
     def Location(self):
@@ -303,7 +369,7 @@ class Status(object):
         Returns:
           The geolocation string of this status message.
         """
-        return self._location
+        return self.location
 
     @property
     def User(self):
@@ -312,7 +378,7 @@ class Status(object):
         Returns:
           A twitter.User representing the entity posting this status message
         """
-        return self._user
+        return self.user
 
     @property
     def Now(self):
@@ -325,83 +391,58 @@ class Status(object):
           Whatever the status instance believes the current time to be,
           in seconds since the epoch.
         """
-        if self._now is None:
-            self._now = time.time()
-        return self._now
+        if self.now is None:
+            self.now = time.time()
+        return self.now
 
     @Now.setter
     def Now(self, now):
-        self._now = now
+        self.now = now
 
     @property
     def Geo(self):
-        return self._geo
+        return self.geo
 
     @property
     def Contributors(self):
-        return self._contributors
+        return self.contributors
 
     @property
     def Retweeted_status(self):
-        return self._retweeted_status
+        return self.retweeted_status
 
     @property
     def RetweetCount(self):
-        return self._retweet_count
+        return self.retweet_count
 
     @property
     def Current_user_retweet(self):
-        return self._current_user_retweet
+        return self.current_user_retweet
 
     @property
     def Scopes(self):
-        return self._scopes
+        return self.scopes
 
     @property
     def Withheld_copyright(self):
-        return self._withheld_copyright
+        return self.withheld_copyright
 
     @property
     def Withheld_in_countries(self):
-        return self._withheld_in_countries
+        return self.withheld_in_countries
 
     @property
     def Withheld_scope(self):
-        return self._withheld_scope
+        return self.withheld_scope
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
-    def __eq__(self, other):
-        try:
-            return other and \
-                   self.created_at == other.created_at and \
-                   self.id == other.id and \
-                   self.text == other.text and \
-                   self.location == other.location and \
-                   self.user == other.user and \
-                   self.in_reply_to_screen_name == other.in_reply_to_screen_name and \
-                   self.in_reply_to_user_id == other.in_reply_to_user_id and \
-                   self.in_reply_to_status_id == other.in_reply_to_status_id and \
-                   self.truncated == other.truncated and \
-                   self.retweeted == other.retweeted and \
-                   self.favorited == other.favorited and \
-                   self.favorite_count == other.favorite_count and \
-                   self.source == other.source and \
-                   self.geo == other.geo and \
-                   self.place == other.place and \
-                   self.coordinates == other.coordinates and \
-                   self.contributors == other.contributors and \
-                   self.retweeted_status == other.retweeted_status and \
-                   self.retweet_count == other.retweet_count and \
-                   self.current_user_retweet == other.current_user_retweet and \
-                   self.possibly_sensitive == other.possibly_sensitive and \
-                   self.scopes == other.scopes and \
-                   self.withheld_copyright == other.withheld_copyright and \
-                   self.withheld_in_countries == other.withheld_in_countries and \
-                   self.withheld_scope == other.withheld_scope
-        except AttributeError:
-            return False
+    __eq__ = _STATUS_SCHEMA.Eq()
+
+    __reduce__ = _STATUS_SCHEMA.Reduce(lambda: Status)
+
+    __setstate__ = _STATUS_SCHEMA.SetState()
 
     def __str__(self):
         """A string representation of this twitter.Status instance.
@@ -426,164 +467,122 @@ class Status(object):
             representation = "Status(ID=%s,  created_at='%s')" % (self.id, self.created_at)
         return representation
 
-    def AsJsonString(self, allow_non_ascii=False):
+    def AsJsonString(self, allow_non_ascii=False, sort_keys=True):
         """A JSON string representation of this twitter.Status instance.
-        To output non-ascii, set keyword allow_non_ascii=True.
+        To output non-ascii, set keyword allow_non_ascii=True.  Set
+        sort_keys=False for faster output in no particular key order.
+
+        If the instance was created with keep_json, the original payload
+        is returned instead, unchanged if it was kept as bytes or text.
 
         Returns:
           A JSON string representation of this twitter.Status instance
        """
-        return json.dumps(self.AsDict(), sort_keys=True, ensure_ascii=not allow_non_ascii)
+        if self._json is not None:
+            return json.dumps_raw(self._json, ensure_ascii=not allow_non_ascii)
+        return json.dumps(self.AsDict(), sort_keys=sort_keys, ensure_ascii=not allow_non_ascii)
 
-    def AsDict(self):
-        """A dict representation of this twitter.Status instance.
-        The return value uses the same key names as the JSON representation.
+    @staticmethod
+    def AsJsonLines(statuses, f, allow_non_ascii=True, sort_keys=False):
+        """Write statuses to a file object as JSON Lines, see
+        twitter.json.dump_lines.
 
-        Return:
-          A dict representing this twitter.Status instance
+        Args:
+          statuses:
+            An iterable of twitter.Status instances.
+          f:
+            A file object opened for writing text.
+          allow_non_ascii:
+            If False, non-ASCII characters are escaped. JSON Lines files
+            are UTF-8, so they are written unescaped by default. [Optional]
+          sort_keys:
+            If True, the keys of each status are sorted, as in
+            AsJsonString. [Optional]
+
+        Returns:
+          The number of statuses written.
         """
-        data = {}
-        if self.created_at:
-            data['created_at'] = self.created_at
-        if self.favorited:
-            data['favorited'] = self.favorited
-        if self.favorite_count:
-            data['favorite_count'] = self.favorite_count
-        if self.id:
-            data['id'] = self.id
-        if self.text:
-            data['text'] = self.text
-        if self.lang:
-            data['lang'] = self.lang
-        if self.location:
-            data['location'] = self.location
-        if self.user:
-            data['user'] = self.user.AsDict()
-        if self.in_reply_to_screen_name:
-            data['in_reply_to_screen_name'] = self.in_reply_to_screen_name
-        if self.in_reply_to_user_id:
-            data['in_reply_to_user_id'] = self.in_reply_to_user_id
-        if self.in_reply_to_status_id:
-            data['in_reply_to_status_id'] = self.in_reply_to_status_id
-        if self.truncated is not None:
-            data['truncated'] = self.truncated
-        if self.retweeted is not None:
-            data['retweeted'] = self.retweeted
-        if self.favorited is not None:
-            data['favorited'] = self.favorited
-        if self.source:
-            data['source'] = self.source
-        if self.geo:
-            data['geo'] = self.geo
-        if self.place:
-            data['place'] = self.place
-        if self.coordinates:
-            data['coordinates'] = self.coordinates
-        if self.contributors:
-            data['contributors'] = self.contributors
-        if self.hashtags:
-            data['hashtags'] = [h.text for h in self.hashtags]
-        if self.media:
-            data['media'] = [m for m in self.media]
-        if self.retweeted_status:
-            data['retweeted_status'] = self.retweeted_status.AsDict()
-        if self.retweet_count:
-            data['retweet_count'] = self.retweet_count
-        if self.urls:
-            data['urls'] = dict([(url.url, url.expanded_url) for url in self.urls])
-        if self.user_mentions:
-            data['user_mentions'] = [um.AsDict() for um in self.user_mentions]
-        if self.current_user_retweet:
-            data['current_user_retweet'] = self.current_user_retweet
-        if self.possibly_sensitive:
-            data['possibly_sensitive'] = self.possibly_sensitive
-        if self.scopes:
-            data['scopes'] = self.scopes
-        if self.withheld_copyright:
-            data['withheld_copyright'] = self.withheld_copyright
-        if self.withheld_in_countries:
-            data['withheld_in_countries'] = self.withheld_in_countries
-        if self.withheld_scope:
-            data['withheld_scope'] = self.withheld_scope
-        return data
+        return json.dump_lines(statuses, f, sort_keys=sort_keys,
+                               ensure_ascii=not allow_non_ascii)
+
+    AsDict = _STATUS_SCHEMA.AsDict()
 
     @staticmethod
-    def NewFromJsonDict(data):
+    def NewFromJsonDict(data, lazy=False, identity_map=None, fields=None, keep_json=False):
         """Create a new instance based on a JSON dict.
 
         Args:
           data: A JSON dict, as converted from the JSON in the twitter API
+          lazy:
+            If True, return a twitter.status.LazyStatus that keeps the
+            JSON dict and builds each attribute on first access. [Optional]
+          identity_map:
+            A twitter.IdentityMap through which this status, and the
+            users and statuses nested in it, are shared with earlier
+            copies. [Optional]
+          fields:
+            A projection such as ('id', 'text', 'user.id',
+            'entities.hashtags'): only these fields are built and all
+            other attributes are None. See twitter._schema.Schema.Projector.
+            Cannot be combined with lazy or identity_map. [Optional]
+          keep_json:
+            If True, the instance keeps data, and AsJsonString returns
+            the original payload instead of rebuilding it from the
+            attributes. [Optional]
         Returns:
           A twitter.Status instance
         """
-        if 'user' in data:
-            from twitter import User
-            # Have to do the import here to prevent cyclic imports in the __init__.py
-            # file
-            user = User.NewFromJsonDict(data['user'])
-        else:
-            user = None
-        if 'retweeted_status' in data:
-            retweeted_status = Status.NewFromJsonDict(data['retweeted_status'])
+        if fields is not None:
+            if lazy or identity_map is not None:
+                raise TwitterError({'message': "fields cannot be combined with lazy or identity_map"})
+            status = _STATUS_SCHEMA.Projector(fields)(Status, data)
+        elif identity_map is not None:
+            # The map keeps the payload in step with the attributes.
+            return identity_map.Status(data, lazy=lazy, raw=data if keep_json else None)
         else:
-            retweeted_status = None
+            status = Status._FromJsonDict(data, lazy)
+        if keep_json:
+            status._json = data
+        return status
 
-        if 'current_user_retweet' in data:
-            current_user_retweet = data['current_user_retweet']['id']
-        else:
-            current_user_retweet = None
-
-        urls = None
-        user_mentions = None
-        hashtags = None
-        media = Set()
-        if 'entities' in data:
-            if 'urls' in data['entities']:
-                urls = [Url.NewFromJsonDict(u) for u in data['entities']['urls']]
-            if 'user_mentions' in data['entities']:
-                from twitter import User
-
-                user_mentions = [User.NewFromJsonDict(u) for u in data['entities']['user_mentions']]
-            if 'hashtags' in data['entities']:
-                hashtags = [Hashtag.NewFromJsonDict(h) for h in data['entities']['hashtags']]
-            if 'media' in data['entities']:
-                for m in data['entities']['media']:
-                    media.add(Media.NewFromJsonDict(m))
-
-        # the new extended entities
-        if 'extended_entities' in data:
-            if 'media' in data['extended_entities']:
-                for m in data['extended_entities']['media']:
-                    media.add(Media.NewFromJsonDict(m))
-
-        return Status(created_at=data.get('created_at', None),
-                      favorited=data.get('favorited', None),
-                      favorite_count=data.get('favorite_count', None),
-                      id=data.get('id', None),
-                      text=data.get('text', None),
-                      location=data.get('location', None),
-                      lang=data.get('lang', None),
-                      in_reply_to_screen_name=data.get('in_reply_to_screen_name', None),
-                      in_reply_to_user_id=data.get('in_reply_to_user_id', None),
-                      in_reply_to_status_id=data.get('in_reply_to_status_id', None),
-                      truncated=data.get('truncated', None),
-                      retweeted=data.get('retweeted', None),
-                      source=data.get('source', None),
-                      user=user,
-                      urls=urls,
-                      user_mentions=user_mentions,
-                      hashtags=hashtags,
-                      media=media,
-                      geo=data.get('geo', None),
-                      place=data.get('place', None),
-                      coordinates=data.get('coordinates', None),
-                      contributors=data.get('contributors', None),
-                      retweeted_status=retweeted_status,
-                      current_user_retweet=current_user_retweet,
-                      retweet_count=data.get('retweet_count', None),
-                      possibly_sensitive=data.get('possibly_sensitive', None),
-                      scopes=data.get('scopes', None),
-                      withheld_copyright=data.get('withheld_copyright', None),
-                      withheld_in_countries=data.get('withheld_in_countries', None),
-                      withheld_scope=data.get('withheld_scope', None),
-                      )
+    @staticmethod
+    def _FromJsonDict(data, lazy=False, identity_map=None):
+        if lazy:
+            return LazyStatus(data, identity_map)
+        return Status._Build(data, identity_map)
+
+    _Build = _STATUS_SCHEMA.Builder()
+
+
+class LazyStatus(Status):
+    """A twitter.Status that wraps the JSON dict of a status and builds
+    each attribute the first time it is read.
+
+    Nested objects such as the user, the retweeted status and the entities
+    are only constructed when they are accessed, and are cached afterwards.
+    This makes parsing cheap for code that reads a few fields of many
+    statuses, at the price of keeping the JSON dict alive.  Assigning an
+    attribute works as on twitter.Status.
+
+    Instances are normally created with Status.NewFromJsonDict(data,
+    lazy=True).
+    """
+
+    __slots__ = ('_data', '_identity_map')
+
+    def __init__(self, data, identity_map=None):
+        self._data = data
+        self._identity_map = identity_map
+        self._created_at_cache = None
+        self._json = None
+
+    def __getattr__(self, name):
+        # Only called for slots that have not been assigned yet.
+        if name not in _STATUS_FIELDS:
+            raise AttributeError(name)
+        value = _STATUS_SCHEMA.by_name[name].Read(self._data, True, self._identity_map)
+        setattr(self, name, value)
+        return value
+
+
+_STATUS_FIELDS = _STATUS_SCHEMA.PublicNames()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+
+from __future__ import division
+
+import time
+
+import requests
+
+from twitter import TwitterError
+
+# Twitter sends a blank line every 30 seconds to keep idle streams open.
+KEEPALIVE_INTERVAL = 30
+
+# The reconnection schedules documented for the streaming API, in seconds.
+NETWORK_BACKOFF_STEP = 0.25
+NETWORK_BACKOFF_MAX = 16
+HTTP_BACKOFF_START = 5
+HTTP_BACKOFF_MAX = 320
+RATE_LIMIT_BACKOFF_START = 60
+RATE_LIMIT_BACKOFF_MAX = 16 * 60
+
+# Responses that will not succeed on retrying: bad credentials, unknown
+# or unacceptable parameters, or a too long parameter list.
+FATAL_STATUS_CODES = frozenset([400, 401, 403, 404, 406, 413, 416])
+
+# The number of bytes read from the connection at a time.  Streams are
+# sent with chunked transfer encoding, so a read returns as soon as a
+# chunk has arrived, however small.
+STREAM_CHUNK_SIZE = 8 * 1024
+
+_STREAMS = ('sample', 'filter', 'user')
+
+
+def ReadFrames(chunks, delimited=False):
+    """Split the bytes of a stream into messages.
+
+    Both framings of the streaming API are read through one reusable
+    buffer.  Without delimited, messages end at a newline and the buffer
+    is scanned for it, each byte once.  With delimited=length, every
+    message is preceded by a line holding its length in bytes, so only
+    the prefix is scanned and the message is sliced out once that many
+    bytes have arrived.
+
+    Args:
+      chunks:
+        An iterable of bytes, as returned by the iter_content method of a
+        streaming response.
+      delimited:
+        True if the stream was requested with delimited=length.
+        [Optional]
+
+    Returns:
+      A generator of the messages as bytes, without their line end.
+      Keep-alive lines are yielded as empty bytes.
+    """
+    buf = bytearray()
+    pos = 0        # Start of the first frame not yielded yet.
+    scanned = 0    # Where to resume looking for a newline.
+    frame = None   # (start, stop) of a length-delimited message.
+    for chunk in chunks:
+        if pos:
+            del buf[:pos]
+            scanned -= pos
+            if frame is not None:
+                frame = (frame[0] - pos, frame[1] - pos)
+            pos = 0
+        buf += chunk
+        while True:
+            if frame is None:
+                end = buf.find(b'\n', max(pos, scanned))
+                if end < 0:
+                    scanned = len(buf)
+                    break
+                stop = end
+                if stop > pos and buf[stop - 1] == 13:
+                    stop -= 1
+                if not delimited or stop == pos:
+                    yield bytes(buf[pos:stop])
+                    pos = scanned = end + 1
+                    continue
+                try:
+                    length = int(bytes(buf[pos:stop]))
+                except ValueError:
+                    raise TwitterError({'message': "Invalid length prefix %r in stream" %
+                                        bytes(buf[pos:stop])})
+                frame = (end + 1, end + 1 + length)
+            if len(buf) < frame[1]:
+                break
+            start, stop = frame
+            while stop > start and buf[stop - 1] in (10, 13):
+                stop -= 1
+            yield bytes(buf[start:stop])
+            pos = scanned = frame[1]
+            frame = None
+    if not delimited and pos < len(buf):
+        yield bytes(buf[pos:])
+
+
+def NetworkBackoff(attempt):
+    """Return the wait before reconnecting after a network error or a
+    stall: linear in steps of 250 ms, up to 16 seconds."""
+    return min(NETWORK_BACKOFF_STEP * attempt, NETWORK_BACKOFF_MAX)
+
+
+def HttpBackoff(attempt):
+    """Return the wait before reconnecting after an HTTP error:
+    exponential from 5 seconds, up to 320 seconds."""
+    return min(HTTP_BACKOFF_START * 2 ** (attempt - 1), HTTP_BACKOFF_MAX)
+
+
+def RateLimitBackoff(attempt):
+    """Return the wait before reconnecting after an HTTP 420 or 429:
+    exponential from one minute, up to 16 minutes."""
+    return min(RATE_LIMIT_BACKOFF_START * 2 ** (attempt - 1), RATE_LIMIT_BACKOFF_MAX)
+
+
+class _Disconnect(Exception):
+    """Raised when a connection ends, with the backoff schedule to use."""
+
+    def __init__(self, kind, reason):
+        Exception.__init__(self, reason)
+        self.kind = kind
+        self.reason = reason
+
+
+class _WatchedResponse(object):
+    """Wraps a streaming response to note when data, keep-alive lines
+    included, arrives."""
+
+    def __init__(self, resp, on_data):
+        self._resp = resp
+        self._on_data = on_data
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self._resp.iter_content(chunk_size):
+            self._on_data()
+            yield chunk
+
+
+class StreamConsumer(object):
+    """Consumes a streaming endpoint, reconnecting whenever the connection
+    ends.
+
+    The consumer reconnects with the backoff schedules documented for the
+    streaming API: linearly from 250 ms up to 16 seconds after network
+    errors and stalls, exponentially from 5 seconds up to 320 seconds
+    after HTTP errors and from one minute after HTTP 420 (rate limited).
+    A schedule starts over once a connection has been established.
+    Responses that cannot succeed on retrying, such as 401, raise a
+    TwitterError.
+
+    A stall is detected with a read timeout of stall_timeout seconds: a
+    healthy stream sends at least a keep-alive line every 30 seconds.
+    Stall warnings are requested from Twitter, passed to on_warning and
+    yielded like every other message.
+
+    Example usage:
+
+      >>> consumer = twitter.StreamConsumer(api, 'filter', track=['python'])
+      >>> for message in consumer.Messages():
+      ...     handle(message)
+      >>> consumer.Stats()
+    """
+
+    def __init__(self,
+                 api,
+                 stream='sample',
+                 stall_timeout=KEEPALIVE_INTERVAL + 10,
+                 connect_timeout=10,
+                 max_retries=None,
+                 on_warning=None,
+                 fields=None,
+                 keep_json=False,
+                 decoder=None,
+                 clock=time.time,
+                 sleep=time.sleep,
+                 **parameters):
+        """Instantiate a new twitter.StreamConsumer object.
+
+        Args:
+          api:
+            The twitter.Api instance used to connect.
+          stream:
+            'sample', 'filter' or 'user'. [Optional]
+          stall_timeout:
+            The number of seconds without any data, keep-alive lines
+            included, after which the stream is considered stalled and
+            reconnected. [Optional]
+          connect_timeout:
+            The timeout in seconds for establishing a connection.
+            [Optional]
+          max_retries:
+            The number of consecutive failed connections after which
+            Messages raises a TwitterError. Defaults to retrying forever.
+            [Optional]
+          on_warning:
+            A callable receiving every stall warning, as a JSON dict or
+            as a twitter.StallWarning. [Optional]
+          fields:
+            See twitter.Api.GetStreamSample. [Optional]
+          keep_json:
+            See twitter.Api.GetStreamSample. [Optional]
+          decoder:
+            See twitter.Api.GetStreamSample. The decoder is reused across
+            connections. [Optional]
+          clock:
+            A callable returning the current time in seconds. [Optional]
+          sleep:
+            A callable used to wait before reconnecting. [Optional]
+          parameters:
+            The parameters of the stream, as taken by GetStreamFilter or
+            GetUserStream, such as track or follow.
+        """
+        if stream not in _STREAMS:
+            raise TwitterError({'message': "Unknown stream %r, use one of %s" %
+                                (stream, ', '.join(_STREAMS))})
+        if stall_timeout <= 0:
+            raise TwitterError({'message': "stall_timeout must be positive"})
+        parameters.setdefault('stall_warnings', True)
+        builder = {'sample': api._SampleStream,
+                   'filter': api._FilterStream,
+                   'user': api._UserStream}[stream]
+        # Fails early on missing or unknown parameters.
+        self._request = builder(**parameters)
+        self._delimited = bool(parameters.get('delimited'))
+
+        self._api = api
+        self._timeout = (connect_timeout, stall_timeout)
+        self._max_retries = max_retries
+        self._on_warning = on_warning
+        self._fields = fields
+        self._keep_json = keep_json
+        self._decoder = decoder
+        self._clock = clock
+        self._sleep = sleep
+        self._resp = None
+        self._stopped = False
+        self._last_data = None
+        self._down_since = None
+        self._stats = {
+            'connects': 0,
+            'disconnects': 0,
+            'network_errors': 0,
+            'stalls': 0,
+            'http_errors': 0,
+            'rate_limited': 0,
+            'messages': 0,
+            'warnings': 0,
+            'last_warning': None,
+            'last_disconnect': None,
+            'connected_since': None,
+            'downtime': 0.0,
+        }
+
+    def Stats(self):
+        """Return the connection statistics.
+
+        Returns:
+          A dict with the numbers of connects, disconnects, network_errors,
+          stalls, http_errors, rate_limited responses, messages and
+          warnings received, the last_warning, the reason of the
+          last_disconnect, the time the current connection was made
+          (connected_since, None while disconnected) and the total
+          downtime in seconds.
+        """
+        stats = dict(self._stats)
+        if self._down_since is not None:
+            stats['downtime'] += self._clock() - self._down_since
+        return stats
+
+    def Stop(self):
+        """Close the connection and end Messages."""
+        self._stopped = True
+        self._Close()
+
+    def Messages(self):
+        """Yield the messages of the stream, reconnecting as needed.
+
+        Statuses are yielded as JSON dicts, or as twitter.Status instances
+        if fields or keep_json were given, and other messages as JSON
+        dicts, as by twitter.Api.GetStreamSample.
+        """
+        attempts = {}
+        failures = 0
+        self._stopped = False
+        self._down_since = self._clock()
+        try:
+            while not self._stopped:
+                try:
+                    self._Connect()
+                    attempts.clear()
+                    failures = 0
+                    for message in self._Read():
+                        yield message
+                        if self._stopped:
+                            break
+                    else:
+                        raise _Disconnect('network', "Stream closed by the server")
+                except _Disconnect as disconnect:
+                    self._Close()
+                    self._stats['last_disconnect'] = disconnect.reason
+                    if self._stopped:
+                        break
+                    failures += 1
+                    if self._max_retries is not None and failures > self._max_retries:
+                        raise TwitterError({'message': "Stream reconnection failed %d times: %s" %
+                                            (failures, disconnect.reason)})
+                    kind = disconnect.kind
+                    attempts[kind] = attempts.get(kind, 0) + 1
+                    self._sleep(self._Backoff(kind, attempts[kind]))
+        finally:
+            self._Close()
+            if self._down_since is not None:
+                self._stats['downtime'] += self._clock() - self._down_since
+                self._down_since = None
+
+    def _Backoff(self, kind, attempt):
+        if kind == 'rate_limit':
+            return RateLimitBackoff(attempt)
+        if kind == 'http':
+            return HttpBackoff(attempt)
+        return NetworkBackoff(attempt)
+
+    def _Connect(self):
+        url, verb, data = self._request
+        try:
+            resp = self._api._RequestStream(url, verb, data=data, timeout=self._timeout)
+        except TwitterError as e:
+            self._stats['network_errors'] += 1
+            raise _Disconnect('network', str(e))
+        if resp.status_code != 200:
+            resp.close()
+            reason = "HTTP %d" % resp.status_code
+            if resp.status_code in FATAL_STATUS_CODES:
+                raise TwitterError({'message': "Stream request failed: %s" % reason})
+            if resp.status_code in (420, 429):
+                self._stats['rate_limited'] += 1
+                raise _Disconnect('rate_limit', reason)
+            self._stats['http_errors'] += 1
+            raise _Disconnect('http', reason)
+        now = self._clock()
+        self._resp = resp
+        self._last_data = now
+        self._stats['connects'] += 1
+        self._stats['connected_since'] = now
+        if self._down_since is not None:
+            self._stats['downtime'] += now - self._down_since
+            self._down_since = None
+
+    def _Close(self):
+        if self._resp is None:
+            return
+        self._resp.close()
+        self._resp = None
+        self._stats['disconnects'] += 1
+        self._stats['connected_since'] = None
+        self._down_since = self._clock()
+
+    def _Touch(self):
+        self._last_data = self._clock()
+
+    def _Read(self):
+        resp = _WatchedResponse(self._resp, self._Touch)
+        try:
+            for message in self._api._StreamMessages(resp, self._fields, self._keep_json,
+                                                     self._delimited, self._decoder):
+                self._stats['messages'] += 1
+                if isinstance(message, dict):
+                    warning = message.get('warning')
+                    disconnect = message.get('disconnect')
+                else:
+                    # The typed messages of a twitter.StreamDispatcher.
+                    kind = getattr(message, 'KIND', None)
+                    warning = message.AsDict() if kind == 'warning' else None
+                    disconnect = message.AsDict() if kind == 'disconnect' else None
+                if warning is not None:
+                    self._stats['warnings'] += 1
+                    self._stats['last_warning'] = warning
+                    if self._on_warning is not None:
+                        self._on_warning(message)
+                elif disconnect is not None:
+                    yield message
+                    raise _Disconnect('network', "Disconnect message: %s" %
+                                      disconnect.get('reason'))
+                yield message
+        except (requests.RequestException, TwitterError) as e:
+            if self._clock() - self._last_data >= self._timeout[1]:
+                self._stats['stalls'] += 1
+                raise _Disconnect('network', "Stalled: no data for %d seconds" % self._timeout[1])
+            self._stats['network_errors'] += 1
+            raise _Disconnect('network', str(e))
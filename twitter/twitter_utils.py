@@ -1,13 +1,22 @@
 # encoding: utf-8
+from __future__ import division
+
 import mimetypes
 import os
 import re
+from calendar import timegm
+from datetime import date
 
 try:
     from urllib.request import urlopen
 except ImportError:
     from urllib import urlopen
 
+try:
+    from rfc822 import parsedate
+except ImportError:
+    from email.utils import parsedate
+
 from twitter import TwitterError
 
 TLDS = [
@@ -139,6 +148,20 @@ TLDS = [
     "淡马锡", "游戏", "点看", "移动", "组织机构", "网址", "网店", "网络", "谷歌", "集团",
     "飞利浦", "餐厅", "닷넷", "닷컴", "삼성", "onion"]
 
+# Milliseconds since the Unix epoch at which snowflake ids start counting.
+SNOWFLAKE_EPOCH = 1288834974657
+
+# Ids of statuses posted before snowflake ids were introduced in
+# November 2010 are sequential and do not encode a time.
+FIRST_SNOWFLAKE_ID = 29700859247
+
+_MONTHS = dict((month, number + 1) for number, month in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']))
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Days since the epoch, keyed by the "Mon DD" and year parts of a timestamp.
+_DAYS = {}
+
 URL_REGEXP = re.compile(r'(?i)((?:https?://|www\\.)*(?:[\w+-_]+[.])(?:' + r'\b|'.join(TLDS) + r'\b|(?:[0-9]|[1-9][0-9]|1[0-9][0-9]|2[0-4][0-9]|25[0-5]))+(?:[:\w+\/]?[a-z0-9!\*\'\(\);:&=\+\$/%#\[\]\-_\.,~?])*)', re.UNICODE)
 
 
@@ -163,6 +186,97 @@ def calc_expected_status_length(status, short_url_length=23):
     return status_length
 
 
+def id_to_timestamp(snowflake_id):
+    """ Returns the creation time encoded in a snowflake id.
+
+    Args:
+        snowflake_id: id of a status, or of another object with a snowflake id.
+
+    Returns:
+        Seconds since the epoch, with millisecond precision, as a float.
+    """
+    snowflake_id = int(snowflake_id)
+    if snowflake_id < FIRST_SNOWFLAKE_ID:
+        raise TwitterError({'message': 'Id %d predates snowflake ids.' % snowflake_id})
+    return ((snowflake_id >> 22) + SNOWFLAKE_EPOCH) / 1000
+
+
+def timestamp_to_id(timestamp):
+    """ Returns the smallest snowflake id that can be created at a time.
+
+    Every status created at or after the timestamp has an id greater than or
+    equal to the result, so it can be used to build since_id and max_id
+    bounds from times.
+
+    Args:
+        timestamp: seconds since the epoch.
+
+    Returns:
+        A snowflake id as an integer.
+    """
+    milliseconds = int(round(timestamp * 1000)) - SNOWFLAKE_EPOCH
+    if milliseconds < 0:
+        raise TwitterError({'message': 'Timestamp predates snowflake ids.'})
+    return milliseconds << 22
+
+
+def parse_created_at(created_at):
+    """ Returns the time of a created_at timestamp in seconds since the epoch.
+
+    Timestamps in the fixed format Twitter uses, such as
+    "Sat Jan 27 04:17:38 +0000 2007", are parsed by slicing; anything else
+    is handed to email.utils.parsedate.
+
+    Args:
+        created_at: the created_at string of a status, user or direct message.
+
+    Returns:
+        Seconds since the epoch as an integer.
+    """
+    fixed = len(created_at) == 30 and created_at[20:25] == '+0000'
+    if fixed and created_at[13] == ':' and created_at[16] == ':':
+        key = created_at[4:10] + created_at[26:]
+        days = _DAYS.get(key)
+        if days is None:
+            try:
+                days = date(int(created_at[26:]),
+                            _MONTHS[created_at[4:7]],
+                            int(created_at[8:10])).toordinal() - _EPOCH_ORDINAL
+            except (KeyError, ValueError):
+                return timegm(parsedate(created_at))
+            if len(_DAYS) > 100000:
+                _DAYS.clear()
+            _DAYS[key] = days
+        try:
+            seconds = int(created_at[11:13]) * 3600 + int(created_at[14:16]) * 60
+            return days * 86400 + seconds + int(created_at[17:19])
+        except ValueError:
+            pass
+    return timegm(parsedate(created_at))
+
+
+def parse_created_at_list(timestamps):
+    """ Returns the times of a sequence of created_at timestamps.
+
+    Repeated timestamps, common in pages of tweets, are only parsed once.
+
+    Args:
+        timestamps: a sequence of created_at strings.
+
+    Returns:
+        A list of seconds since the epoch, None for empty timestamps.
+    """
+    seen = {}
+    result = []
+    for created_at in timestamps:
+        seconds = seen.get(created_at)
+        if seconds is None:
+            seconds = parse_created_at(created_at) if created_at else None
+            seen[created_at] = seconds
+        result.append(seconds)
+    return result
+
+
 def is_url(text):
     """ Checks to see if a bit of text is a URL.
 
@@ -4,12 +4,17 @@
 class Url(object):
     """A class representing an URL contained in a tweet"""
 
+    __slots__ = ('url', 'expanded_url')
+
     def __init__(self,
                  url=None,
                  expanded_url=None):
         self.url = url
         self.expanded_url = expanded_url
 
+    def __reduce__(self):
+        return Url, (self.url, self.expanded_url)
+
     @staticmethod
     def NewFromJsonDict(data):
         """Create a new instance based on a JSON dict.
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
-from twitter import json
+from twitter import json, TwitterError
+from twitter._schema import Field, Schema, NOT_NONE
 
 
 class UserStatus(object):
@@ -132,6 +133,60 @@ class UserStatus(object):
                           followed_by=followed_by)
 
 
+def _ParseProfileImageUrl(data, lazy=False, identity_map=None):
+    return data.get('profile_image_url_https', data.get('profile_image_url', None))
+
+
+def _StatusModel():
+    # Have to do the import here to prevent cyclic imports, twitter.status
+    # imports this module.  Users only embed a status outside of timelines.
+    from twitter.status import Status
+    return Status
+
+
+def _ParseStatus(data, lazy=False, identity_map=None):
+    if 'status' not in data:
+        return None
+    return _StatusModel().NewFromJsonDict(data['status'], lazy=lazy, identity_map=identity_map)
+
+
+_USER_SCHEMA = Schema('User', [
+    Field('id'),
+    Field('name'),
+    Field('screen_name'),
+    Field('location'),
+    Field('description'),
+    Field('default_profile'),
+    Field('default_profile_image'),
+    Field('profile_image_url', parse=_ParseProfileImageUrl,
+          paths=['profile_image_url', 'profile_image_url_https']),
+    Field('profile_background_tile', dump_if=NOT_NONE),
+    Field('profile_background_image_url'),
+    Field('profile_banner_url'),
+    Field('profile_sidebar_fill_color'),
+    Field('profile_background_color'),
+    Field('profile_link_color'),
+    Field('profile_text_color'),
+    Field('protected', dump_if=NOT_NONE),
+    Field('utc_offset'),
+    Field('time_zone'),
+    Field('followers_count'),
+    Field('friends_count'),
+    Field('statuses_count'),
+    Field('favourites_count'),
+    Field('url'),
+    Field('status', parse=_ParseStatus, dump='{0}.AsDict()', nested=_StatusModel),
+    Field('geo_enabled'),
+    Field('verified'),
+    Field('lang'),
+    Field('notifications'),
+    Field('contributors_enabled'),
+    Field('created_at'),
+    Field('listed_count'),
+    Field('_json', key=None, dump=None, compare=False),
+])
+
+
 class User(object):
     """A class representing the User structure used by the twitter API.
 
@@ -170,42 +225,11 @@ class User(object):
       user.listed_count
     """
 
-    def __init__(self, **kwargs):
-        param_defaults = {
-            'id': None,
-            'name': None,
-            'screen_name': None,
-            'location': None,
-            'description': None,
-            'default_profile': None,
-            'default_profile_image': None,
-            'profile_image_url': None,
-            'profile_background_tile': None,
-            'profile_background_image_url': None,
-            'profile_banner_url': None,
-            'profile_sidebar_fill_color': None,
-            'profile_background_color': None,
-            'profile_link_color': None,
-            'profile_text_color': None,
-            'protected': None,
-            'utc_offset': None,
-            'time_zone': None,
-            'followers_count': None,
-            'friends_count': None,
-            'statuses_count': None,
-            'favourites_count': None,
-            'url': None,
-            'status': None,
-            'geo_enabled': None,
-            'verified': None,
-            'lang': None,
-            'notifications': None,
-            'contributors_enabled': None,
-            'created_at': None,
-            'listed_count': None}
+    __slots__ = _USER_SCHEMA.Slots('__weakref__')
 
-        for (param, default) in param_defaults.items():
-            setattr(self, param, kwargs.get(param, default))
+    _SCHEMA = _USER_SCHEMA
+
+    __init__ = _USER_SCHEMA.Init()
 
     @property
     def Id(self):
@@ -214,7 +238,7 @@ class User(object):
         Returns:
           The unique id of this user
         """
-        return self._id
+        return self.id
 
     @property
     def Name(self):
@@ -223,7 +247,7 @@ class User(object):
         Returns:
           The real name of this user
         """
-        return self._name
+        return self.name
 
     @property
     def ScreenName(self):
@@ -232,7 +256,7 @@ class User(object):
         Returns:
           The short twitter name of this user
         """
-        return self._screen_name
+        return self.screen_name
 
     @property
     def Location(self):
@@ -241,7 +265,7 @@ class User(object):
         Returns:
           The geographic location of this user
         """
-        return self._location
+        return self.location
 
     @property
     def Description(self):
@@ -250,7 +274,7 @@ class User(object):
         Returns:
           The short text description of this user
         """
-        return self._description
+        return self.description
 
     @property
     def Url(self):
@@ -259,7 +283,7 @@ class User(object):
         Returns:
           The homepage url of this user
         """
-        return self._url
+        return self.url
 
     @property
     def ProfileImageUrl(self):
@@ -268,7 +292,7 @@ class User(object):
         Returns:
           The url of the thumbnail of this user
         """
-        return self._profile_image_url
+        return self.profile_image_url
 
     @property
     def ProfileBackgroundTile(self):
@@ -277,39 +301,39 @@ class User(object):
         Returns:
           True if the background is to be tiled, False if not, None if unset.
         """
-        return self._profile_background_tile
+        return self.profile_background_tile
 
     @property
     def ProfileBackgroundImageUrl(self):
-        return self._profile_background_image_url
+        return self.profile_background_image_url
 
     @property
     def ProfileBannerUrl(self):
-        return self._profile_banner_url
+        return self.profile_banner_url
 
     @property
     def ProfileSidebarFillColor(self):
-        return self._profile_sidebar_fill_color
+        return self.profile_sidebar_fill_color
 
     @property
     def GetProfileBackgroundColor(self):
-        return self._profile_background_color
+        return self.profile_background_color
 
     @property
     def ProfileLinkColor(self):
-        return self._profile_link_color
+        return self.profile_link_color
 
     @property
     def ProfileTextColor(self):
-        return self._profile_text_color
+        return self.profile_text_color
 
     @property
     def Protected(self):
-        return self._protected
+        return self.protected
 
     @property
     def UtcOffset(self):
-        return self._utc_offset
+        return self.utc_offset
 
     @property
     def TimeZone(self):
@@ -318,7 +342,7 @@ class User(object):
         Returns:
           The descriptive time zone string for the user.
         """
-        return self._time_zone
+        return self.time_zone
 
     @property
     def Status(self):
@@ -327,7 +351,7 @@ class User(object):
         Returns:
           The latest twitter.Status of this user
         """
-        return self._status
+        return self.status
 
     @property
     def FriendsCount(self):
@@ -336,7 +360,7 @@ class User(object):
         Returns:
           The number of users this user has befriended.
         """
-        return self._friends_count
+        return self.friends_count
 
     @property
     def ListedCount(self):
@@ -345,7 +369,7 @@ class User(object):
         Returns:
           The number of lists this user belongs to.
         """
-        return self._listed_count
+        return self.listed_count
 
     @property
     def FollowersCount(self):
@@ -354,7 +378,7 @@ class User(object):
         Returns:
           The number of users following this user.
         """
-        return self._followers_count
+        return self.followers_count
 
     @property
     def StatusesCount(self):
@@ -363,7 +387,7 @@ class User(object):
         Returns:
           The number of status updates for this user.
         """
-        return self._statuses_count
+        return self.statuses_count
 
     @property
     def FavouritesCount(self):
@@ -372,7 +396,7 @@ class User(object):
         Returns:
           The number of favourites for this user.
         """
-        return self._favourites_count
+        return self.favourites_count
 
     @property
     def GeoEnabled(self):
@@ -381,7 +405,7 @@ class User(object):
         Returns:
           True/False if Geo tagging is enabled
         """
-        return self._geo_enabled
+        return self.geo_enabled
 
     @property
     def Verified(self):
@@ -390,7 +414,7 @@ class User(object):
         Returns:
           True/False if user is a verified account
         """
-        return self._verified
+        return self.verified
 
     @property
     def Lang(self):
@@ -399,7 +423,7 @@ class User(object):
         Returns:
           language code of the user
         """
-        return self._lang
+        return self.lang
 
     @property
     def Notifications(self):
@@ -408,7 +432,7 @@ class User(object):
         Returns:
           True/False for the notifications setting of the user
         """
-        return self._notifications
+        return self.notifications
 
     @property
     def ContributorsEnabled(self):
@@ -417,7 +441,7 @@ class User(object):
         Returns:
           True/False contributors_enabled of the user
         """
-        return self._contributors_enabled
+        return self.contributors_enabled
 
     @property
     def CreatedAt(self):
@@ -426,48 +450,16 @@ class User(object):
         Returns:
           created_at value of the user
         """
-        return self._created_at
+        return self.created_at
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
-    def __eq__(self, other):
-        try:
-            return other and \
-                   self.id == other.id and \
-                   self.name == other.name and \
-                   self.screen_name == other.screen_name and \
-                   self.location == other.location and \
-                   self.description == other.description and \
-                   self.default_profile == other.default_profile and \
-                   self.default_profile_image == other.default_profile_image and \
-                   self.profile_image_url == other.profile_image_url and \
-                   self.profile_background_tile == other.profile_background_tile and \
-                   self.profile_background_image_url == other.profile_background_image_url and \
-                   self.profile_banner_url == other.profile_banner_url and \
-                   self.profile_sidebar_fill_color == other.profile_sidebar_fill_color and \
-                   self.profile_background_color == other.profile_background_color and \
-                   self.profile_link_color == other.profile_link_color and \
-                   self.profile_text_color == other.profile_text_color and \
-                   self.protected == other.protected and \
-                   self.utc_offset == other.utc_offset and \
-                   self.time_zone == other.time_zone and \
-                   self.url == other.url and \
-                   self.statuses_count == other.statuses_count and \
-                   self.followers_count == other.followers_count and \
-                   self.favourites_count == other.favourites_count and \
-                   self.friends_count == other.friends_count and \
-                   self.status == other.status and \
-                   self.geo_enabled == other.geo_enabled and \
-                   self.verified == other.verified and \
-                   self.lang == other.lang and \
-                   self.notifications == other.notifications and \
-                   self.contributors_enabled == other.contributors_enabled and \
-                   self.created_at == other.created_at and \
-                   self.listed_count == other.listed_count
+    __eq__ = _USER_SCHEMA.Eq()
 
-        except AttributeError:
-            return False
+    __reduce__ = _USER_SCHEMA.Reduce(lambda: User)
+
+    __setstate__ = _USER_SCHEMA.SetState()
 
     def __str__(self):
         """A string representation of this twitter.User instance.
@@ -479,134 +471,87 @@ class User(object):
         """
         return self.AsJsonString()
 
-    def AsJsonString(self):
+    def AsJsonString(self, sort_keys=True):
         """A JSON string representation of this twitter.User instance.
+        Set sort_keys=False for faster output in no particular key order.
 
         Returns:
-          A JSON string representation of this twitter.User instance
+          A JSON string representation of this twitter.User instance, or
+          the original payload if it was created with keep_json.
        """
-        return json.dumps(self.AsDict(), sort_keys=True)
-
-    def AsDict(self):
-        """A dict representation of this twitter.User instance.
-
-        The return value uses the same key names as the JSON representation.
+        if self._json is not None:
+            return json.dumps_raw(self._json)
+        return json.dumps(self.AsDict(), sort_keys=sort_keys)
 
-        Return:
-          A dict representing this twitter.User instance
-        """
-        data = {}
-        if self.id:
-            data['id'] = self.id
-        if self.name:
-            data['name'] = self.name
-        if self.screen_name:
-            data['screen_name'] = self.screen_name
-        if self.location:
-            data['location'] = self.location
-        if self.description:
-            data['description'] = self.description
-        if self.default_profile:
-            data['default_profile'] = self.default_profile
-        if self.default_profile_image:
-            data['default_profile_image'] = self.default_profile_image
-        if self.profile_image_url:
-            data['profile_image_url'] = self.profile_image_url
-        if self.profile_background_tile is not None:
-            data['profile_background_tile'] = self.profile_background_tile
-        if self.profile_background_image_url:
-            data['profile_background_image_url'] = self.profile_background_image_url
-        if self.profile_banner_url:
-            data['profile_banner_url'] = self.profile_banner_url
-        if self.profile_sidebar_fill_color:
-            data['profile_sidebar_fill_color'] = self.profile_sidebar_fill_color
-        if self.profile_background_color:
-            data['profile_background_color'] = self.profile_background_color
-        if self.profile_link_color:
-            data['profile_link_color'] = self.profile_link_color
-        if self.profile_text_color:
-            data['profile_text_color'] = self.profile_text_color
-        if self.protected is not None:
-            data['protected'] = self.protected
-        if self.utc_offset:
-            data['utc_offset'] = self.utc_offset
-        if self.time_zone:
-            data['time_zone'] = self.time_zone
-        if self.url:
-            data['url'] = self.url
-        if self.status:
-            data['status'] = self.status.AsDict()
-        if self.friends_count:
-            data['friends_count'] = self.friends_count
-        if self.followers_count:
-            data['followers_count'] = self.followers_count
-        if self.statuses_count:
-            data['statuses_count'] = self.statuses_count
-        if self.favourites_count:
-            data['favourites_count'] = self.favourites_count
-        if self.geo_enabled:
-            data['geo_enabled'] = self.geo_enabled
-        if self.verified:
-            data['verified'] = self.verified
-        if self.lang:
-            data['lang'] = self.lang
-        if self.notifications:
-            data['notifications'] = self.notifications
-        if self.contributors_enabled:
-            data['contributors_enabled'] = self.contributors_enabled
-        if self.created_at:
-            data['created_at'] = self.created_at
-        if self.listed_count:
-            data['listed_count'] = self.listed_count
-
-        return data
+    AsDict = _USER_SCHEMA.AsDict()
 
     @staticmethod
-    def NewFromJsonDict(data):
+    def NewFromJsonDict(data, lazy=False, identity_map=None, fields=None, keep_json=False):
         """Create a new instance based on a JSON dict.
 
         Args:
           data:
             A JSON dict, as converted from the JSON in the twitter API
+          lazy:
+            If True, return a twitter.user.LazyUser that keeps the JSON
+            dict and builds each attribute on first access. [Optional]
+          identity_map:
+            A twitter.IdentityMap through which this user, and the status
+            nested in it, are shared with earlier copies. [Optional]
+          fields:
+            A projection such as ('id', 'screen_name'), see
+            twitter.Status.NewFromJsonDict. [Optional]
+          keep_json:
+            If True, keep data for AsJsonString, see
+            twitter.Status.NewFromJsonDict. [Optional]
 
         Returns:
           A twitter.User instance
         """
-        if 'status' in data:
-            from twitter import Status
-            # Have to do the import here to prevent cyclic imports
-            # in the __init__.py file
-            status = Status.NewFromJsonDict(data['status'])
+        if fields is not None:
+            if lazy or identity_map is not None:
+                raise TwitterError({'message': "fields cannot be combined with lazy or identity_map"})
+            user = _USER_SCHEMA.Projector(fields)(User, data)
+        elif identity_map is not None:
+            # The map keeps the payload in step with the attributes.
+            return identity_map.User(data, lazy=lazy, raw=data if keep_json else None)
         else:
-            status = None
-        return User(id=data.get('id', None),
-                    name=data.get('name', None),
-                    screen_name=data.get('screen_name', None),
-                    location=data.get('location', None),
-                    description=data.get('description', None),
-                    statuses_count=data.get('statuses_count', None),
-                    followers_count=data.get('followers_count', None),
-                    favourites_count=data.get('favourites_count', None),
-                    default_profile=data.get('default_profile', None),
-                    default_profile_image=data.get('default_profile_image', None),
-                    friends_count=data.get('friends_count', None),
-                    profile_image_url=data.get('profile_image_url_https', data.get('profile_image_url', None)),
-                    profile_background_tile=data.get('profile_background_tile', None),
-                    profile_background_image_url=data.get('profile_background_image_url', None),
-                    profile_banner_url=data.get('profile_banner_url', None),
-                    profile_sidebar_fill_color=data.get('profile_sidebar_fill_color', None),
-                    profile_background_color=data.get('profile_background_color', None),
-                    profile_link_color=data.get('profile_link_color', None),
-                    profile_text_color=data.get('profile_text_color', None),
-                    protected=data.get('protected', None),
-                    utc_offset=data.get('utc_offset', None),
-                    time_zone=data.get('time_zone', None),
-                    url=data.get('url', None),
-                    status=status,
-                    geo_enabled=data.get('geo_enabled', None),
-                    verified=data.get('verified', None),
-                    lang=data.get('lang', None),
-                    notifications=data.get('notifications', None),
-                    contributors_enabled=data.get('contributors_enabled', None),
-                    created_at=data.get('created_at', None),
-                    listed_count=data.get('listed_count', None))
+            user = User._FromJsonDict(data, lazy)
+        if keep_json:
+            user._json = data
+        return user
+
+    @staticmethod
+    def _FromJsonDict(data, lazy=False, identity_map=None):
+        if lazy:
+            return LazyUser(data, identity_map)
+        return User._Build(data, identity_map)
+
+    _Build = _USER_SCHEMA.Builder()
+
+
+class LazyUser(User):
+    """A twitter.User that wraps the JSON dict of a user and builds each
+    attribute the first time it is read.
+
+    See twitter.status.LazyStatus.  Instances are normally created with
+    User.NewFromJsonDict(data, lazy=True).
+    """
+
+    __slots__ = ('_data', '_identity_map')
+
+    def __init__(self, data, identity_map=None):
+        self._data = data
+        self._identity_map = identity_map
+        self._json = None
+
+    def __getattr__(self, name):
+        # Only called for slots that have not been assigned yet.
+        if name not in _USER_FIELDS:
+            raise AttributeError(name)
+        value = _USER_SCHEMA.by_name[name].Read(self._data, True, self._identity_map)
+        setattr(self, name, value)
+        return value
+
+
+_USER_FIELDS = _USER_SCHEMA.PublicNames()